@@ -3,10 +3,16 @@
 import argparse
 from uuid import UUID
 
-from superego.application.usecases import RetrieveAllPeopleUseCase, AddPersonUseCase, RemovePersonUseCase
+from superego.application.usecases import RetrieveAllPeopleUseCase, AddPersonUseCase, RemovePersonUseCase, \
+    AddCardsUseCase
 from superego.infrastructure.database.engine import get_db
-from superego.infrastructure.database.storage import DataBasePersonStorage
+from superego.infrastructure.database.migrations import migrate, get_schema_version, pending_migrations
+from superego.infrastructure.database.importer import CardImport, CardChunk, ImportFormat, \
+    DEFAULT_IMPORT_CHUNK_SIZE, detect_format
+from superego.infrastructure.database.storage import DataBasePersonStorage, DatabaseDeckStorage, DataBaseCardStorage
 from superego.infrastructure.http.server import run as run_http_server
+from superego.infrastructure.journal.replay import ReplayEngine
+from superego.infrastructure.settings import config
 
 
 db = get_db().connect()
@@ -23,6 +29,61 @@ def show_people() -> None:
         print(f'{name} ({guid})')
 
 
+def migrate_database(target_version: int) -> None:
+    db.commit()
+    applied = migrate(db.engine, target_version)
+    for migration in applied:
+        print(f'Applied migration {migration.version}: {migration.description}')
+    print(f'Schema version: {get_schema_version(db)}')
+
+
+def show_schema_version() -> None:
+    print(f'Schema version: {get_schema_version(db)}')
+    for migration in pending_migrations(db):
+        print(f'Pending migration {migration.version}: {migration.description}')
+
+
+def import_cards(path: str, format_name: str, chunk_size: int) -> None:
+    format_ = ImportFormat(format_name) if format_name else detect_format(path)
+    card_import = CardImport(format_, chunk_size)
+    add_cards = AddCardsUseCase(DataBaseCardStorage(db))
+
+    def store(chunk: CardChunk) -> None:
+        try:
+            add_cards(chunk.cards)
+        except Exception as e:
+            db.rollback()
+            card_import.chunk_failed(chunk, e)
+        else:
+            card_import.chunk_stored(chunk)
+
+    with open(path, 'rb') as file:
+        for line in file:
+            chunk = card_import.feed(line)
+            if chunk:
+                store(chunk)
+    chunk = card_import.finish()
+    if chunk:
+        store(chunk)
+    report = card_import.report
+    for error in report.errors:
+        print(f'Row {error.row}: {error.error}')
+    if report.failed > len(report.errors):
+        print(f'... and {report.failed - len(report.errors)} more errors')
+    print(f'Imported {report.imported} cards, {report.failed} rows failed')
+
+
+def replay_game(game_guid: UUID, action_index: int) -> None:
+    cards = DatabaseDeckStorage(db).get().cards
+    with ReplayEngine.from_directory(config['journal']['directory'], cards) as engine:
+        for index, action, game in engine.steps(game_guid, stop=action_index):
+            points = ', '.join(f'{player}: {player.points}' for player in game.players)
+            issuer = next((player for player in game.players if player.guid == action.player_guid),
+                          action.player_guid)
+            params = ' '.join(str(param) for param in action.params)
+            print(f'{index}: {action.action.value} by {issuer} {params} -> {points}')
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(prog='SuperEgo', description='SuperEgo server control')
     subparsers = parser.add_subparsers(required=True, dest='command')
@@ -37,12 +98,38 @@ if __name__ == '__main__':
     people_remove_parser = people_subparsers.add_parser('remove', help='Remove player')
     people_remove_parser.add_argument('guid', type=UUID, action='store')
 
+    # Database
+    db_parser = subparsers.add_parser('db', help='Database schema management')
+    db_subparsers = db_parser.add_subparsers(required=True, metavar='db subcommand', dest='db_subcommand')
+    db_migrate_parser = db_subparsers.add_parser('migrate', help='Apply pending schema migrations')
+    db_migrate_parser.add_argument('--to', type=int, action='store', default=None, dest='target_version')
+    db_version_parser = db_subparsers.add_parser('version', help='Show schema version and pending migrations')
+
+    # Cards
+    cards_parser = subparsers.add_parser('cards', help='Cards management')
+    cards_subparsers = cards_parser.add_subparsers(required=True, metavar='cards subcommand',
+                                                   dest='cards_subcommand')
+    cards_import_parser = cards_subparsers.add_parser('import', help='Import cards from NDJSON or CSV file')
+    cards_import_parser.add_argument('path', type=str, action='store')
+    cards_import_parser.add_argument('--format', type=str, action='store', default=None,
+                                     choices=[format_.value for format_ in ImportFormat])
+    cards_import_parser.add_argument('--chunk-size', type=int, action='store',
+                                     default=config['sqlite'].get('import_chunk_size', DEFAULT_IMPORT_CHUNK_SIZE))
+
     # Server
     server_parser = subparsers.add_parser('server', help='HTTP server management')
     server_subparsers = server_parser.add_subparsers(required=True, metavar='server subcommand',
                                                      dest='server_subcommand')
     server_run_parser = server_subparsers.add_parser('start', help='Start HTTP server')
 
+    # Journal
+    journal_parser = subparsers.add_parser('journal', help='Game journal inspection')
+    journal_subparsers = journal_parser.add_subparsers(required=True, metavar='journal subcommand',
+                                                       dest='journal_subcommand')
+    journal_replay_parser = journal_subparsers.add_parser('replay', help='Replay journaled game action by action')
+    journal_replay_parser.add_argument('guid', type=UUID, action='store')
+    journal_replay_parser.add_argument('--index', type=int, action='store', default=None)
+
     # Game
     game_parser = subparsers.add_parser('game', help='Game session management (requires HTTP server running)')
     game_subparsers = game_parser.add_subparsers(required=True, metavar='game subcommand', dest='game_subcommand')
@@ -64,6 +151,20 @@ if __name__ == '__main__':
                     remove_person(args.guid)
                 case _:
                     print(f'Unknown subcommand: {args.people_subcommand}')
+        case 'db':
+            match args.db_subcommand:
+                case 'migrate':
+                    migrate_database(args.target_version)
+                case 'version':
+                    show_schema_version()
+                case _:
+                    print(f'Unknown subcommand: {args.db_subcommand}')
+        case 'cards':
+            match args.cards_subcommand:
+                case 'import':
+                    import_cards(args.path, args.format, args.chunk_size)
+                case _:
+                    print(f'Unknown subcommand: {args.cards_subcommand}')
         case 'server':
             match args.server_subcommand:
                 case 'start':
@@ -71,5 +172,12 @@ if __name__ == '__main__':
                 case _:
                     print(f'Unknown subcommand: {args.server_subcommand}')
 
+        case 'journal':
+            match args.journal_subcommand:
+                case 'replay':
+                    replay_game(args.guid, args.index)
+                case _:
+                    print(f'Unknown subcommand: {args.journal_subcommand}')
+
         case 'game':
             pass
\ No newline at end of file
@@ -19,6 +19,11 @@ class GameServer(metaclass=ABCMeta):
     def address(self):
         raise NotImplemented
 
+    @property
+    @abstractmethod
+    def guid(self) -> UUID:
+        raise NotImplemented
+
 
 class GameServerCreator(metaclass=ABCMeta):
     @abstractmethod
@@ -31,6 +36,10 @@ class CardStorage(metaclass=ABCMeta):
     def store(self, card: Card) -> None:
         raise NotImplemented
 
+    @abstractmethod
+    def store_many(self, cards: List[Card]) -> None:
+        raise NotImplemented
+
     @abstractmethod
     def get_all(self) -> List[Card]:
         raise NotImplemented
@@ -31,6 +31,13 @@ class GuessEventIssuerIsNotCurrentlyGuessingPlayer(UseError):
         super().__init__(message)
 
 
+class EventIssuerIsNotPlayer(UseError):
+    def __init__(self, issuer_guid: UUID):
+        message = f'Event issuer is not one of players in game.' \
+                  f' Issuer ID: {issuer_guid}'
+        super().__init__(message)
+
+
 class AnswerUseCase:
     def __init__(self, game: Game):
         self._game: Game = game
@@ -55,21 +62,15 @@ class GuessUseCase:
     def __call__(self, answer_text: str, bet: int, player_id: UUID) -> None:
         answer = _convert_answer(answer_text)
         guess = Guess(answer=answer, bet=bet)
-        self._ensure_player_is_guessing_player(player_id)
-        player = self._get_player(player_id)
+        player = self._get_guessing_player(player_id)
         self._game.guess(player, guess)
 
-    def _ensure_player_is_guessing_player(self, player_id: UUID) -> None:
-        guessing_players_ids = [player.guid
-                                for player in self._game.guessing_players]
-        if player_id not in guessing_players_ids:
+    def _get_guessing_player(self, player_id: UUID) -> Player:
+        player = self._game.find_player(player_id)
+        if player is None or not self._game.is_guessing_player(player):
             raise GuessEventIssuerIsNotCurrentlyGuessingPlayer(
-                player_id, guessing_players_ids)
-
-    def _get_player(self, issuer_guid: UUID) -> Player:
-        for player in self._game.guessing_players:
-            if player.guid == issuer_guid:
-                return player
+                player_id, list(self._game.collect_guessing_players_guids()))
+        return player
 
 
 class ChangeCardUseCase:
@@ -96,9 +97,10 @@ class ReadyUseCase:
         self._game.mark_ready(player)
 
     def _get_player(self, player_id: UUID) -> Player:
-        for player in self._game.players:
-            if player.guid == player_id:
-                return player
+        player = self._game.find_player(player_id)
+        if player is None:
+            raise EventIssuerIsNotPlayer(player_id)
+        return player
 
 
 class GetGameStateUseCase:
@@ -118,6 +120,14 @@ class AddCardUseCase:
         self._storage.store(card)
 
 
+class AddCardsUseCase:
+    def __init__(self, card_storage: CardStorage):
+        self._storage = card_storage
+
+    def __call__(self, cards: List[Card]) -> None:
+        self._storage.store_many(cards)
+
+
 class AddPersonUseCase:
     def __init__(self, person_storage: PersonStorage):
         self._storage = person_storage
@@ -149,16 +159,14 @@ class RetrieveAllPeopleUseCase:
     def __call__(self) -> Dict[str, UUID]:
         return self._storage.retrieve_all()
 
-class StartNewGameUseCase:
+class CreateLobbyUseCase:
     def __init__(self, person_storage: PersonStorage,
-                 deck_storage: DeckStorage, server_creator: GameServerCreator,
-                 rounds_count: int):
+                 deck_storage: DeckStorage, rounds_count: int):
         self._person_storage = person_storage
         self._deck_storage = deck_storage
-        self._creator = server_creator
         self._rounds_count = rounds_count
 
-    def __call__(self, player_guids: List[UUID]) -> GameServer:
+    def __call__(self, player_guids: List[UUID]) -> Lobby:
         people = self._person_storage.retrieve_many(player_guids)
         deck = self._deck_storage.get()
         lobby_members = [LobbyMember(name, guid) for name, guid in people.items()]
@@ -166,6 +174,19 @@ class StartNewGameUseCase:
         lobby = Lobby(lobby_members[0], game_settings)
         for member in lobby_members:
             lobby.add_member(member)
+        return lobby
+
+
+class StartNewGameUseCase:
+    def __init__(self, person_storage: PersonStorage,
+                 deck_storage: DeckStorage, server_creator: GameServerCreator,
+                 rounds_count: int):
+        self._create_lobby = CreateLobbyUseCase(person_storage, deck_storage,
+                                                rounds_count)
+        self._creator = server_creator
+
+    def __call__(self, player_guids: List[UUID]) -> GameServer:
+        lobby = self._create_lobby(player_guids)
         game_server = self._creator.create(lobby)
         return game_server
 
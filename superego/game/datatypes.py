@@ -1,34 +1,114 @@
-from typing import Any, List, Callable
+from typing import Any, List, Callable, Iterator
 
 
 class Carousel:
+    __slots__ = ('_items', '_next', '_previous', '_present', '_front',
+                 '_count')
+
     def __init__(self, initial_items: List[Any] = None):
         self._items: List[Any] = list()
+        self._next: List[int] = list()
+        self._previous: List[int] = list()
+        self._present: List[bool] = list()
+        self._front: int = -1
+        self._count: int = 0
         if initial_items:
-            self._items = initial_items
+            self._link_initial_items(initial_items)
 
-    def add(self, item: Any) -> None:
+    def add(self, item: Any) -> int:
+        seat = len(self._items)
         self._items.append(item)
+        self._present.append(True)
+        if self._count == 0:
+            self._next.append(seat)
+            self._previous.append(seat)
+            self._front = seat
+        else:
+            back = self._previous[self._front]
+            self._next.append(self._front)
+            self._previous.append(back)
+            self._next[back] = seat
+            self._previous[self._front] = seat
+        self._count += 1
+        return seat
 
     def pop_push(self) -> Any:
-        item = self._items.pop(0)
-        self._items.append(item)
+        item = self.front
+        self._front = self._next[self._front]
         return item
 
     def __len__(self):
-        return len(self._items)
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        seat = self._front
+        for _ in range(self._count):
+            yield self._items[seat]
+            seat = self._next[seat]
+
+    def iter_behind_front(self) -> Iterator[Any]:
+        if self._count == 0:
+            return
+        front = self._front
+        seat = self._next[front]
+        while seat != front:
+            next_ = self._next[seat]
+            yield self._items[seat]
+            seat = next_
+
+    def __getitem__(self, seat: int) -> Any:
+        if not self._present[seat]:
+            raise IndexError(f'Seat {seat} is empty')
+        return self._items[seat]
 
     def pop(self) -> Any:
-        return self._items.pop(0)
+        item = self.front
+        self.remove(self._front)
+        return item
+
+    def remove(self, seat: int) -> None:
+        if not self._present[seat]:
+            raise IndexError(f'Seat {seat} is empty')
+        previous, next_ = self._previous[seat], self._next[seat]
+        self._next[previous] = next_
+        self._previous[next_] = previous
+        self._present[seat] = False
+        self._count -= 1
+        if self._count == 0:
+            self._front = -1
+        elif self._front == seat:
+            self._front = next_
 
     def find_remove(self, criteria: Callable) -> None:
-        self._items = list(filter(criteria, self._items))
+        seats = [seat for seat in self._seats() if criteria(self._items[seat])]
+        for seat in seats:
+            self.remove(seat)
+
+    @property
+    def seats_count(self) -> int:
+        return len(self._items)
 
     @property
     def front(self) -> Any:
-        return self._items[0]
+        if self._count == 0:
+            raise IndexError('Carousel is empty')
+        return self._items[self._front]
 
     @property
     def items(self) -> List[Any]:
-        return self._items
+        return list(self)
+
+    def _seats(self) -> Iterator[int]:
+        seat = self._front
+        for _ in range(self._count):
+            yield seat
+            seat = self._next[seat]
 
+    def _link_initial_items(self, items: List[Any]) -> None:
+        count = len(items)
+        self._items = list(items)
+        self._next = list(range(1, count)) + [0]
+        self._previous = [count - 1] + list(range(count - 1))
+        self._present = [True] * count
+        self._front = 0
+        self._count = count
@@ -1,10 +1,9 @@
 import uuid
 import random
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 from dataclasses import dataclass
 from enum import Enum
-from collections import defaultdict
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
 
@@ -18,7 +17,7 @@ class GameError(RuntimeError):
     pass
 
 
-@dataclass(init=True, frozen=True)
+@dataclass(init=True, frozen=True, slots=True)
 class Card:
     question: str
     answer_A: str
@@ -29,29 +28,63 @@ class Card:
         return self.question
 
 
+class EmptyDeck(GameError):
+    pass
+
+
 class Deck:
-    def __init__(self, name: str, cards: List[Card]):
+    __slots__ = ('_guid', '_name', '_cards', '_rng', '_swapped_positions',
+                 '_drawn_count', '_current_index')
+
+    def __init__(self, name: str, cards: Sequence[Card], rng: random.Random = None):
         self._guid: UUID = uuid.uuid4()
         self._name: str = name
-        self._cards = cards
-        self._cards_carousel: Carousel = Carousel(self._cards)
+        self._cards: Sequence[Card] = cards
+        self._rng: random.Random = rng if rng else random.Random()
+        self._swapped_positions: Dict[int, int] = dict()
+        self._drawn_count: int = 0
+        self._current_index: int = 0
+        self.shuffle()
 
     def __repr__(self) -> str:
         return self._name
 
     def shuffle(self) -> None:
-        random.shuffle(self._cards)
-        self._cards_carousel = Carousel(self._cards)
+        self._swapped_positions.clear()
+        self._drawn_count = 0
+        self._draw()
 
     def advance_card(self) -> None:
-        self._cards_carousel.pop_push()
+        if self._drawn_count == len(self._cards):
+            self.shuffle()
+        else:
+            self._draw()
+
+    def _draw(self) -> None:
+        if not self._cards:
+            return
+        position = self._drawn_count
+        drawn_position = self._rng.randrange(position, len(self._cards))
+        card_index = self._swapped_positions.get(drawn_position, drawn_position)
+        self._swapped_positions[drawn_position] =\
+            self._swapped_positions.pop(position, position)
+        self._current_index = card_index
+        self._drawn_count += 1
+
+    @property
+    def cards(self) -> Sequence[Card]:
+        return self._cards
 
     @property
     def current_card(self) -> Card:
-        return self._cards_carousel.front
+        if not self._cards:
+            raise EmptyDeck(f'Deck {self._name} has no cards')
+        return self._cards[self._current_index]
 
 
 class LobbyMember:
+    __slots__ = ('_name', '_guid')
+
     def __init__(self, name: str, guid: UUID = None):
         self._name: str = name
         if guid:
@@ -71,13 +104,15 @@ class LobbyMember:
         return self._guid
 
 
-@dataclass(frozen=True, init=True)
+@dataclass(frozen=True, init=True, slots=True)
 class GameSettings:
     deck: Deck
     max_rounds_factor: int
 
 
 class Lobby:
+    __slots__ = ('_guid', '_host', '_members', '_deck', '_max_rounds_factor')
+
     def __init__(self, host: LobbyMember, settings: GameSettings):
         self._guid: UUID = uuid.uuid4()
         self._host: LobbyMember = host
@@ -121,9 +156,12 @@ class Lobby:
 
 
 class Player:
-    def __init__(self, lobby_member: LobbyMember):
+    __slots__ = ('_name', '_guid', '_seat', '_points')
+
+    def __init__(self, lobby_member: LobbyMember, seat: int):
         self._name = lobby_member.name
         self._guid = lobby_member.guid
+        self._seat = seat
         self._points = INITIAL_PLAYER_POINTS_COUNT
 
     def __repr__(self) -> str:
@@ -153,6 +191,10 @@ class Player:
     def guid(self) -> UUID:
         return self._guid
 
+    @property
+    def seat(self) -> int:
+        return self._seat
+
     @property
     def points(self) -> int:
         return self._points
@@ -163,21 +205,46 @@ class Player:
 
 
 class PlayersPool:
+    __slots__ = ('_players', '_players_carousel', '_guessing_players')
+
     def __init__(self, players: List[Player]):
         self._players: Dict[UUID, Player] =\
             {player.guid: player for player in players}
-        self._players_carousel: Carousel = Carousel(players)
+        self._players_carousel: Carousel = Carousel()
+        for player in players:
+            seat = self._players_carousel.add(player)
+            if seat != player.seat:
+                raise ValueError(f'Player {player.guid} seated at {seat}'
+                                 f' instead of {player.seat}')
+        self._guessing_players: List[bool] = [True] * len(players)
+        if players:
+            self._guessing_players[self.current_player.seat] = False
 
     def advance_player(self) -> None:
-        self._players_carousel.pop_push()
+        previous_player = self._players_carousel.pop_push()
+        self._guessing_players[previous_player.seat] = True
+        self._guessing_players[self.current_player.seat] = False
 
     def kick_player(self, player: Player) -> None:
         del self._players[player.guid]
-        self._players_carousel.find_remove(lambda x: x.guid == player.guid)
+        self._guessing_players[player.seat] = False
+        self._players_carousel.remove(player.seat)
+        if self._players:
+            self._guessing_players[self.current_player.seat] = False
+
+    def get_player(self, guid: UUID) -> Optional[Player]:
+        return self._players.get(guid)
+
+    def is_guessing(self, player: Player) -> bool:
+        return self._guessing_players[player.seat]
 
     def __len__(self):
         return len(self._players_carousel)
 
+    @property
+    def seats_count(self) -> int:
+        return self._players_carousel.seats_count
+
     @property
     def current_player(self) -> Player:
         return self._players_carousel.front
@@ -186,6 +253,15 @@ class PlayersPool:
     def all_players(self) -> List[Player]:
         return self._players_carousel.items
 
+    def collect_guessing_players_guids(self) -> Set[UUID]:
+        return {player.guid for player in self._players_carousel
+                if self._guessing_players[player.seat]}
+
+    def iter_guessing_players(self) -> Iterator[Player]:
+        for player in self._players_carousel.iter_behind_front():
+            if self._guessing_players[player.seat]:
+                yield player
+
 
 class Answer(Enum):
     ANSWER_A = 'A'
@@ -201,24 +277,29 @@ class PlayerAlreadyAnswered(GameError):
 
 
 class AnswersPool:
+    __slots__ = ('_players_pool', '_players_answered', '_player_answers',
+                 '_no_answers')
+
     def __init__(self, players_pool: PlayersPool):
         self._players_pool = players_pool
         self._players_answered: int = 0
-        self._player_answers: defaultdict[UUID, Answer]\
-            = defaultdict(lambda: Answer.NO_ANSWER)
+        self._no_answers: Tuple[Answer, ...] =\
+            (Answer.NO_ANSWER, ) * players_pool.seats_count
+        self._player_answers: List[Answer] = list(self._no_answers)
 
     def flush(self) -> None:
         self._players_answered = 0
-        self._player_answers = defaultdict(lambda: Answer.NO_ANSWER)
+        self._player_answers[:] = self._no_answers
 
     def add_answer(self, player: Player, answer: Answer) -> None:
-        if self._player_answers[player.guid] != Answer.NO_ANSWER:
+        seat = player.seat
+        if self._player_answers[seat] is not Answer.NO_ANSWER:
             raise PlayerAlreadyAnswered(player)
-        self._player_answers[player.guid] = answer
+        self._player_answers[seat] = answer
         self._players_answered += 1
 
     def get_player_answer(self, player: Player) -> Answer:
-        return self._player_answers[player.guid]
+        return self._player_answers[player.seat]
 
     @property
     def all_players_answered(self) -> bool:
@@ -238,20 +319,23 @@ class PlayerAlreadyBet(GameError):
 
 
 class BetPool:
+    __slots__ = ('_players_pool', '_players_bet', '_bets', '_no_bets')
+
     MAX_BET = 2
     MIN_BET = 1
 
     def __init__(self, players_pool: PlayersPool):
         self._players_pool = players_pool
         self._players_bet: int = 0
-        self._bets: defaultdict[UUID, int] = defaultdict(int)
+        self._no_bets: Tuple[int, ...] = (0, ) * players_pool.seats_count
+        self._bets: List[int] = list(self._no_bets)
 
     def flush(self) -> None:
         self._players_bet = 0
-        self._bets = defaultdict(int)
+        self._bets[:] = self._no_bets
 
     def get_player_bet(self, player: Player) -> int:
-        return self._bets[player.guid]
+        return self._bets[player.seat]
 
     def add_bet(self, player: Player, bet: int) -> None:
         self._ensure_player_has_not_bet(player)
@@ -259,7 +343,7 @@ class BetPool:
         self._place_bet(player, bet)
 
     def _ensure_player_has_not_bet(self, player: Player) -> None:
-        if self._bets[player.guid] != 0:
+        if self._bets[player.seat] != 0:
             raise PlayerAlreadyBet(player)
 
     def _ensure_bet_value_valid(self, bet: int) -> None:
@@ -267,7 +351,7 @@ class BetPool:
             raise InvalidBetValue(bet)
 
     def _place_bet(self, player: Player, bet: int) -> None:
-        self._bets[player.guid] = bet
+        self._bets[player.seat] = bet
         self._players_bet += 1
 
     @property
@@ -276,6 +360,8 @@ class BetPool:
 
 
 class PointsBank:
+    __slots__ = ('_points_in_bank', '_players_pool')
+
     def __init__(self, players_pool: PlayersPool):
         self._points_in_bank = INITIAL_PLAYER_POINTS_COUNT * len(players_pool)
         self._players_pool = players_pool
@@ -293,14 +379,56 @@ class PointsBank:
         return self._points_in_bank
 
 
+class ResultsBoard:
+    __slots__ = ('_players_pool', '_ready_players_count', '_players_ready',
+                 '_point_changes', '_none_ready', '_no_point_changes')
+
+    def __init__(self, players_pool: PlayersPool):
+        self._players_pool = players_pool
+        self._ready_players_count: int = 0
+        self._none_ready: Tuple[bool, ...] =\
+            (False, ) * players_pool.seats_count
+        self._no_point_changes: Tuple[int, ...] =\
+            (0, ) * players_pool.seats_count
+        self._players_ready: List[bool] = list(self._none_ready)
+        self._point_changes: List[int] = list(self._no_point_changes)
+
+    def flush(self) -> None:
+        self._ready_players_count = 0
+        self._players_ready[:] = self._none_ready
+        self._point_changes[:] = self._no_point_changes
+
+    def save_point_change(self, player: Player, points_count: int) -> None:
+        self._point_changes[player.seat] = points_count
+
+    def get_point_change(self, player: Player) -> int:
+        return self._point_changes[player.seat]
+
+    def mark_ready(self, player: Player) -> None:
+        self._players_ready[player.seat] = True
+        self._ready_players_count += 1
+
+    def player_ready(self, player: Player) -> bool:
+        return self._players_ready[player.seat]
+
+    @property
+    def all_players_ready(self) -> bool:
+        return self._ready_players_count == len(self._players_pool)
+
+
 class GameTable:
+    __slots__ = ('_guid', '_players_pool', '_answers_pool', '_bet_pool',
+                 '_results_board', '_deck', '_points_bank', '_version')
+
     def __init__(self, players_pool: PlayersPool, deck: Deck):
         self._guid = uuid.uuid4()
         self._players_pool = players_pool
         self._answers_pool: AnswersPool = AnswersPool(self._players_pool)
         self._bet_pool: BetPool = BetPool(self._players_pool)
+        self._results_board: ResultsBoard = ResultsBoard(self._players_pool)
         self._deck: Deck = deck
         self._points_bank = PointsBank(players_pool)
+        self._version: int = 0
 
     def change_card(self) -> None:
         self._deck.advance_card()
@@ -314,6 +442,7 @@ class GameTable:
     def flush(self) -> None:
         self._answers_pool.flush()
         self._bet_pool.flush()
+        self._results_board.flush()
 
     def get_player_bet(self, player: Player) -> int:
         return self._bet_pool.get_player_bet(player)
@@ -335,6 +464,18 @@ class GameTable:
     def execute_answering_player(self, player: Player, correct_guesses: int) -> None:
         self._points_bank.give_points(player, correct_guesses)
 
+    def save_point_change(self, player: Player, points_count: int) -> None:
+        self._results_board.save_point_change(player, points_count)
+
+    def get_point_change(self, player: Player) -> int:
+        return self._results_board.get_point_change(player)
+
+    def mark_player_ready(self, player: Player) -> None:
+        self._results_board.mark_ready(player)
+
+    def player_ready(self, player: Player) -> bool:
+        return self._results_board.player_ready(player)
+
     def player_answered(self, player: Player) -> bool:
         return self._answers_pool.get_player_answer(player) != Answer.NO_ANSWER
 
@@ -350,9 +491,26 @@ class GameTable:
     def advance_player(self) -> None:
         self._players_pool.advance_player()
 
+    def get_player(self, guid: UUID) -> Optional[Player]:
+        return self._players_pool.get_player(guid)
+
+    def is_guessing_player(self, player: Player) -> bool:
+        return self._players_pool.is_guessing(player)
+
     def shuffle_deck(self) -> None:
         self._deck.shuffle()
 
+    def bump_version(self) -> None:
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def deck(self) -> Deck:
+        return self._deck
+
     @property
     def current_card(self) -> Card:
         return self._deck.current_card
@@ -361,6 +519,10 @@ class GameTable:
     def all_players_answered(self) -> bool:
         return self._answers_pool.all_players_answered
 
+    @property
+    def all_players_ready(self) -> bool:
+        return self._results_board.all_players_ready
+
     @property
     def points_in_bank(self) -> int:
         return self._points_bank.points_left_in_bank
@@ -377,6 +539,12 @@ class GameTable:
     def guessing_players(self) -> List[Player]:
         return self._players_pool.all_players[1:]
 
+    def collect_guessing_players_guids(self) -> Set[UUID]:
+        return self._players_pool.collect_guessing_players_guids()
+
+    def iter_guessing_players(self) -> Iterator[Player]:
+        return self._players_pool.iter_guessing_players()
+
     @property
     def in_game_players_count(self) -> int:
         return len(self.players)
@@ -424,9 +592,10 @@ class PlayerAlreadyMarkedAsReady(GameError):
         super().__init__(message)
 
 
-@dataclass(frozen=True, init=True)
+@dataclass(frozen=True, init=True, slots=True)
 class PlayerState:
     guid: UUID
+    seat: int
     name: str
     points: int
     points_change: int
@@ -446,8 +615,9 @@ class PlayerState:
         return str_
 
 
-@dataclass(frozen=True, init=True)
+@dataclass(frozen=True, init=True, slots=True)
 class GameState:
+    version: int
     time: datetime
     phase: GamePhaseName
     player_states: List[PlayerState]
@@ -463,25 +633,54 @@ class GameObserver(metaclass=ABCMeta):
         pass
 
 
+class GameRecorder(metaclass=ABCMeta):
+    @abstractmethod
+    def record_game_started(self, game: 'Game') -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def record_action(self, action: ActionName, player: Player,
+                      params: Tuple = ()) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def record_game_closed(self) -> None:
+        raise NotImplemented
+
+
+class NullGameRecorder(GameRecorder):
+    def record_game_started(self, game: 'Game') -> None:
+        pass
+
+    def record_action(self, action: ActionName, player: Player,
+                      params: Tuple = ()) -> None:
+        pass
+
+    def record_game_closed(self) -> None:
+        pass
+
+
 class Clock(metaclass=ABCMeta):
     @abstractmethod
     def now(self) -> datetime:
         raise NotImplemented
 
 
-@dataclass(init=True, frozen=True)
+@dataclass(init=True, frozen=True, slots=True)
 class GameContext:
     round_number: int
     max_rounds: int
 
 
-@dataclass(init=True, frozen=True)
+@dataclass(init=True, frozen=True, slots=True)
 class Guess:
     answer: Answer
     bet: int
 
 
 class GamePhase(metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def answer(self, player: Player, answer: Answer) -> 'GamePhase':
         raise NotImplemented
@@ -510,6 +709,8 @@ class GamePhase(metaclass=ABCMeta):
 
 
 class GameOver(GamePhase):
+    __slots__ = ('_game_table', '_context', '_clock')
+
     def __init__(
         self,
         context: GameContext,
@@ -562,6 +763,7 @@ class GameOver(GamePhase):
                          for player in self._game_table.players]
         current_time = self._clock.now()
         return GameState(
+            version=self._game_table.version,
             time=current_time,
             phase=GamePhaseName.GAME_OVER_PHASE,
             player_states=player_states,
@@ -575,6 +777,7 @@ class GameOver(GamePhase):
     def _construct_player_state(player: Player) -> PlayerState:
         return PlayerState(
             guid=player.guid,
+            seat=player.seat,
             name=player.name,
             points=player.points,
             points_change=0,
@@ -585,6 +788,8 @@ class GameOver(GamePhase):
 
 
 class ResultPhase(GamePhase):
+    __slots__ = ('_context', '_game_table', '_correct_guesses', '_clock')
+
     def __init__(
         self,
         context: GameContext,
@@ -593,9 +798,6 @@ class ResultPhase(GamePhase):
     ):
         self._context: GameContext = context
         self._game_table: GameTable = game_table
-        self._ready_players_count: int = 0
-        self._players_ready: defaultdict[UUID, bool] = defaultdict(bool)
-        self._point_changes: defaultdict[UUID, int] = defaultdict(int)
         self._correct_guesses: int = 0
         self._clock = clock
 
@@ -640,12 +842,16 @@ class ResultPhase(GamePhase):
         return state
 
     def _settle(self) -> None:
-        for player in self._game_table.guessing_players:
-            self._settle_guessing_player(player)
-        self._settle_answering_player(self._game_table.current_player)
-
-    def _settle_guessing_player(self, player: Player) -> None:
-        answer_correct = self._player_answered_correctly(player)
+        answering_player = self._game_table.current_player
+        correct_answer = self._game_table.get_player_answer(answering_player)
+        for player in self._game_table.iter_guessing_players():
+            self._settle_guessing_player(player, correct_answer)
+        self._settle_answering_player(answering_player)
+
+    def _settle_guessing_player(self, player: Player,
+                                correct_answer: Answer) -> None:
+        answer_correct = self._game_table.get_player_answer(player)\
+            is correct_answer
         bet = self._game_table.get_player_bet(player)
         if answer_correct:
             self._game_table.execute_winning_guess(player)
@@ -660,24 +866,16 @@ class ResultPhase(GamePhase):
         self._save_point_change(player, self._correct_guesses)
 
     def _save_point_change(self, player: Player, points_count: int) -> None:
-        self._point_changes[player.guid] = points_count
-
-    def _player_answered_correctly(self, player: Player) -> bool:
-        player_answer = self._game_table.get_player_answer(player)
-        correct_answer = self._game_table.get_player_answer(
-            self._game_table.current_player)
-        return player_answer == correct_answer
+        self._game_table.save_point_change(player, points_count)
 
     def _player_already_marked(self, player: Player) -> bool:
-        return self._players_ready[player.guid]
+        return self._game_table.player_ready(player)
 
     def _do_mark_ready(self, player: Player) -> None:
-        self._players_ready[player.guid] = True
-        self._ready_players_count += 1
+        self._game_table.mark_player_ready(player)
 
     def _all_players_ready(self) -> bool:
-        return self._ready_players_count\
-               == self._game_table.in_game_players_count
+        return self._game_table.all_players_ready
 
     def _advance(self) -> GamePhase:
         if self._is_game_to_end():
@@ -718,6 +916,7 @@ class ResultPhase(GamePhase):
         player_states = [self._construct_player_state(player)
                          for player in self._game_table.players]
         return GameState(
+            version=self._game_table.version,
             time=self._clock.now(),
             phase=GamePhaseName.RESULT_PHASE,
             player_states=player_states,
@@ -728,10 +927,11 @@ class ResultPhase(GamePhase):
         )
 
     def _construct_player_state(self, player: Player) -> PlayerState:
-        points_change = self._point_changes[player.guid]
-        ready = self._players_ready[player.guid]
+        points_change = self._game_table.get_point_change(player)
+        ready = self._game_table.player_ready(player)
         return PlayerState(
             guid=player.guid,
+            seat=player.seat,
             name=player.name,
             points=player.points,
             points_change=points_change,
@@ -742,6 +942,8 @@ class ResultPhase(GamePhase):
 
 
 class GuessPhase(GamePhase):
+    __slots__ = ('_context', '_game_table', '_clock')
+
     def __init__(
         self,
         context: GameContext,
@@ -763,8 +965,8 @@ class GuessPhase(GamePhase):
         self._ensure_correct_player(player)
         self._ensure_bet_possible(player, bet)
 
-        self._game_table.add_answer(player, answer)
         self._game_table.place_bet(player, bet)
+        self._game_table.add_answer(player, answer)
 
         if self._game_table.all_players_answered:
             return self._advance()
@@ -809,6 +1011,7 @@ class GuessPhase(GamePhase):
                          for player in self._game_table.players]
         current_time = self._clock.now()
         game_state = GameState(
+            version=self._game_table.version,
             time=current_time,
             phase=GamePhaseName.GUESS_PHASE,
             player_states=player_states,
@@ -822,6 +1025,7 @@ class GuessPhase(GamePhase):
     def _construct_player_state(self, player: Player) -> PlayerState:
         player_state = PlayerState(
             guid=player.guid,
+            seat=player.seat,
             name=player.name,
             points=player.points,
             points_change=0,
@@ -837,6 +1041,8 @@ class GuessPhase(GamePhase):
 
 
 class AnswerPhase(GamePhase):
+    __slots__ = ('_game_table', '_card_changed', '_clock', '_context')
+
     def __init__(
         self,
         context: GameContext,
@@ -892,6 +1098,7 @@ class AnswerPhase(GamePhase):
                          for player in self._game_table.players]
         current_time = self._clock.now()
         game_state = GameState(
+            version=self._game_table.version,
             time=current_time,
             phase=GamePhaseName.ANSWER_PHASE,
             player_states=player_states,
@@ -906,6 +1113,7 @@ class AnswerPhase(GamePhase):
         awaited_to_answer = self._is_player_awaited_to_answer(player)
         player_state = PlayerState(
             guid=player.guid,
+            seat=player.seat,
             name=player.name,
             points=player.points,
             points_change=0,
@@ -920,37 +1128,81 @@ class AnswerPhase(GamePhase):
             and not self._game_table.player_answered(player)
 
 
+@dataclass(init=True, frozen=True, slots=True)
+class GameSnapshot:
+    phase: GamePhase
+    game_table: GameTable
+
+
 class Game:
-    def __init__(self, lobby: Lobby, clock: Clock, observer: GameObserver):
-        players = [Player(member) for member in lobby.members]
+    __slots__ = ('_game_table', '_game', '_observer', '_recorder', '_state')
+
+    def __init__(self, lobby: Lobby, clock: Clock, observer: GameObserver,
+                 recorder: GameRecorder = None):
+        players = [Player(member, seat)
+                   for seat, member in enumerate(lobby.members)]
         players_pool = PlayersPool(players)
         context = GameContext(round_number=1, max_rounds=lobby.max_rounds)
         self._game_table: GameTable = GameTable(players_pool, lobby.deck)
-        self._observer: GameObserver = observer
         self._game: GamePhase = AnswerPhase(context, self._game_table, clock)
         self._game_table.shuffle_deck()
-        self._observer.notify_game_state_changed(self._game.state)
+        self._start(observer, recorder)
+
+    @classmethod
+    def restore(cls, snapshot: GameSnapshot, observer: GameObserver = None,
+                recorder: GameRecorder = None) -> 'Game':
+        game = cls.__new__(cls)
+        game._game_table = snapshot.game_table
+        game._game = snapshot.phase
+        game._start(observer, recorder)
+        return game
+
+    def _start(self, observer: Optional[GameObserver],
+               recorder: GameRecorder) -> None:
+        self._observer: Optional[GameObserver] = observer
+        self._recorder: GameRecorder = recorder if recorder \
+            else NullGameRecorder()
+        self._state: Optional[GameState] = None
+        self._recorder.record_game_started(self)
+        if self._observer is not None:
+            self._observer.notify_game_state_changed(self.state)
 
     def answer(self, player: Player, answer: Answer) -> None:
         self._game = self._game.answer(player, answer)
-        self._observer.notify_game_state_changed(self._game.state)
+        self._commit(ActionName.ANSWER_ACTION, player, (answer,))
 
     def guess(self, player: Player, guess: Guess) -> None:
         self._game = self._game.guess(player, guess)
-        self._observer.notify_game_state_changed(self._game.state)
+        self._commit(ActionName.GUESS_ACTION, player, (guess.answer, guess.bet))
 
     def change_card(self, player: Player) -> None:
         self._game = self._game.change_card(player)
-        self._game_table.shuffle_deck()
-        self._observer.notify_game_state_changed(self._game.state)
+        self._commit(ActionName.CHANGE_CARD_ACTION, player)
 
     def mark_ready(self, player: Player) -> None:
         self._game = self._game.mark_ready(player)
-        self._observer.notify_game_state_changed(self._game.state)
+        self._commit(ActionName.MARK_READY_ACTION, player)
+
+    def _commit(self, action: ActionName, player: Player,
+                params: Tuple = ()) -> None:
+        self._game_table.bump_version()
+        self._recorder.record_action(action, player, params)
+        if self._observer is not None:
+            self._observer.notify_game_state_changed(self.state)
+
+    def snapshot(self) -> GameSnapshot:
+        return GameSnapshot(phase=self._game, game_table=self._game_table)
+
+    @property
+    def version(self) -> int:
+        return self._game_table.version
 
     @property
     def state(self) -> GameState:
-        return self._game.state
+        if self._state is None\
+                or self._state.version != self._game_table.version:
+            self._state = self._game.state
+        return self._state
 
     @property
     def over(self) -> bool:
@@ -968,6 +1220,15 @@ class Game:
     def guessing_players(self) -> List[Player]:
         return self._game_table.guessing_players
 
+    def collect_guessing_players_guids(self) -> Set[UUID]:
+        return self._game_table.collect_guessing_players_guids()
+
+    def find_player(self, guid: UUID) -> Optional[Player]:
+        return self._game_table.get_player(guid)
+
+    def is_guessing_player(self, player: Player) -> bool:
+        return self._game_table.is_guessing_player(player)
+
     @property
     def current_card(self) -> Card:
         return self._game_table.current_card
@@ -0,0 +1,31 @@
+import threading
+from typing import Callable, Iterable, Optional, Tuple
+
+from superego.game.game import Card
+
+
+class CardPool:
+    def __init__(self):
+        self._cards: Optional[Tuple[Card, ...]] = None
+        self._generation: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, load: Callable[[], Iterable[Card]]) -> Tuple[Card, ...]:
+        cards = self._cards
+        if cards is not None:
+            return cards
+        with self._lock:
+            generation = self._generation
+        cards = tuple(load())
+        with self._lock:
+            if self._generation == generation:
+                self._cards = cards
+        return cards
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cards = None
+
+
+card_pool = CardPool()
@@ -1,4 +1,8 @@
 from superego.infrastructure.settings import config, BASE_DIR
 
-database_file = BASE_DIR / config['sqlite']['filename']
-connection_string = 'sqlite:///{}'.format(database_file)
\ No newline at end of file
+
+def get_connection_string(filename: str) -> str:
+    return 'sqlite:///{}'.format(BASE_DIR / filename)
+
+
+connection_string = get_connection_string(config['sqlite']['filename'])
\ No newline at end of file
@@ -1,7 +1,70 @@
-from sqlalchemy import create_engine, Engine
+from dataclasses import dataclass
+from typing import List
+
+from sqlalchemy import create_engine, Engine, event
 
 from superego.infrastructure.database.dsn import connection_string
 
+DEFAULT_JOURNAL_MODE = 'wal'
+DEFAULT_SYNCHRONOUS = 'normal'
+DEFAULT_CACHE_SIZE = -16384
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT = 5000
+DEFAULT_STATEMENT_CACHE_SIZE = 256
+
+JOURNAL_MODES = ('delete', 'truncate', 'persist', 'memory', 'wal', 'off')
+SYNCHRONOUS_MODES = ('off', 'normal', 'full', 'extra')
+
+
+class InvalidSQLiteSetting(ValueError):
+    def __init__(self, name: str, value: str, allowed: tuple):
+        message = f'Invalid SQLite {name}: {value}, expected one of {allowed}'
+        super().__init__(message)
+
+
+@dataclass(init=True, frozen=True)
+class SQLiteConfig:
+    journal_mode: str = DEFAULT_JOURNAL_MODE
+    synchronous: str = DEFAULT_SYNCHRONOUS
+    cache_size: int = DEFAULT_CACHE_SIZE
+    mmap_size: int = DEFAULT_MMAP_SIZE
+    busy_timeout: int = DEFAULT_BUSY_TIMEOUT
+    statement_cache_size: int = DEFAULT_STATEMENT_CACHE_SIZE
+
+    def __post_init__(self):
+        if self.journal_mode.lower() not in JOURNAL_MODES:
+            raise InvalidSQLiteSetting('journal mode', self.journal_mode,
+                                       JOURNAL_MODES)
+        if self.synchronous.lower() not in SYNCHRONOUS_MODES:
+            raise InvalidSQLiteSetting('synchronous mode', self.synchronous,
+                                       SYNCHRONOUS_MODES)
+
+
+def get_db(url: str = connection_string) -> Engine:
+    return create_engine(url)
+
+
+def get_pooled_db(url: str, config: SQLiteConfig, pool_size: int,
+                  read_only: bool = False) -> Engine:
+    engine = create_engine(
+        url, pool_size=pool_size, max_overflow=0,
+        connect_args={'cached_statements': config.statement_cache_size})
+    pragmas = _get_pragmas(config, read_only)
+
+    @event.listens_for(engine, 'connect')
+    def configure_connection(dbapi_connection, connection_record) -> None:
+        for pragma in pragmas:
+            dbapi_connection.execute(pragma)
+
+    return engine
+
 
-def get_db() -> Engine:
-    return create_engine(connection_string)
\ No newline at end of file
+def _get_pragmas(config: SQLiteConfig, read_only: bool) -> List[str]:
+    pragmas = [f'PRAGMA busy_timeout = {int(config.busy_timeout)}',
+               f'PRAGMA journal_mode = {config.journal_mode.lower()}',
+               f'PRAGMA synchronous = {config.synchronous.lower()}',
+               f'PRAGMA cache_size = {int(config.cache_size)}',
+               f'PRAGMA mmap_size = {int(config.mmap_size)}']
+    if read_only:
+        pragmas.append('PRAGMA query_only = ON')
+    return pragmas
@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy import Connection, Engine
+
+DEFAULT_STORAGE_READERS = 4
+DEFAULT_STORAGE_MAX_PENDING = 64
+
+T = TypeVar('T')
+
+
+class StorageExecutor:
+    def __init__(self, readers: Engine, writer: Engine,
+                 readers_count: int = DEFAULT_STORAGE_READERS,
+                 max_pending: int = DEFAULT_STORAGE_MAX_PENDING):
+        self._readers: Engine = readers
+        self._writer: Engine = writer
+        self._readers_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=readers_count, thread_name_prefix='storage-reader')
+        self._writer_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='storage-writer')
+        self._max_pending: int = max_pending
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def read(self, work: Callable[[Connection], T]) -> T:
+        return await self._submit(self._readers_executor, self.read_sync,
+                                  work)
+
+    async def write(self, work: Callable[[Connection], T]) -> T:
+        return await self._submit(self._writer_executor, self.write_sync,
+                                  work)
+
+    def read_sync(self, work: Callable[[Connection], T]) -> T:
+        with self._readers.connect() as connection:
+            return work(connection)
+
+    def write_sync(self, work: Callable[[Connection], T]) -> T:
+        with self._writer.connect() as connection:
+            return work(connection)
+
+    def shutdown(self) -> None:
+        self._readers_executor.shutdown(wait=True)
+        self._writer_executor.shutdown(wait=True)
+
+    async def _submit(self, executor: Executor,
+                      call: Callable[[Callable[[Connection], T]], T],
+                      work: Callable[[Connection], T]) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, call, work)
@@ -0,0 +1,294 @@
+import csv
+import json
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from superego.game.game import Card
+from superego.infrastructure.database.tables import card as card_table
+
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+CARD_FIELDS = ('question', 'answer_a', 'answer_b', 'answer_c')
+CARD_FIELD_LIMITS: Dict[str, int] = {
+    name: card_table.c[name].type.length for name in CARD_FIELDS}
+MAX_CSV_RECORD_LENGTH = sum(2 * limit + 4
+                            for limit in CARD_FIELD_LIMITS.values())
+
+Record = Union[Dict, 'InvalidCardRow']
+
+
+class ImportFormat(Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+class CardImportError(RuntimeError):
+    pass
+
+
+class InvalidCardRow(CardImportError):
+    pass
+
+
+class MissingCardFields(InvalidCardRow):
+    def __init__(self, names: List[str]):
+        message = f'Card is missing fields: {names}'
+        super().__init__(message)
+
+
+class CardFieldTooLong(InvalidCardRow):
+    def __init__(self, name: str, length: int, limit: int):
+        message = f'Card field {name} is {length} characters long,' \
+                  f' limit is {limit}'
+        super().__init__(message)
+
+
+class UnterminatedCSVRecord(InvalidCardRow):
+    def __init__(self, lines_count: int):
+        message = f'Quoted field is not closed after {lines_count} lines'
+        super().__init__(message)
+
+
+class ImportLineTooLong(InvalidCardRow):
+    def __init__(self, reason: str):
+        message = f'Line is too long to read ({reason}), import stopped'
+        super().__init__(message)
+
+
+class CardFieldNotText(InvalidCardRow):
+    def __init__(self, name: str):
+        message = f'Card field {name} is not a text'
+        super().__init__(message)
+
+
+@dataclass(init=True, frozen=True)
+class RowError:
+    row: int
+    error: str
+
+
+@dataclass(init=True)
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    def add_error(self, row: int, error: Exception) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowError(row, str(error)))
+
+    def to_dict(self) -> Dict:
+        return {
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': [{'row': error.row, 'error': error.error}
+                       for error in self.errors],
+            'errors_truncated': self.failed > len(self.errors)
+        }
+
+
+class RecordDecoder(metaclass=ABCMeta):
+    @abstractmethod
+    def feed(self, line: str) -> Iterator[Tuple[int, Record]]:
+        raise NotImplemented
+
+    @abstractmethod
+    def skip(self, error: InvalidCardRow) -> Iterator[Tuple[int, Record]]:
+        raise NotImplemented
+
+    @abstractmethod
+    def finish(self) -> Iterator[Tuple[int, Record]]:
+        raise NotImplemented
+
+
+class NDJSONDecoder(RecordDecoder):
+    def __init__(self):
+        self._line_number: int = 0
+
+    def feed(self, line: str) -> Iterator[Tuple[int, Record]]:
+        self._line_number += 1
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield self._line_number, InvalidCardRow(f'Invalid JSON: {e}')
+            return
+        if not isinstance(record, dict):
+            yield self._line_number, InvalidCardRow('Row is not an object')
+            return
+        yield self._line_number, record
+
+    def skip(self, error: InvalidCardRow) -> Iterator[Tuple[int, Record]]:
+        self._line_number += 1
+        yield self._line_number, error
+
+    def finish(self) -> Iterator[Tuple[int, Record]]:
+        return iter(())
+
+
+class CSVDecoder(RecordDecoder):
+    def __init__(self):
+        self._line_number: int = 0
+        self._record_line: int = 0
+        self._pending: List[str] = list()
+        self._pending_length: int = 0
+        self._quotes: int = 0
+        self._header: Optional[List[str]] = None
+
+    def feed(self, line: str) -> Iterator[Tuple[int, Record]]:
+        yield from self._feed_lines(deque((line, )))
+
+    def skip(self, error: InvalidCardRow) -> Iterator[Tuple[int, Record]]:
+        self._line_number += 1
+        row = self._record_line if self._pending else self._line_number
+        self._clear_pending()
+        yield row, error
+
+    def finish(self) -> Iterator[Tuple[int, Record]]:
+        while self._pending and self._quotes % 2:
+            yield self._record_line, UnterminatedCSVRecord(len(self._pending))
+            yield from self._feed_lines(self._reject_pending())
+        if self._pending:
+            yield from self._decode_pending()
+
+    def _feed_lines(self, lines: Deque[str]) -> Iterator[Tuple[int, Record]]:
+        while lines:
+            line = lines.popleft()
+            self._line_number += 1
+            if not self._pending:
+                self._record_line = self._line_number
+            self._pending.append(line)
+            self._pending_length += len(line)
+            self._quotes += line.count('"')
+            if self._quotes % 2 == 0:
+                yield from self._decode_pending()
+            elif self._pending_length > MAX_CSV_RECORD_LENGTH:
+                yield self._record_line, \
+                    UnterminatedCSVRecord(len(self._pending))
+                lines.extendleft(reversed(self._reject_pending()))
+
+    def _reject_pending(self) -> Deque[str]:
+        lines = deque(self._pending[1:])
+        self._line_number = self._record_line
+        self._clear_pending()
+        return lines
+
+    def _clear_pending(self) -> None:
+        self._pending = list()
+        self._pending_length = 0
+        self._quotes = 0
+
+    def _decode_pending(self) -> Iterator[Tuple[int, Record]]:
+        text = ''.join(self._pending)
+        self._clear_pending()
+        if not text.strip():
+            return
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield self._record_line, InvalidCardRow(f'Invalid CSV: {e}')
+            return
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return
+        if len(values) != len(self._header):
+            yield self._record_line, InvalidCardRow(
+                f'Row has {len(values)} columns,'
+                f' header has {len(self._header)}')
+            return
+        yield self._record_line, dict(zip(self._header, values))
+
+
+@dataclass(init=True, frozen=True)
+class CardChunk:
+    rows: List[int]
+    cards: List[Card]
+
+
+class CardImport:
+    def __init__(self, format_: ImportFormat,
+                 chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+                 encoding: str = 'utf-8'):
+        self._decoder: RecordDecoder = NDJSONDecoder() \
+            if format_ == ImportFormat.NDJSON else CSVDecoder()
+        self._chunk_size: int = chunk_size
+        self._encoding: str = encoding
+        self._rows: List[int] = list()
+        self._cards: List[Card] = list()
+        self._report: ImportReport = ImportReport()
+
+    def feed(self, line: Union[str, bytes]) -> Optional[CardChunk]:
+        if isinstance(line, bytes):
+            try:
+                line = line.decode(self._encoding)
+            except UnicodeDecodeError as e:
+                self.reject_line(
+                    InvalidCardRow(f'Invalid {self._encoding} text: {e}'))
+                return None
+        self._collect(self._decoder.feed(line))
+        if len(self._cards) >= self._chunk_size:
+            return self._take_chunk()
+        return None
+
+    def reject_line(self, error: InvalidCardRow) -> None:
+        self._collect(self._decoder.skip(error))
+
+    def finish(self) -> Optional[CardChunk]:
+        self._collect(self._decoder.finish())
+        if self._cards:
+            return self._take_chunk()
+        return None
+
+    def chunk_stored(self, chunk: CardChunk) -> None:
+        self._report.imported += len(chunk.cards)
+
+    def chunk_failed(self, chunk: CardChunk, error: Exception) -> None:
+        for row in chunk.rows:
+            self._report.add_error(row, error)
+
+    @property
+    def report(self) -> ImportReport:
+        return self._report
+
+    def _collect(self, records: Iterator[Tuple[int, Record]]) -> None:
+        for row, record in records:
+            try:
+                self._cards.append(validate_card(record))
+                self._rows.append(row)
+            except InvalidCardRow as e:
+                self._report.add_error(row, e)
+
+    def _take_chunk(self) -> CardChunk:
+        chunk = CardChunk(self._rows, self._cards)
+        self._rows = list()
+        self._cards = list()
+        return chunk
+
+
+def validate_card(record: Record) -> Card:
+    if isinstance(record, InvalidCardRow):
+        raise record
+    missing = [name for name in CARD_FIELDS if name not in record]
+    if missing:
+        raise MissingCardFields(missing)
+    for name in CARD_FIELDS:
+        value = record[name]
+        if not isinstance(value, str):
+            raise CardFieldNotText(name)
+        if len(value) > CARD_FIELD_LIMITS[name]:
+            raise CardFieldTooLong(name, len(value), CARD_FIELD_LIMITS[name])
+    return Card(question=record['question'], answer_A=record['answer_a'],
+                answer_B=record['answer_b'], answer_C=record['answer_c'])
+
+
+def detect_format(name: str) -> ImportFormat:
+    name = name.lower()
+    if name.endswith('.csv') or name == 'text/csv':
+        return ImportFormat.CSV
+    return ImportFormat.NDJSON
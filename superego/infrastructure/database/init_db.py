@@ -1,12 +1,8 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine
 
-from superego.infrastructure.database.tables import deck, card, person
 from superego.infrastructure.database.dsn import connection_string
-
-def create_tables(engine_):
-    meta = MetaData()
-    meta.create_all(bind=engine_, tables=[deck, card, person])
+from superego.infrastructure.database.migrations import migrate
 
 if __name__ == '__main__':
     engine = create_engine(connection_string)
-    create_tables(engine)
\ No newline at end of file
+    migrate(engine)
\ No newline at end of file
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import Connection, Engine, Table
+
+from superego.infrastructure.database.tables import card, deck, meta, person
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+class SchemaVersionUnknown(MigrationError):
+    def __init__(self, version: int, latest_version: int):
+        message = f'Database schema version {version} is newer than' \
+                  f' the latest known version {latest_version}'
+        super().__init__(message)
+
+
+class LeftoverMigrationTable(MigrationError):
+    def __init__(self, name: str):
+        message = f'Table {name} left by an interrupted migration exists,' \
+                  f' restore its rows before migrating again'
+        super().__init__(message)
+
+
+@dataclass(init=True, frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+def _create_tables(connection: Connection) -> None:
+    meta.create_all(bind=connection, checkfirst=True)
+
+
+def _index_person_lookups(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_person_guid ON person (guid)')
+    connection.exec_driver_sql(
+        'CREATE INDEX IF NOT EXISTS ix_person_name ON person (name)')
+
+
+def _guid_to_blob(guid: Union[str, bytes]) -> bytes:
+    if isinstance(guid, bytes):
+        return guid
+    return UUID(guid).bytes
+
+
+def _get_column_type(connection: Connection, table: Table, name: str) -> str:
+    for column in connection.exec_driver_sql(
+            f'PRAGMA table_info({table.name})'):
+        if column[1] == name:
+            return column[2]
+
+
+def _table_exists(connection: Connection, name: str) -> bool:
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (name, )).first() is not None
+
+
+def _rebuild_with_blob_guids(connection: Connection, table: Table) -> None:
+    legacy_name = f'_{table.name}_text_guid'
+    if _table_exists(connection, legacy_name):
+        raise LeftoverMigrationTable(legacy_name)
+    for index in table.indexes:
+        connection.exec_driver_sql(f'DROP INDEX IF EXISTS {index.name}')
+    connection.exec_driver_sql(
+        f'ALTER TABLE {table.name} RENAME TO {legacy_name}')
+    table.create(bind=connection)
+    names = [column.name for column in table.columns]
+    values = ['guid_to_blob(guid)' if name == 'guid' else name
+              for name in names]
+    connection.exec_driver_sql(
+        f'INSERT INTO {table.name} ({", ".join(names)})'
+        f' SELECT {", ".join(values)} FROM {legacy_name}')
+    connection.exec_driver_sql(f'DROP TABLE {legacy_name}')
+
+
+def _store_guids_as_blobs(connection: Connection) -> None:
+    connection.connection.driver_connection.create_function(
+        'guid_to_blob', 1, _guid_to_blob, deterministic=True)
+    for table in (deck, card, person):
+        if _get_column_type(connection, table, 'guid') != 'BLOB':
+            _rebuild_with_blob_guids(connection, table)
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, 'Create tables', _create_tables),
+    Migration(2, 'Index person by GUID and name', _index_person_lookups),
+    Migration(3, 'Store GUIDs as 16-byte blobs', _store_guids_as_blobs),
+)
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(connection: Connection) -> int:
+    return connection.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def pending_migrations(connection: Connection) -> List[Migration]:
+    version = get_schema_version(connection)
+    if version > LATEST_VERSION:
+        raise SchemaVersionUnknown(version, LATEST_VERSION)
+    return [migration for migration in MIGRATIONS
+            if migration.version > version]
+
+
+def migrate(engine: Engine, target_version: Optional[int] = None
+            ) -> List[Migration]:
+    applied = list()
+    with engine.connect() as connection:
+        for migration in pending_migrations(connection):
+            if target_version is not None \
+                    and migration.version > target_version:
+                break
+            connection.exec_driver_sql('BEGIN')
+            try:
+                migration.apply(connection)
+                connection.exec_driver_sql(
+                    f'PRAGMA user_version = {migration.version}')
+            except Exception:
+                connection.rollback()
+                raise
+            connection.commit()
+            applied.append(migration)
+    return applied
@@ -1,18 +1,20 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator
 from uuid import UUID
 
-from sqlalchemy import Connection, insert, select, Row, delete
+from sqlalchemy import Connection, insert, select, Row, delete, bindparam
 
 from superego.application.interfaces import CardStorage, PersonStorage, DeckStorage
 from superego.game.game import Card, Deck
 
+from superego.infrastructure.database.cache import CardPool, card_pool as shared_card_pool
 from superego.infrastructure.database.tables import card as card_table
 from superego.infrastructure.database.tables import person
 
 
 class DataBaseCardStorage(CardStorage):
-    def __init__(self, connection: Connection):
+    def __init__(self, connection: Connection, card_pool: CardPool = shared_card_pool):
         self._connection = connection
+        self._card_pool = card_pool
 
     def store(self, card: Card) -> None:
         self._connection.execute(
@@ -24,10 +26,21 @@ class DataBaseCardStorage(CardStorage):
             )
         )
         self._connection.commit()
+        self._card_pool.invalidate()
+
+    def store_many(self, cards: List[Card]) -> None:
+        self._connection.execute(
+            insert(card_table),
+            [{'question': card.question, 'answer_a': card.answer_A, 'answer_b': card.answer_B,
+              'answer_c': card.answer_C} for card in cards]
+        )
+        self._connection.commit()
+        self._card_pool.invalidate()
 
     def get_all(self) -> List[Card]:
         result = self._connection.execute(
             select(card_table.c.question, card_table.c.answer_a, card_table.c.answer_b, card_table.c.answer_c)
+            .order_by(card_table.c.id)
         )
         cards = [self._convert_row_to_card(row) for row in result]
         return cards
@@ -40,68 +53,59 @@ class DataBaseCardStorage(CardStorage):
 
 
 class DataBasePersonStorage(PersonStorage):
+    _INSERT = insert(person)
+    _SELECT_GUID = select(person.c.guid).where(person.c.name == bindparam('name')).limit(1)
+    _SELECT_ALL = select(person.c.name, person.c.guid)
+    _SELECT_MANY = select(person.c.name, person.c.guid).where(
+        person.c.guid.in_(bindparam('guids', expanding=True)))
+    _DELETE = delete(person).where(person.c.guid == bindparam('guid'))
+
     def __init__(self, connection: Connection):
         self._connection = connection
 
     def store(self, name: str) -> None:
-        self._connection.execute(
-            insert(person).values(name=name)
-        )
+        self._connection.execute(self._INSERT, {'name': name})
         self._connection.commit()
 
     def retrieve_guid(self, name: str) -> UUID:
-        result = self._connection.execute(
-            select(person.c.guid).where(person.c.name == name).limit(1)
-        )
+        result = self._connection.execute(self._SELECT_GUID, {'name': name})
         for row in result:
-            guid = UUID(*row)
-            return guid
+            return row.guid
 
     def retrieve_all(self) -> Dict[str, UUID]:
-        result = self._connection.execute(
-            select(person.c.name, person.c.guid)
-        )
-        pairs = [self._convert_row_to_pair(row) for row in result]
-        dict_ = {name: guid for name, guid in pairs}
+        result = self._connection.execute(self._SELECT_ALL)
+        dict_ = {name: guid for name, guid in result}
         return dict_
 
     def retrieve_many(self, guids: List[UUID]) -> Dict[str, UUID]:
-        guids_as_str = [str(guid) for guid in guids]
-        result = self._connection.execute(
-            select(person.c.name, person.c.guid).where(person.c.guid.in_(guids_as_str))
-        )
-        pairs = [self._convert_row_to_pair(row) for row in result]
-        dict_ = {name: guid for name, guid in pairs}
+        result = self._connection.execute(self._SELECT_MANY, {'guids': guids})
+        dict_ = {name: guid for name, guid in result}
         return dict_
 
     def remove(self, guid: UUID) -> None:
-        self._connection.execute(
-            delete(person).where(person.c.guid == str(guid))
-        )
+        self._connection.execute(self._DELETE, {'guid': guid})
         self._connection.commit()
 
-    @staticmethod
-    def _convert_row_to_pair(row: Row) -> Tuple[str, UUID]:
-        name, guid_raw = row
-        guid = UUID(guid_raw)
-        return name, guid
-
 
 class DatabaseDeckStorage(DeckStorage):
-    def __init__(self, connection: Connection):
+    def __init__(self, connection: Connection, card_pool: CardPool = shared_card_pool):
         self._connection = connection
+        self._card_pool = card_pool
 
     def get(self) -> Deck:
+        cards = self._card_pool.get(self._load_cards)
+        deck = Deck("Default deck", cards)
+        return deck
+
+    def _load_cards(self) -> Iterator[Card]:
         result = self._connection.execute(
             select(card_table.c.question, card_table.c.answer_a, card_table.c.answer_b, card_table.c.answer_c)
+            .order_by(card_table.c.id)
         )
-        cards = [self._convert_row_to_card(row) for row in result]
-        deck = Deck("Default deck", cards)
-        return deck
+        return (self._convert_row_to_card(row) for row in result)
 
     @staticmethod
     def _convert_row_to_card(row: Row) -> Card:
         question, answer_a, answer_b, answer_c = row
         card = Card(question=question, answer_A=answer_a, answer_B=answer_b, answer_C=answer_c)
         return card
-
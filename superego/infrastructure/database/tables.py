@@ -1,16 +1,18 @@
 import uuid
 
-from sqlalchemy import MetaData, Table, Column, Integer, String
+from sqlalchemy import MetaData, Table, Column, Integer, String, Index
+
+from superego.infrastructure.database.types import GUID
 
 meta = MetaData()
 
-guid_function = lambda: str(uuid.uuid4())
+guid_function = uuid.uuid4
 
 deck = Table(
     'deck', meta,
 
     Column('id', Integer, primary_key=True),
-    Column('guid', String(36), default=guid_function, nullable=False, unique=True),
+    Column('guid', GUID, default=guid_function, nullable=False, unique=True),
     Column('name', String(128), nullable=False, unique=True)
 )
 
@@ -18,7 +20,7 @@ card = Table(
     'card', meta,
 
     Column('id', Integer, primary_key=True),
-    Column('guid', String(36), default=guid_function, nullable=False, unique=True),
+    Column('guid', GUID, default=guid_function, nullable=False, unique=True),
     Column('question', String(2048), nullable=False),
     Column('answer_a', String(256), nullable=False),
     Column('answer_b', String(256), nullable=False),
@@ -29,6 +31,8 @@ person = Table(
     'person', meta,
 
     Column('id', Integer, primary_key=True),
-    Column('guid', String(36), default=guid_function, nullable=False),
-    Column('name', String(64), nullable=False)
+    Column('guid', GUID, default=guid_function, nullable=False),
+    Column('name', String(64), nullable=False),
+    Index('ix_person_guid', 'guid', unique=True),
+    Index('ix_person_name', 'name')
 )
\ No newline at end of file
@@ -0,0 +1,25 @@
+from typing import Optional, Union
+from uuid import UUID
+
+from sqlalchemy import Dialect, LargeBinary, TypeDecorator
+
+GUID_SIZE = 16
+
+
+class GUID(TypeDecorator):
+    impl = LargeBinary(GUID_SIZE)
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Union[UUID, str]],
+                           dialect: Dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if not isinstance(value, UUID):
+            value = UUID(value)
+        return value.bytes
+
+    def process_result_value(self, value: Optional[bytes],
+                             dialect: Dialect) -> Optional[UUID]:
+        if value is None:
+            return None
+        return UUID(bytes=value)
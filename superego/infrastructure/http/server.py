@@ -1,42 +1,96 @@
 import json
+from typing import Dict, List
 from uuid import UUID
 
 from aiohttp import web
 
-from superego.application.usecases import AddCardUseCase, AddPersonUseCase, RetrievePersonGUIDUseCase,\
-    RetrieveAllPeopleUseCase, StartNewGameUseCase, StopGameUseCase, RemovePersonUseCase
+from superego.application.usecases import AddCardUseCase, AddCardsUseCase, AddPersonUseCase, RetrievePersonGUIDUseCase,\
+    RetrieveAllPeopleUseCase, CreateLobbyUseCase, StopGameUseCase, RemovePersonUseCase
 from superego.application.interfaces import GameServer
+from superego.game.game import Lobby
 from superego.infrastructure.settings import config
 from superego.infrastructure.database.storage import DataBaseCardStorage, DataBasePersonStorage, DatabaseDeckStorage
-from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.engine import SQLiteConfig, get_pooled_db, DEFAULT_JOURNAL_MODE, \
+    DEFAULT_SYNCHRONOUS, DEFAULT_CACHE_SIZE, DEFAULT_MMAP_SIZE, DEFAULT_BUSY_TIMEOUT, DEFAULT_STATEMENT_CACHE_SIZE
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.executor import StorageExecutor, DEFAULT_STORAGE_READERS, \
+    DEFAULT_STORAGE_MAX_PENDING
+from superego.infrastructure.database.importer import CardImport, CardChunk, ImportFormat, \
+    DEFAULT_IMPORT_CHUNK_SIZE, ImportLineTooLong, detect_format
 from superego.infrastructure.websockets.creator import GameServerCreator
-from superego.infrastructure.websockets.gameserver import WebsocketsServerConfig
+from superego.infrastructure.websockets.gameserver import WebsocketsServerConfig, WebSocketsListener, \
+    DEFAULT_INBOX_SIZE, DEFAULT_BROADCAST_WINDOW, DEFAULT_GAME_OVER_GRACE
+from superego.infrastructure.websockets.broadcast import SlowConsumerPolicy, DEFAULT_SEND_QUEUE_SIZE, \
+    DEFAULT_SLOW_CONSUMER_POLICY, DEFAULT_MAX_SPECTATORS, DEFAULT_SPECTATORS_BATCH_SIZE, DEFAULT_SPECTATOR_BUFFER_LIMIT
+from superego.infrastructure.journal.journal import Journal, JournalConfig
+from superego.infrastructure.journal.recovery import recover_games
 
 
 async def db_context(app):
-    engine = get_db()
-    app['db'] = engine
+    settings = app['config']['sqlite']
+    url = get_connection_string(settings['filename'])
+    sqlite_config = SQLiteConfig(settings.get('journal_mode', DEFAULT_JOURNAL_MODE),
+                                 settings.get('synchronous', DEFAULT_SYNCHRONOUS),
+                                 int(settings.get('cache_size', DEFAULT_CACHE_SIZE)),
+                                 int(settings.get('mmap_size', DEFAULT_MMAP_SIZE)),
+                                 int(settings.get('busy_timeout', DEFAULT_BUSY_TIMEOUT)),
+                                 int(settings.get('statement_cache_size', DEFAULT_STATEMENT_CACHE_SIZE)))
+    readers_count = int(settings.get('readers', DEFAULT_STORAGE_READERS))
+    writer = get_pooled_db(url, sqlite_config, pool_size=1)
+    migrate(writer)
+    readers = get_pooled_db(url, sqlite_config, pool_size=readers_count, read_only=True)
+    storage = StorageExecutor(readers, writer, readers_count,
+                              int(settings.get('max_pending', DEFAULT_STORAGE_MAX_PENDING)))
+    app['storage'] = storage
     yield
+    storage.shutdown()
+    readers.dispose()
+    writer.dispose()
+
+
+class GameServerNotFound(ValueError):
+    def __init__(self, guid: UUID):
+        message = f'No ongoing game with ID: {guid}'
+        super().__init__(message)
 
 
 class GameServerPool:
     def __init__(self):
-        self._instance = None
+        self._instances: Dict[UUID, GameServer] = dict()
 
     def store(self, game_server: GameServer) -> None:
-        self._instance = game_server
+        self._instances[game_server.guid] = game_server
+
+    def get(self, guid: UUID) -> GameServer:
+        if guid not in self._instances:
+            raise GameServerNotFound(guid)
+        return self._instances[guid]
 
-    def get(self) -> GameServer:
-        if not self._instance:
-            raise ValueError()
-        return self._instance
+    def remove(self, guid: UUID) -> None:
+        if guid not in self._instances:
+            raise GameServerNotFound(guid)
+        del self._instances[guid]
+
+    def discard(self, guid: UUID) -> None:
+        self._instances.pop(guid, None)
 
     def flush(self):
-        self._instance = None
+        self._instances = dict()
+
+    def __contains__(self, guid: UUID) -> bool:
+        return guid in self._instances
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    @property
+    def all(self) -> List[GameServer]:
+        return list(self._instances.values())
 
     @property
     def is_ongoing(self) -> bool:
-        return self._instance is not None
+        return len(self._instances) > 0
 
 game_server_pool = GameServerPool()
 
@@ -46,114 +100,210 @@ async def game_server_context(app):
     yield
 
 
+async def websockets_listener_context(app):
+    settings = app['config']['websockets']
+    websockets_config = WebsocketsServerConfig(settings['host'], settings['port'], settings['encoding'],
+                                               int(settings.get('inbox_size', DEFAULT_INBOX_SIZE)),
+                                               float(settings.get('broadcast_window', DEFAULT_BROADCAST_WINDOW)),
+                                               int(settings.get('send_queue_size', DEFAULT_SEND_QUEUE_SIZE)),
+                                               SlowConsumerPolicy(settings.get('slow_consumer_policy',
+                                                                               DEFAULT_SLOW_CONSUMER_POLICY.value)),
+                                               int(settings.get('max_spectators', DEFAULT_MAX_SPECTATORS)),
+                                               int(settings.get('spectators_batch_size', DEFAULT_SPECTATORS_BATCH_SIZE)),
+                                               int(settings.get('spectator_buffer_limit',
+                                                                DEFAULT_SPECTATOR_BUFFER_LIMIT)),
+                                               float(settings.get('game_over_grace', DEFAULT_GAME_OVER_GRACE)))
+    listener = WebSocketsListener(websockets_config)
+    await listener.start()
+    app['websockets_listener'] = listener
+    yield
+    await listener.stop()
+
+
+async def journal_context(app):
+    settings = app['config'].get('journal')
+    if not settings:
+        app['journal'] = None
+        yield
+        return
+    journal_config = JournalConfig(settings['directory'], float(settings['commit_interval']),
+                                   int(settings['snapshot_interval']), int(settings['max_segment_size']))
+    cards = await app['storage'].read(lambda connection: DatabaseDeckStorage(connection).get().cards)
+    recovered_games = recover_games(journal_config.directory, cards)
+    journal = Journal(journal_config)
+    journal.start()
+    game_server_creator = GameServerCreator(app['websockets_listener'], journal, app['game_server_pool'].discard)
+    for guid, snapshot in recovered_games.items():
+        game_server = game_server_creator.restore(guid, snapshot)
+        app['game_server_pool'].store(game_server)
+        game_server.run()
+    journal.sync()
+    journal.discard_previous_segments()
+    app['journal'] = journal
+    yield
+    journal.close()
+
+
 async def add_new_card(request):
-    with request.app['db'].connect() as connection:
-        card_storage = DataBaseCardStorage(connection)
-        add_card = AddCardUseCase(card_storage)
-        data_raw = await request.text()
-        data = json.loads(data_raw)
-        try:
-            question = data['question']
-            answer_a = data['answer_a']
-            answer_b = data['answer_b']
-            answer_c = data['answer_c']
-        except KeyError as e:
-            raise web.HTTPBadRequest(text='Missing data') from e
-        add_card(question=question, answer_A=answer_a, answer_B=answer_b, answer_C=answer_c)
+    data_raw = await request.text()
+    data = json.loads(data_raw)
+    try:
+        question = data['question']
+        answer_a = data['answer_a']
+        answer_b = data['answer_b']
+        answer_c = data['answer_c']
+    except KeyError as e:
+        raise web.HTTPBadRequest(text='Missing data') from e
+
+    def add_card(connection):
+        add_card_ = AddCardUseCase(DataBaseCardStorage(connection))
+        add_card_(question=question, answer_A=answer_a, answer_B=answer_b, answer_C=answer_c)
+
+    await request.app['storage'].write(add_card)
     return web.Response(status=200)
 
 
-async def add_new_person(request):
-    with request.app['db'].connect() as connection:
-        person_storage = DataBasePersonStorage(connection)
-        add_person = AddPersonUseCase(person_storage)
-        data_raw = await request.text()
-        data = json.loads(data_raw)
+async def import_cards(request):
+    if 'format' in request.rel_url.query:
+        try:
+            format_ = ImportFormat(request.rel_url.query['format'])
+        except ValueError as e:
+            raise web.HTTPBadRequest(text='Unknown import format') from e
+    else:
+        format_ = detect_format(request.content_type)
+    chunk_size = int(request.app['config']['sqlite'].get('import_chunk_size', DEFAULT_IMPORT_CHUNK_SIZE))
+    card_import = CardImport(format_, chunk_size)
+
+    async def store(chunk: CardChunk) -> None:
         try:
-            name = data['name']
-        except KeyError as e:
-            raise web.HTTPBadRequest(text='Missing data') from e
-        add_person(name)
+            await request.app['storage'].write(lambda connection: AddCardsUseCase(DataBaseCardStorage(connection))(
+                chunk.cards))
+        except Exception as e:
+            card_import.chunk_failed(chunk, e)
+        else:
+            card_import.chunk_stored(chunk)
+
+    try:
+        async for line in request.content:
+            chunk = card_import.feed(line)
+            if chunk:
+                await store(chunk)
+    except ValueError as e:
+        card_import.reject_line(ImportLineTooLong(str(e)))
+    chunk = card_import.finish()
+    if chunk:
+        await store(chunk)
+    return web.json_response(card_import.report.to_dict())
+
+
+async def add_new_person(request):
+    data_raw = await request.text()
+    data = json.loads(data_raw)
+    try:
+        name = data['name']
+    except KeyError as e:
+        raise web.HTTPBadRequest(text='Missing data') from e
+
+    def add_person(connection):
+        AddPersonUseCase(DataBasePersonStorage(connection))(name)
+
+    await request.app['storage'].write(add_person)
     return web.Response(status=200)
 
 async def remove_person(request):
-    with request.app['db'].connect() as connection:
+    if 'name' not in request.rel_url.query:
+        return web.Response(status=400)
+    name = request.rel_url.query['name']
+
+    def remove_person_(connection) -> bool:
         person_storage = DataBasePersonStorage(connection)
-        retrieve_person_guid = RetrievePersonGUIDUseCase(person_storage)
-        remove_person_ = RemovePersonUseCase(person_storage)
-        if 'name' in request.rel_url.query:
-            guid = retrieve_person_guid(request.rel_url.query['name'])
-            if not guid:
-                return web.Response(status=404)
-            remove_person_(guid)
-        else:
-            return web.Response(status=400)
+        guid = RetrievePersonGUIDUseCase(person_storage)(name)
+        if not guid:
+            return False
+        RemovePersonUseCase(person_storage)(guid)
+        return True
+
+    removed = await request.app['storage'].write(remove_person_)
+    return web.Response(status=200 if removed else 404)
 
 async def get_people(request):
-    with request.app['db'].connect() as connection:
-        person_storage = DataBasePersonStorage(connection)
-        retrieve_person_guid = RetrievePersonGUIDUseCase(person_storage)
-        retrieve_all_people = RetrieveAllPeopleUseCase(person_storage)
-        if 'name' in request.rel_url.query:
-            name = request.rel_url.query['name']
-            guid = retrieve_person_guid(name)
-            if not guid:
-                return web.Response(status=404)
-            return web.json_response({'guid': str(guid)})
-        else:
-            people = retrieve_all_people()
-            content = {name: str(guid) for name, guid in people.items()}
-            return web.json_response(content)
+    if 'name' in request.rel_url.query:
+        name = request.rel_url.query['name']
+        guid = await request.app['storage'].read(
+            lambda connection: RetrievePersonGUIDUseCase(DataBasePersonStorage(connection))(name))
+        if not guid:
+            return web.Response(status=404)
+        return web.json_response({'guid': str(guid)})
+    else:
+        people = await request.app['storage'].read(
+            lambda connection: RetrieveAllPeopleUseCase(DataBasePersonStorage(connection))())
+        content = {name: str(guid) for name, guid in people.items()}
+        return web.json_response(content)
 
 async def start_game(request):
-    with request.app['db'].connect() as connection:
+    data_raw = await request.text()
+    data = json.loads(data_raw)
+    try:
+        player_guids = [UUID(guid) for guid in data['player_guids']]
+    except KeyError as e:
+        raise web.HTTPBadRequest(text='Missing data') from e
+    game_rounds = int(request.app['config']['game']['rounds'])
+
+    def create_lobby(connection) -> Lobby:
         person_storage = DataBasePersonStorage(connection)
         deck_storage = DatabaseDeckStorage(connection)
-        settings = request.app['config']['websockets']
-        websockets_config = WebsocketsServerConfig(settings['host'], settings['port'], settings['encoding'])
-        game_server_creator = GameServerCreator(websockets_config)
-        game_rounds = int(request.app['config']['game']['rounds'])
-        start_game_ = StartNewGameUseCase(person_storage, deck_storage, game_server_creator, game_rounds)
-
-        data_raw = await request.text()
-        data = json.loads(data_raw)
-        try:
-            player_guids = [UUID(guid) for guid in data['player_guids']]
-        except KeyError as e:
-            raise web.HTTPBadRequest(text='Missing data') from e
+        return CreateLobbyUseCase(person_storage, deck_storage, game_rounds)(player_guids)
 
-        game_server = start_game_(player_guids)
-        request.app['game_server_pool'].store(game_server)
-        game_server.run()
-        return web.Response(status=200)
+    lobby = await request.app['storage'].read(create_lobby)
+    game_server_creator = GameServerCreator(request.app['websockets_listener'], request.app['journal'],
+                                            request.app['game_server_pool'].discard)
+    game_server = game_server_creator.create(lobby)
+    request.app['game_server_pool'].store(game_server)
+    game_server.run()
+    content = {'guid': str(game_server.guid), 'address': game_server.address}
+    return web.json_response(content)
 
 async def ongoing_game(request):
     game_server_pool_: GameServerPool = request.app['game_server_pool']
-    if game_server_pool_.is_ongoing:
-        game_server = game_server_pool_.get()
+    if 'guid' in request.rel_url.query:
+        guid = _read_game_guid(request)
+        if guid not in game_server_pool_:
+            return web.Response(status=404)
+        game_server = game_server_pool_.get(guid)
         content = {"address": game_server.address}
         return web.json_response(content)
-    return web.HTTPNotFound()
+    content = {str(game_server.guid): game_server.address
+               for game_server in game_server_pool_.all}
+    return web.json_response(content)
 
 
 async def stop_game(request):
     game_server_pool_: GameServerPool = request.app['game_server_pool']
-    game_server = game_server_pool_.get()
-    if game_server:
-        stop_game_ = StopGameUseCase(game_server)
-        stop_game_()
-        game_server_pool.flush()
-        return web.Response(status=200)
-    else:
+    if 'guid' not in request.rel_url.query:
+        return web.Response(status=400)
+    guid = _read_game_guid(request)
+    if guid not in game_server_pool_:
         return web.Response(status=404)
+    game_server = game_server_pool_.get(guid)
+    stop_game_ = StopGameUseCase(game_server)
+    stop_game_()
+    game_server_pool_.discard(guid)
+    return web.Response(status=200)
+
+def _read_game_guid(request) -> UUID:
+    try:
+        return UUID(request.rel_url.query['guid'])
+    except ValueError as e:
+        raise web.HTTPBadRequest(text='Invalid game ID') from e
 
 async def health(request):
     return web.Response(status=200)
 
 
-def run():
+def create_app(config_=config) -> web.Application:
     app = web.Application()
     app.router.add_post('/cards', add_new_card)
+    app.router.add_post('/cards/import', import_cards)
     app.router.add_get('/people', get_people)
     app.router.add_post('/people', add_new_person)
     app.router.add_delete('/people', remove_person)
@@ -161,10 +311,16 @@ def run():
     app.router.add_delete('/game', stop_game)
     app.router.add_get('/game', ongoing_game)
     app.router.add_get('/health', health)
-    app['config'] = config
+    app['config'] = config_
     app.cleanup_ctx.append(db_context)
     app.cleanup_ctx.append(game_server_context)
+    app.cleanup_ctx.append(websockets_listener_context)
+    app.cleanup_ctx.append(journal_context)
+    return app
 
+
+def run():
+    app = create_app()
     host = config['http']['host']
     port = config['http']['port']
     web.run_app(app, host=host, port=port)
@@ -0,0 +1,248 @@
+import os
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from superego.game.game import ActionName, Answer
+
+SNAPSHOT_RECORD = 0
+ACTION_RECORD = 1
+CLOSED_RECORD = 2
+
+ACTIONS = tuple(ActionName)
+ANSWERS = tuple(Answer)
+
+NO_PARAM = 0xFF
+
+_FRAME = struct.Struct('>II')
+_HEADER = struct.Struct('>B16s')
+_ACTION = struct.Struct('>B16sBB')
+_VERSION = struct.Struct('>I')
+
+SNAPSHOT_VERSION_SIZE = _VERSION.size
+unpack_action = _ACTION.unpack_from
+
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+_ANSWER_CODES = {answer: code for code, answer in enumerate(ANSWERS)}
+
+_SEGMENT_NAME = re.compile(r'^journal-(\d{8})\.log$')
+
+
+class JournalError(RuntimeError):
+    pass
+
+
+class JournalNotStarted(JournalError):
+    def __init__(self, directory: str):
+        message = f'Journal in {directory} has not been started'
+        super().__init__(message)
+
+
+@dataclass(init=True, frozen=True)
+class JournalConfig:
+    directory: str
+    commit_interval: float = 0.005
+    snapshot_interval: int = 100
+    max_segment_size: int = 64 * 1024 * 1024
+
+
+@dataclass(init=True, frozen=True)
+class JournaledAction:
+    action: ActionName
+    player_guid: UUID
+    params: Tuple
+
+
+def encode_snapshot_record(game_guid: UUID, version: int,
+                           snapshot: bytes) -> bytes:
+    return _HEADER.pack(SNAPSHOT_RECORD, game_guid.bytes) \
+        + _VERSION.pack(version) + snapshot
+
+
+def encode_action_record(game_guid: UUID, action: ActionName,
+                         player_guid: UUID, params: Tuple) -> bytes:
+    answer = _ANSWER_CODES[params[0]] if params else NO_PARAM
+    bet = params[1] if len(params) > 1 else NO_PARAM
+    return _HEADER.pack(ACTION_RECORD, game_guid.bytes) + _ACTION.pack(
+        _ACTION_CODES[action], player_guid.bytes, answer, bet)
+
+
+def encode_closed_record(game_guid: UUID) -> bytes:
+    return _HEADER.pack(CLOSED_RECORD, game_guid.bytes)
+
+
+def decode_snapshot_version(data: bytes, offset: int) -> int:
+    return _VERSION.unpack_from(data, offset)[0]
+
+
+def decode_action(data: bytes, offset: int = 0) -> JournaledAction:
+    action, player_guid, answer, bet = _ACTION.unpack_from(data, offset)
+    params = tuple()
+    if answer != NO_PARAM:
+        params += (ANSWERS[answer],)
+    if bet != NO_PARAM:
+        params += (bet,)
+    return JournaledAction(ACTIONS[action], UUID(bytes=player_guid), params)
+
+
+def frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def scan_records(data: bytes) -> Iterator[Tuple[int, bytes, int, int]]:
+    size = len(data)
+    offset = 0
+    while offset + _FRAME.size <= size:
+        length, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        end = start + length
+        if end > size or zlib.crc32(data[start:end]) != checksum:
+            return
+        record_type, game_guid = _HEADER.unpack_from(data, start)
+        yield record_type, game_guid, start + _HEADER.size, end
+        offset = end
+
+
+def list_segments(directory: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return list()
+    names = sorted(name for name in os.listdir(directory)
+                   if _SEGMENT_NAME.match(name))
+    return [os.path.join(directory, name) for name in names]
+
+
+def _segment_number(path: str) -> int:
+    return int(_SEGMENT_NAME.match(os.path.basename(path)).group(1))
+
+
+class Journal:
+    def __init__(self, config: JournalConfig):
+        self._config: JournalConfig = config
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: List[bytes] = list()
+        self._pending_size: int = 0
+        self._segment_size: int = 0
+        self._segment_path: Optional[str] = None
+        self._descriptor: Optional[int] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._running: bool = False
+        self._rotation_requested: bool = False
+        self._retaining_segments: bool = False
+        self._recorders: Set = set()
+        self._stale_recorders: Set = set()
+
+    def start(self) -> None:
+        os.makedirs(self._config.directory, exist_ok=True)
+        segments = list_segments(self._config.directory)
+        number = _segment_number(segments[-1]) + 1 if segments else 1
+        self._open_segment(number)
+        self._running = True
+        self._flusher = threading.Thread(target=self._flush_periodically,
+                                         name='journal-flusher', daemon=True)
+        self._flusher.start()
+
+    def close(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        self._flusher.join()
+        self.sync()
+        os.close(self._descriptor)
+        self._descriptor = None
+
+    def append(self, payload: bytes, snapshot_of=None) -> None:
+        record = frame(payload)
+        with self._lock:
+            self._pending.append(record)
+            self._pending_size += len(record)
+            if snapshot_of is not None:
+                self._stale_recorders.discard(snapshot_of)
+            rotate = not self._rotation_requested and self._segment_size\
+                + self._pending_size > self._config.max_segment_size
+            if rotate:
+                self._rotation_requested = True
+        if rotate:
+            self._wakeup.set()
+
+    def sync(self) -> None:
+        with self._write_lock:
+            self._write_pending()
+
+    def rotate(self) -> None:
+        if self._descriptor is None:
+            raise JournalNotStarted(self._config.directory)
+        with self._write_lock:
+            self._write_pending()
+            os.close(self._descriptor)
+            self._open_segment(_segment_number(self._segment_path) + 1)
+            self._retaining_segments = True
+        with self._lock:
+            self._rotation_requested = False
+            self._stale_recorders.update(self._recorders)
+            stale_recorders = list(self._stale_recorders)
+        for recorder in stale_recorders:
+            recorder.request_snapshot()
+
+    def discard_previous_segments(self) -> None:
+        with self._write_lock:
+            if self._retaining_segments:
+                return
+            for path in list_segments(self._config.directory):
+                if path != self._segment_path:
+                    os.remove(path)
+
+    def register(self, recorder) -> None:
+        with self._lock:
+            self._recorders.add(recorder)
+
+    def unregister(self, recorder) -> None:
+        with self._lock:
+            self._recorders.discard(recorder)
+            self._stale_recorders.discard(recorder)
+
+    @property
+    def config(self) -> JournalConfig:
+        return self._config
+
+    def _open_segment(self, number: int) -> None:
+        self._segment_path = os.path.join(self._config.directory,
+                                          f'journal-{number:08d}.log')
+        self._descriptor = os.open(self._segment_path,
+                                   os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                                   0o644)
+        self._segment_size = os.fstat(self._descriptor).st_size
+
+    def _flush_periodically(self) -> None:
+        while self._running:
+            self._wakeup.wait(self._config.commit_interval)
+            self._wakeup.clear()
+            if self._rotation_requested:
+                self.rotate()
+            self._sync_and_discard()
+
+    def _sync_and_discard(self) -> None:
+        with self._lock:
+            discard = self._retaining_segments and not self._stale_recorders
+        self.sync()
+        if discard:
+            with self._write_lock:
+                self._retaining_segments = False
+            self.discard_previous_segments()
+
+    def _write_pending(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            data = b''.join(self._pending)
+            self._pending = list()
+            self._pending_size = 0
+        os.write(self._descriptor, data)
+        os.fsync(self._descriptor)
+        self._segment_size += len(data)
@@ -0,0 +1,51 @@
+from typing import Optional, Tuple
+from uuid import UUID
+
+from superego.game.game import ActionName, Game, GameRecorder, Player
+from superego.infrastructure.journal.journal import Journal, \
+    encode_action_record, encode_closed_record, encode_snapshot_record
+from superego.infrastructure.journal.snapshots import dump_snapshot
+
+
+class JournalGameRecorder(GameRecorder):
+    def __init__(self, journal: Journal, game_guid: UUID):
+        self._journal: Journal = journal
+        self._game_guid: UUID = game_guid
+        self._snapshot_interval: int = journal.config.snapshot_interval
+        self._game: Optional[Game] = None
+        self._actions_since_snapshot: int = 0
+        self._snapshot_requested: bool = False
+        self._closed: bool = False
+
+    def record_game_started(self, game: Game) -> None:
+        self._game = game
+        self._journal.register(self)
+        self.write_snapshot()
+
+    def record_action(self, action: ActionName, player: Player,
+                      params: Tuple = ()) -> None:
+        self._journal.append(encode_action_record(
+            self._game_guid, action, player.guid, params))
+        self._actions_since_snapshot += 1
+        if self._game.over:
+            self.record_game_closed()
+        elif self._snapshot_requested\
+                or self._actions_since_snapshot >= self._snapshot_interval:
+            self.write_snapshot()
+
+    def record_game_closed(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._journal.append(encode_closed_record(self._game_guid))
+        self._journal.unregister(self)
+
+    def request_snapshot(self) -> None:
+        self._snapshot_requested = True
+
+    def write_snapshot(self) -> None:
+        self._snapshot_requested = False
+        snapshot = dump_snapshot(self._game.snapshot())
+        self._journal.append(encode_snapshot_record(
+            self._game_guid, self._game.version, snapshot), snapshot_of=self)
+        self._actions_since_snapshot = 0
@@ -0,0 +1,24 @@
+import logging
+import pickle
+from typing import Dict, Sequence
+from uuid import UUID
+
+from superego.game.game import Card, GameError, GameSnapshot
+from superego.infrastructure.journal.replay import ReplayEngine, ReplayError
+
+logger = logging.getLogger(__name__)
+
+
+def recover_games(directory: str,
+                  cards: Sequence[Card]) -> Dict[UUID, GameSnapshot]:
+    recovered = dict()
+    with ReplayEngine.from_directory(directory, cards) as engine:
+        for game_guid in engine.unfinished_games:
+            try:
+                game = engine.replay(game_guid)
+            except (ReplayError, GameError, pickle.UnpicklingError) as error:
+                logger.warning('Game %s not recovered: %s', game_guid, error)
+                continue
+            if not game.over:
+                recovered[game_guid] = game.snapshot()
+    return recovered
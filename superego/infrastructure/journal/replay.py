@@ -0,0 +1,219 @@
+import mmap
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple
+from uuid import UUID
+
+from superego.game.game import ActionName, Card, Game, Guess, Player
+from superego.infrastructure.journal.journal import ACTIONS, ANSWERS, \
+    SNAPSHOT_RECORD, ACTION_RECORD, CLOSED_RECORD, SNAPSHOT_VERSION_SIZE, \
+    JournaledAction, decode_action, decode_snapshot_version, list_segments, \
+    scan_records, unpack_action
+from superego.infrastructure.journal.snapshots import load_snapshot
+
+_ANSWER_CODE = ACTIONS.index(ActionName.ANSWER_ACTION)
+_GUESS_CODE = ACTIONS.index(ActionName.GUESS_ACTION)
+_CHANGE_CARD_CODE = ACTIONS.index(ActionName.CHANGE_CARD_ACTION)
+
+
+class ReplayError(RuntimeError):
+    pass
+
+
+class UnknownReplayedGame(ReplayError):
+    def __init__(self, game_guid: UUID):
+        message = f'No journaled game with ID: {game_guid}'
+        super().__init__(message)
+
+
+class ActionIndexUnavailable(ReplayError):
+    def __init__(self, game_guid: UUID, action_index: int,
+                 first_index: int, last_index: int):
+        message = f'Game {game_guid} can be replayed to actions' \
+                  f' {first_index}-{last_index} only, requested {action_index}'
+        super().__init__(message)
+
+
+class UnknownJournaledPlayer(ReplayError):
+    def __init__(self, player_guid: UUID):
+        message = f'Journaled action issued by unknown player: {player_guid}'
+        super().__init__(message)
+
+
+class CorruptJournaledAction(ReplayError):
+    def __init__(self, code: int, answer_code: int):
+        message = f'Journaled action has invalid codes: {code}, {answer_code}'
+        super().__init__(message)
+
+
+@dataclass(init=True)
+class JournaledGame:
+    snapshot_versions: List[int] = field(default_factory=list)
+    snapshots: List[Tuple[mmap.mmap, int, int]] = field(default_factory=list)
+    action_versions: List[int] = field(default_factory=list)
+    actions: List[Tuple[mmap.mmap, int]] = field(default_factory=list)
+    next_version: int = 0
+    closed: bool = False
+
+    @property
+    def first_version(self) -> int:
+        return self.snapshot_versions[0]
+
+    @property
+    def last_version(self) -> int:
+        return self.next_version - 1
+
+
+class ReplayEngine:
+    def __init__(self, paths: Sequence[str], cards: Sequence[Card]):
+        self._cards: Sequence[Card] = cards
+        self._segments: List[mmap.mmap] = list()
+        self._games: Dict[bytes, JournaledGame] = dict()
+        for path in paths:
+            self._index_segment(path)
+
+    @classmethod
+    def from_directory(cls, directory: str,
+                       cards: Sequence[Card]) -> 'ReplayEngine':
+        return cls(list_segments(directory), cards)
+
+    def __enter__(self) -> 'ReplayEngine':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for segment in self._segments:
+            segment.close()
+        self._segments = list()
+        self._games = dict()
+
+    @property
+    def games(self) -> List[UUID]:
+        return [UUID(bytes=guid) for guid in self._games]
+
+    @property
+    def unfinished_games(self) -> List[UUID]:
+        return [UUID(bytes=guid) for guid, journaled_game
+                in self._games.items() if not journaled_game.closed]
+
+    def last_action_index(self, game_guid: UUID) -> int:
+        return self._get(game_guid).last_version
+
+    def replay(self, game_guid: UUID, action_index: int = None) -> Game:
+        journaled_game = self._get(game_guid)
+        if action_index is None:
+            action_index = journaled_game.last_version
+        self._ensure_index_available(game_guid, journaled_game, action_index)
+        game, version = self._restore(journaled_game, action_index)
+        first = bisect_right(journaled_game.action_versions, version)
+        last = bisect_right(journaled_game.action_versions, action_index)
+        _fast_forward(game, journaled_game.actions[first:last])
+        return game
+
+    def steps(self, game_guid: UUID, start: int = None, stop: int = None
+              ) -> Iterator[Tuple[int, JournaledAction, Game]]:
+        journaled_game = self._get(game_guid)
+        start = journaled_game.first_version if start is None else start
+        stop = journaled_game.last_version if stop is None else stop
+        game = self.replay(game_guid, start)
+        first = bisect_right(journaled_game.action_versions, start)
+        last = bisect_right(journaled_game.action_versions, stop)
+        for data, offset in journaled_game.actions[first:last]:
+            action = decode_action(data, offset)
+            apply_action(game, action)
+            yield game.version, action, game
+
+    def _get(self, game_guid: UUID) -> JournaledGame:
+        journaled_game = self._games.get(game_guid.bytes)
+        if journaled_game is None:
+            raise UnknownReplayedGame(game_guid)
+        return journaled_game
+
+    @staticmethod
+    def _ensure_index_available(game_guid: UUID, journaled_game: JournaledGame,
+                                action_index: int) -> None:
+        if not journaled_game.first_version <= action_index \
+                <= journaled_game.last_version:
+            raise ActionIndexUnavailable(game_guid, action_index,
+                                         journaled_game.first_version,
+                                         journaled_game.last_version)
+
+    def _restore(self, journaled_game: JournaledGame,
+                 action_index: int) -> Tuple[Game, int]:
+        position = bisect_right(journaled_game.snapshot_versions,
+                                action_index) - 1
+        data, start, end = journaled_game.snapshots[position]
+        snapshot = load_snapshot(data[start:end], self._cards)
+        return Game.restore(snapshot), \
+            journaled_game.snapshot_versions[position]
+
+    def _index_segment(self, path: str) -> None:
+        with open(path, 'rb') as segment:
+            if not segment.seek(0, 2):
+                return
+            data = mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ)
+        self._segments.append(data)
+        games = self._games
+        for record_type, game_guid, start, end in scan_records(data):
+            if record_type == ACTION_RECORD:
+                journaled_game = games.get(game_guid)
+                if journaled_game is None:
+                    continue
+                journaled_game.action_versions.append(
+                    journaled_game.next_version)
+                journaled_game.actions.append((data, start))
+                journaled_game.next_version += 1
+            elif record_type == SNAPSHOT_RECORD:
+                journaled_game = games.setdefault(game_guid, JournaledGame())
+                version = decode_snapshot_version(data, start)
+                journaled_game.snapshot_versions.append(version)
+                journaled_game.snapshots.append(
+                    (data, start + SNAPSHOT_VERSION_SIZE, end))
+                journaled_game.next_version = version + 1
+            elif record_type == CLOSED_RECORD and game_guid in games:
+                games[game_guid].closed = True
+
+
+def apply_action(game: Game, action: JournaledAction) -> None:
+    player = _find_player(game, action.player_guid)
+    if action.action == ActionName.ANSWER_ACTION:
+        game.answer(player, *action.params)
+    elif action.action == ActionName.GUESS_ACTION:
+        answer, bet = action.params
+        game.guess(player, Guess(answer=answer, bet=bet))
+    elif action.action == ActionName.CHANGE_CARD_ACTION:
+        game.change_card(player)
+    elif action.action == ActionName.MARK_READY_ACTION:
+        game.mark_ready(player)
+
+
+def _find_player(game: Game, player_guid: UUID) -> Player:
+    player = game.find_player(player_guid)
+    if player is None:
+        raise UnknownJournaledPlayer(player_guid)
+    return player
+
+
+def _fast_forward(game: Game, actions: List[Tuple[mmap.mmap, int]]) -> None:
+    players: Dict[bytes, Player] = {player.guid.bytes: player
+                                    for player in game.players}
+    answer, guess = game.answer, game.guess
+    change_card, mark_ready = game.change_card, game.mark_ready
+    for data, offset in actions:
+        code, player_guid, answer_code, bet = unpack_action(data, offset)
+        player = players.get(player_guid)
+        if player is None:
+            raise UnknownJournaledPlayer(UUID(bytes=player_guid))
+        try:
+            if code == _GUESS_CODE:
+                guess(player, Guess(answer=ANSWERS[answer_code], bet=bet))
+            elif code == _ANSWER_CODE:
+                answer(player, ANSWERS[answer_code])
+            elif code == _CHANGE_CARD_CODE:
+                change_card(player)
+            else:
+                mark_ready(player)
+        except IndexError as error:
+            raise CorruptJournaledAction(code, answer_code) from error
@@ -0,0 +1,78 @@
+import hashlib
+import io
+import pickle
+from typing import Any, Optional, Sequence, Tuple
+
+from superego.game.game import Card, GameSnapshot
+
+DECK_CARDS_ID = 'deck-cards'
+
+_last_digest: Tuple[Optional[Sequence[Card]], int, bytes] = (None, 0, b'')
+
+
+class InvalidSnapshotReference(pickle.UnpicklingError):
+    def __init__(self, reference: Any):
+        message = f'Unknown persistent reference in game snapshot: {reference}'
+        super().__init__(message)
+
+
+class SnapshotDeckMismatch(pickle.UnpicklingError):
+    def __init__(self, count: int, available: int):
+        message = f'Snapshot deck of {count} cards does not match' \
+                  f' the first cards of {available} stored cards'
+        super().__init__(message)
+
+
+def cards_digest(cards: Sequence[Card], count: int) -> bytes:
+    global _last_digest
+    cached_cards, cached_count, digest = _last_digest
+    if cached_cards is not cards or cached_count != count:
+        hashed = hashlib.blake2b(digest_size=16)
+        for card in cards[:count]:
+            for text in (card.question, card.answer_A, card.answer_B,
+                         card.answer_C):
+                hashed.update(text.encode('utf-8'))
+                hashed.update(b'\x00')
+        digest = hashed.digest()
+        _last_digest = (cards, count, digest)
+    return digest
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, cards: Sequence[Card]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._cards = cards
+
+    def persistent_id(self, obj: Any) -> Optional[Tuple[str, int, bytes]]:
+        if obj is self._cards:
+            return DECK_CARDS_ID, len(obj), cards_digest(obj, len(obj))
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, cards: Sequence[Card]):
+        super().__init__(file)
+        self._cards = cards
+
+    def persistent_load(self, pid: Any) -> Any:
+        if isinstance(pid, tuple) and len(pid) == 3 \
+                and pid[0] == DECK_CARDS_ID:
+            _, count, digest = pid
+            return self._match_cards(count, digest)
+        raise InvalidSnapshotReference(pid)
+
+    def _match_cards(self, count: int, digest: bytes) -> Sequence[Card]:
+        cards = self._cards
+        if count > len(cards) or cards_digest(cards, count) != digest:
+            raise SnapshotDeckMismatch(count, len(cards))
+        return cards if count == len(cards) else cards[:count]
+
+
+def dump_snapshot(snapshot: GameSnapshot) -> bytes:
+    file = io.BytesIO()
+    _SnapshotPickler(file, snapshot.game_table.deck.cards).dump(snapshot)
+    return file.getvalue()
+
+
+def load_snapshot(data: bytes, cards: Sequence[Card]) -> GameSnapshot:
+    return _SnapshotUnpickler(io.BytesIO(data), cards).load()
@@ -0,0 +1,337 @@
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+from uuid import UUID
+
+from superego.game.game import Card, GamePhaseName, GameState, PlayerState
+from superego.infrastructure.time import TimeProvider
+from superego.infrastructure.websockets.delta import GameStateDelta, \
+    GAME_STATE_FIELDS, PLAYER_STATE_FIELDS
+from superego.infrastructure.websockets.events import Event, EventAction
+from superego.infrastructure.websockets.feedback import Status
+
+
+class BinaryProtocolError(RuntimeError):
+    pass
+
+
+class UnknownCode(BinaryProtocolError):
+    def __init__(self, kind: str, code: int):
+        message = f'Unknown {kind} code: {code}'
+        super().__init__(message)
+
+
+class TruncatedFrame(BinaryProtocolError):
+    def __init__(self, size: int):
+        message = f'Frame ends unexpectedly after {size} bytes'
+        super().__init__(message)
+
+
+class TextFrameReceived(BinaryProtocolError):
+    def __init__(self):
+        super().__init__('Expected a binary frame, received text')
+
+
+STATUSES = (Status.ACKNOWLEDGED, Status.ERROR, Status.GAME_STATE,
+            Status.GAME_STATE_DELTA)
+PHASES = (GamePhaseName.ANSWER_PHASE, GamePhaseName.GUESS_PHASE,
+          GamePhaseName.RESULT_PHASE, GamePhaseName.GAME_OVER_PHASE)
+ACTIONS = (EventAction.ANSWER, EventAction.GUESS, EventAction.CHANGE_CARD,
+           EventAction.SUBSCRIBE, EventAction.READ, EventAction.READY,
+           EventAction.SPECTATE)
+ANSWERS = ('A', 'B', 'C')
+
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+_ANSWER_CODES = {answer: code for code, answer in enumerate(ANSWERS)}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_U8 = struct.Struct('>B')
+_U16 = struct.Struct('>H')
+_I32 = struct.Struct('>i')
+_I64 = struct.Struct('>q')
+_EVENT_HEADER = struct.Struct('>B16s')
+_NO_ISSUER = bytes(16)
+_STATE_HEADER = struct.Struct('>BIqBiHB')
+_PLAYER = struct.Struct('>B16siiB')
+_DELTA_HEADER = struct.Struct('>BIIB')
+_PLAYER_CHANGE_HEADER = struct.Struct('>BB')
+
+_AWAITED_TO_ANSWER = 1
+_AWAITED_TO_GUESS = 2
+_READY = 4
+
+_FLAGS = (b'\x00', b'\x01')
+
+CONFIRMATION_FRAME = _U8.pack(_STATUS_CODES[Status.ACKNOWLEDGED])
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def unpack(self, struct_: struct.Struct) -> Tuple:
+        try:
+            values = struct_.unpack_from(self._data, self._offset)
+        except struct.error as error:
+            raise TruncatedFrame(len(self._data)) from error
+        self._offset += struct_.size
+        return values
+
+    def read(self, struct_: struct.Struct) -> Any:
+        return self.unpack(struct_)[0]
+
+    def read_text(self) -> str:
+        length = self.read(_U16)
+        if self._offset + length > len(self._data):
+            raise TruncatedFrame(len(self._data))
+        text = str(self._data[self._offset:self._offset + length], 'utf-8')
+        self._offset += length
+        return text
+
+
+def encode_game_state(game_state: GameState) -> bytes:
+    parts = [
+        _STATE_HEADER.pack(
+            _STATUS_CODES[Status.GAME_STATE],
+            game_state.version,
+            _encode_datetime(game_state.time),
+            _PHASE_CODES[game_state.phase],
+            game_state.points_in_bank,
+            game_state.round_number,
+            game_state.card_changed
+        ),
+        _encode_card(game_state.current_card),
+        _U8.pack(len(game_state.player_states))
+    ]
+    parts.extend(_encode_player_state(player_state)
+                 for player_state in game_state.player_states)
+    return b''.join(parts)
+
+
+def decode_game_state(data: bytes) -> GameState:
+    reader = _Reader(data)
+    _, version, time, phase, points_in_bank, round_number, card_changed =\
+        reader.unpack(_STATE_HEADER)
+    current_card = _decode_card(reader)
+    players_count = reader.read(_U8)
+    player_states = [_decode_player_state(reader)
+                     for _ in range(players_count)]
+    return GameState(
+        version=version,
+        time=_decode_datetime(time),
+        phase=_decode(PHASES, phase, 'phase'),
+        player_states=player_states,
+        points_in_bank=points_in_bank,
+        round_number=round_number,
+        current_card=current_card,
+        card_changed=bool(card_changed)
+    )
+
+
+def encode_game_state_delta(delta: GameStateDelta) -> bytes:
+    changes_mask, changes = _encode_fields(delta.changes, GAME_STATE_FIELDS,
+                                           _GAME_FIELD_ENCODERS)
+    parts = [
+        _DELTA_HEADER.pack(
+            _STATUS_CODES[Status.GAME_STATE_DELTA],
+            delta.version,
+            delta.base_version,
+            changes_mask
+        ),
+        changes,
+        _U8.pack(len(delta.player_changes))
+    ]
+    for seat, fields in delta.player_changes.items():
+        mask, encoded_fields = _encode_fields(fields, PLAYER_STATE_FIELDS,
+                                              _PLAYER_FIELD_ENCODERS)
+        parts.append(_PLAYER_CHANGE_HEADER.pack(seat, mask))
+        parts.append(encoded_fields)
+    parts.append(_encode_seats(delta.removed_seats))
+    if delta.seat_order is None:
+        parts.append(_U8.pack(0))
+    else:
+        parts.append(_U8.pack(1))
+        parts.append(_encode_seats(delta.seat_order))
+    return b''.join(parts)
+
+
+def decode_game_state_delta(data: bytes) -> GameStateDelta:
+    reader = _Reader(data)
+    _, version, base_version, changes_mask = reader.unpack(_DELTA_HEADER)
+    changes = _decode_fields(reader, changes_mask, GAME_STATE_FIELDS,
+                             _GAME_FIELD_DECODERS)
+    player_changes = dict()
+    for _ in range(reader.read(_U8)):
+        seat, mask = reader.unpack(_PLAYER_CHANGE_HEADER)
+        player_changes[seat] = _decode_fields(reader, mask, PLAYER_STATE_FIELDS,
+                                              _PLAYER_FIELD_DECODERS)
+    removed_seats = _decode_seats(reader)
+    seat_order = _decode_seats(reader) if reader.read(_U8) else None
+    return GameStateDelta(
+        version=version,
+        base_version=base_version,
+        changes=changes,
+        player_changes=player_changes,
+        removed_seats=removed_seats,
+        seat_order=seat_order
+    )
+
+
+def decode_status(data: bytes) -> Status:
+    if not data:
+        raise TruncatedFrame(0)
+    return _decode(STATUSES, data[0], 'status')
+
+
+def encode_event(event: Event) -> bytes:
+    issuer = _NO_ISSUER if event.issuer is None else event.issuer.bytes
+    header = _EVENT_HEADER.pack(_ACTION_CODES[event.action], issuer)
+    if event.action == EventAction.ANSWER:
+        answer, = event.params
+        return header + _U8.pack(_ANSWER_CODES[answer])
+    if event.action == EventAction.GUESS:
+        answer, bet = event.params
+        return header + _U8.pack(_ANSWER_CODES[answer]) + _U8.pack(bet)
+    return header
+
+
+def decode_event(data: bytes, time_provider: TimeProvider) -> Event:
+    if isinstance(data, str):
+        raise TextFrameReceived
+    reader = _Reader(data)
+    action_code, issuer = reader.unpack(_EVENT_HEADER)
+    action = _decode(ACTIONS, action_code, 'action')
+    params = list()
+    if action in (EventAction.ANSWER, EventAction.GUESS):
+        params.append(_decode(ANSWERS, reader.read(_U8), 'answer'))
+    if action == EventAction.GUESS:
+        params.append(reader.read(_U8))
+    return Event(
+        time_received=time_provider.now(),
+        action=action,
+        issuer=None if issuer == _NO_ISSUER else UUID(bytes=bytes(issuer)),
+        params=params
+    )
+
+
+def _decode(values: Tuple, code: int, kind: str) -> Any:
+    if code >= len(values):
+        raise UnknownCode(kind, code)
+    return values[code]
+
+
+def _encode_datetime(datetime_: datetime) -> int:
+    return (datetime_ - _EPOCH) // _MICROSECOND
+
+
+def _decode_datetime(microseconds: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=microseconds)
+
+
+def _encode_text(text: str) -> bytes:
+    data = text.encode('utf-8')
+    return _U16.pack(len(data)) + data
+
+
+def _encode_card(card: Card) -> bytes:
+    return b''.join((_encode_text(card.question), _encode_text(card.answer_A),
+                     _encode_text(card.answer_B), _encode_text(card.answer_C)))
+
+
+def _decode_card(reader: _Reader) -> Card:
+    return Card(question=reader.read_text(), answer_A=reader.read_text(),
+                answer_B=reader.read_text(), answer_C=reader.read_text())
+
+
+def _encode_player_state(player_state: PlayerState) -> bytes:
+    flags = (player_state.awaited_to_answer and _AWAITED_TO_ANSWER) \
+        | (player_state.awaited_to_guess and _AWAITED_TO_GUESS) \
+        | (player_state.ready and _READY)
+    return _PLAYER.pack(player_state.seat, player_state.guid.bytes,
+                        player_state.points, player_state.points_change,
+                        flags) + _encode_text(player_state.name)
+
+
+def _decode_player_state(reader: _Reader) -> PlayerState:
+    seat, guid, points, points_change, flags = reader.unpack(_PLAYER)
+    return PlayerState(
+        guid=UUID(bytes=bytes(guid)),
+        seat=seat,
+        name=reader.read_text(),
+        points=points,
+        points_change=points_change,
+        awaited_to_answer=bool(flags & _AWAITED_TO_ANSWER),
+        awaited_to_guess=bool(flags & _AWAITED_TO_GUESS),
+        ready=bool(flags & _READY)
+    )
+
+
+def _encode_seats(seats: List[int]) -> bytes:
+    return _U8.pack(len(seats)) + bytes(seats)
+
+
+def _decode_seats(reader: _Reader) -> List[int]:
+    return [reader.read(_U8) for _ in range(reader.read(_U8))]
+
+
+def _encode_fields(fields: Dict[str, Any], names: Tuple[str, ...],
+                   encoders: Dict[str, Callable[[Any], bytes]]
+                   ) -> Tuple[int, bytes]:
+    mask = 0
+    parts = list()
+    for bit, name in enumerate(names):
+        if name in fields:
+            mask |= 1 << bit
+            parts.append(encoders[name](fields[name]))
+    return mask, b''.join(parts)
+
+
+def _decode_fields(reader: _Reader, mask: int, names: Tuple[str, ...],
+                   decoders: Dict[str, Callable[[_Reader], Any]]) -> Dict[str, Any]:
+    return {name: decoders[name](reader)
+            for bit, name in enumerate(names) if mask & (1 << bit)}
+
+
+def _encode_flag(value: bool) -> bytes:
+    return _FLAGS[value]
+
+
+def _decode_flag(reader: _Reader) -> bool:
+    return bool(reader.read(_U8))
+
+
+_GAME_FIELD_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    'time': lambda time: _I64.pack(_encode_datetime(time)),
+    'phase': lambda phase: _U8.pack(_PHASE_CODES[phase]),
+    'points_in_bank': _I32.pack,
+    'round_number': _U16.pack,
+    'current_card': _encode_card,
+    'card_changed': _encode_flag,
+}
+_GAME_FIELD_DECODERS: Dict[str, Callable[[_Reader], Any]] = {
+    'time': lambda reader: _decode_datetime(reader.read(_I64)),
+    'phase': lambda reader: _decode(PHASES, reader.read(_U8), 'phase'),
+    'points_in_bank': lambda reader: reader.read(_I32),
+    'round_number': lambda reader: reader.read(_U16),
+    'current_card': _decode_card,
+    'card_changed': _decode_flag,
+}
+_PLAYER_FIELD_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    'points': _I32.pack,
+    'points_change': _I32.pack,
+    'awaited_to_answer': _encode_flag,
+    'awaited_to_guess': _encode_flag,
+    'ready': _encode_flag,
+}
+_PLAYER_FIELD_DECODERS: Dict[str, Callable[[_Reader], Any]] = {
+    'points': lambda reader: reader.read(_I32),
+    'points_change': lambda reader: reader.read(_I32),
+    'awaited_to_answer': _decode_flag,
+    'awaited_to_guess': _decode_flag,
+    'ready': _decode_flag,
+}
@@ -1,27 +1,300 @@
 import asyncio
 from abc import ABCMeta, abstractmethod
-from typing import List
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
 import websockets
 from websockets import WebSocketServerProtocol
+from websockets.exceptions import ConnectionClosed
+
+from superego.infrastructure.websockets.protocol import Codec, Frame, \
+    get_codec
+
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class SlowConsumerPolicy(Enum):
+    DROP = 'drop'
+    DISCONNECT = 'disconnect'
+
+
+DEFAULT_SEND_QUEUE_SIZE = 32
+DEFAULT_SLOW_CONSUMER_POLICY = SlowConsumerPolicy.DROP
+DEFAULT_MAX_SPECTATORS = 10000
+DEFAULT_SPECTATORS_BATCH_SIZE = 256
+DEFAULT_SPECTATOR_BUFFER_LIMIT = 65536
+
+Encoder = Callable[[Codec], Frame]
+
+
+class BroadcastError(RuntimeError):
+    pass
+
+
+class SpectatorsLimitReached(BroadcastError):
+    def __init__(self, limit: int):
+        message = f'Game already has maximum number of spectators: {limit}'
+        super().__init__(message)
 
 
 class Broadcast(metaclass=ABCMeta):
     @abstractmethod
-    async def add_listener(self, websocket: WebSocketServerProtocol) -> None:
+    async def add_listener(self, websocket: WebSocketServerProtocol,
+                           snapshot: Frame,
+                           confirmation: Optional[Frame] = None) -> None:
         raise NotImplemented
 
     @abstractmethod
-    def broadcast(self, message: str) -> None:
+    def remove_listener(self, websocket: WebSocketServerProtocol) -> None:
         raise NotImplemented
 
+    @abstractmethod
+    def broadcast(self, encode: Encoder, snapshot: Encoder) -> None:
+        raise NotImplemented
+
+
+class Subscription:
+    __slots__ = ('_websocket', '_codec', '_queue_size', '_pending',
+                 '_wakeup', '_dropped', '_sender', '_closing')
+
+    def __init__(self, websocket: WebSocketServerProtocol, queue_size: int):
+        self._websocket: WebSocketServerProtocol = websocket
+        self._codec: Codec = get_codec(websocket)
+        self._queue_size: int = queue_size
+        self._pending: Deque[Frame] = deque()
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._dropped: int = 0
+        self._sender: asyncio.Task = asyncio.ensure_future(self._send())
+        self._closing: asyncio.Future = asyncio.ensure_future(
+            websocket.wait_closed())
+
+    def push(self, frame: Frame) -> bool:
+        if len(self._pending) >= self._queue_size:
+            return False
+        self._pending.append(frame)
+        self._wakeup.set()
+        return True
+
+    def supersede(self, snapshot: Frame,
+                  confirmation: Optional[Frame] = None) -> int:
+        dropped = len(self._pending)
+        self._dropped += dropped
+        self._pending.clear()
+        if confirmation is not None:
+            self._pending.append(confirmation)
+        self._pending.append(snapshot)
+        self._wakeup.set()
+        return dropped
+
+    def cancel(self) -> int:
+        self._sender.cancel()
+        self._closing.cancel()
+        dropped = len(self._pending)
+        self._dropped += dropped
+        self._pending.clear()
+        return dropped
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        self._sender.add_done_callback(lambda _: callback())
+        self._closing.add_done_callback(lambda _: callback())
+
+    @property
+    def codec(self) -> Codec:
+        return self._codec
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    async def _send(self) -> None:
+        pending, websocket = self._pending, self._websocket
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while pending:
+                    await websocket.send(pending.popleft())
+        except ConnectionClosed:
+            pass
+
 
 class WebSocketsBroadcast(Broadcast):
-    def __init__(self):
-        self._listeners: List[WebSocketServerProtocol] = list()
+    def __init__(
+            self,
+            send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE,
+            slow_consumer_policy: SlowConsumerPolicy =
+            DEFAULT_SLOW_CONSUMER_POLICY
+    ):
+        self._send_queue_size: int = send_queue_size
+        self._policy: SlowConsumerPolicy = slow_consumer_policy
+        self._subscriptions: Dict[WebSocketServerProtocol, Subscription] = \
+            dict()
+        self._dropped_frames: int = 0
+        self._disconnected: int = 0
+
+    async def add_listener(self, websocket: WebSocketServerProtocol,
+                           snapshot: Frame,
+                           confirmation: Optional[Frame] = None) -> None:
+        subscription = self._subscriptions.get(websocket)
+        if subscription is None:
+            subscription = Subscription(websocket, self._send_queue_size)
+            self._subscriptions[websocket] = subscription
+            subscription.on_close(
+                lambda: self._discard(websocket, subscription))
+        self._dropped_frames += subscription.supersede(snapshot, confirmation)
+
+    def remove_listener(self, websocket: WebSocketServerProtocol) -> None:
+        subscription = self._subscriptions.pop(websocket, None)
+        if subscription is not None:
+            self._dropped_frames += subscription.cancel()
+
+    def broadcast(self, encode: Encoder, snapshot: Encoder) -> None:
+        frames: Dict[Codec, Frame] = dict()
+        snapshots: Dict[Codec, Frame] = dict()
+        for websocket, subscription in list(self._subscriptions.items()):
+            codec = subscription.codec
+            frame = frames.get(codec)
+            if frame is None:
+                frame = frames[codec] = encode(codec)
+            if subscription.push(frame):
+                continue
+            if self._policy == SlowConsumerPolicy.DISCONNECT:
+                self._disconnect(websocket)
+                continue
+            state = snapshots.get(codec)
+            if state is None:
+                state = snapshots[codec] = snapshot(codec)
+            self._dropped_frames += subscription.supersede(state)
+
+    @property
+    def listeners_count(self) -> int:
+        return len(self._subscriptions)
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    @property
+    def disconnected_count(self) -> int:
+        return self._disconnected
+
+    def _disconnect(self, websocket: WebSocketServerProtocol) -> None:
+        self.remove_listener(websocket)
+        self._disconnected += 1
+        asyncio.ensure_future(websocket.close(
+            code=SLOW_CONSUMER_CLOSE_CODE, reason='Consumer too slow'))
+
+    def _discard(self, websocket: WebSocketServerProtocol,
+                 subscription: Subscription) -> None:
+        if self._subscriptions.get(websocket) is subscription:
+            self.remove_listener(websocket)
+
+
+class SpectatorBroadcast(Broadcast):
+    def __init__(
+            self,
+            max_spectators: int = DEFAULT_MAX_SPECTATORS,
+            batch_size: int = DEFAULT_SPECTATORS_BATCH_SIZE,
+            buffer_limit: int = DEFAULT_SPECTATOR_BUFFER_LIMIT
+    ):
+        self._max_spectators: int = max_spectators
+        self._batch_size: int = batch_size
+        self._buffer_limit: int = buffer_limit
+        self._spectators: Dict[WebSocketServerProtocol, Codec] = dict()
+        self._closing: Dict[WebSocketServerProtocol, asyncio.Future] = dict()
+        self._stale: Set[WebSocketServerProtocol] = set()
+        self._backlog: Deque[Tuple[Encoder, Encoder]] = deque()
+        self._fan_out: Optional[asyncio.Task] = None
+        self._dropped_frames: int = 0
+
+    async def add_listener(self, websocket: WebSocketServerProtocol,
+                           snapshot: Frame,
+                           confirmation: Optional[Frame] = None) -> None:
+        if websocket not in self._spectators \
+                and len(self._spectators) >= self._max_spectators:
+            raise SpectatorsLimitReached(self._max_spectators)
+        if websocket not in self._closing:
+            closing = asyncio.ensure_future(websocket.wait_closed())
+            closing.add_done_callback(
+                lambda _: self.remove_listener(websocket))
+            self._closing[websocket] = closing
+        self._spectators[websocket] = get_codec(websocket)
+        self._stale.discard(websocket)
+        if confirmation is not None:
+            websockets.broadcast((websocket,), confirmation)
+        websockets.broadcast((websocket,), snapshot)
+
+    def remove_listener(self, websocket: WebSocketServerProtocol) -> None:
+        self._spectators.pop(websocket, None)
+        self._stale.discard(websocket)
+        closing = self._closing.pop(websocket, None)
+        if closing is not None:
+            closing.cancel()
+
+    def broadcast(self, encode: Encoder, snapshot: Encoder) -> None:
+        if not self._spectators:
+            return
+        self._backlog.append((encode, snapshot))
+        if self._fan_out is None or self._fan_out.done():
+            self._fan_out = asyncio.ensure_future(self._send_backlog())
+
+    @property
+    def listeners_count(self) -> int:
+        return len(self._spectators)
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames
+
+    async def _send_backlog(self) -> None:
+        backlog = self._backlog
+        while backlog:
+            encode, snapshot = backlog.pop()
+            if backlog:
+                self._dropped_frames += len(backlog) * len(self._spectators)
+                backlog.clear()
+                encode = snapshot
+            await self._send(_EncodedFrames(encode), _EncodedFrames(snapshot))
+
+    async def _send(self, frames: '_EncodedFrames',
+                    snapshots: '_EncodedFrames') -> None:
+        spectators = list(self._spectators.items())
+        for start in range(0, len(spectators), self._batch_size):
+            current: Dict[Codec, List[WebSocketServerProtocol]] = dict()
+            resynced: Dict[Codec, List[WebSocketServerProtocol]] = dict()
+            for websocket, codec in spectators[start:start + self._batch_size]:
+                if websocket.closed:
+                    self.remove_listener(websocket)
+                elif websocket.transport.get_write_buffer_size() \
+                        > self._buffer_limit:
+                    self._stale.add(websocket)
+                    self._dropped_frames += 1
+                elif websocket in self._stale:
+                    self._stale.discard(websocket)
+                    resynced.setdefault(codec, list()).append(websocket)
+                else:
+                    current.setdefault(codec, list()).append(websocket)
+            for codec, batch in current.items():
+                websockets.broadcast(batch, frames.get(codec))
+            for codec, batch in resynced.items():
+                websockets.broadcast(batch, snapshots.get(codec))
+            await asyncio.sleep(0)
+
+
+class _EncodedFrames:
+    __slots__ = ('_encode', '_frames')
 
-    async def add_listener(self, websocket: WebSocketServerProtocol) -> None:
-        self._listeners.append(websocket)
+    def __init__(self, encode: Encoder):
+        self._encode: Encoder = encode
+        self._frames: Dict[Codec, Frame] = dict()
 
-    def broadcast(self, message: str) -> None:
-        websockets.broadcast(self._listeners, message)
+    def get(self, codec: Codec) -> Frame:
+        frame = self._frames.get(codec)
+        if frame is None:
+            frame = self._frames[codec] = self._encode(codec)
+        return frame
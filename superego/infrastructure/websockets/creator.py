@@ -1,21 +1,30 @@
+from typing import Callable, Optional
+from uuid import UUID
+
 from superego.infrastructure.websockets.events import \
     EventAction
 from superego.infrastructure.websockets.handlers import AnswerEventHandler, \
     GuessEventHandler, ChangeCardEventHandler, \
     SubscribeGameBroadcastEventHandler, ReadGameStateEventHandler, \
-    ReadyEventHandler
+    ReadyEventHandler, SpectateGameBroadcastEventHandler
 from superego.infrastructure.websockets.gameserver import\
-    WebsocketsServerConfig, \
+    WebSocketsListener, \
     WebSocketsGameObserver,\
     WebSocketsEventRouter,\
     WebSocketsConnectionHandler,\
-    WebSocketsServer
+    WebSocketsServer,\
+    GameActor
 from superego.application.interfaces import GameServer
-from superego.infrastructure.websockets.broadcast import WebSocketsBroadcast
+from superego.infrastructure.websockets.broadcast import \
+    WebSocketsBroadcast, SpectatorBroadcast
+from superego.infrastructure.websockets.frames import GameStateFrameCache
 from superego.infrastructure.time import\
     SimpleLocalTimeProvider,\
     TimeProviderClock
-from superego.game.game import Lobby, Game
+from superego.game.game import Lobby, Game, GameObserver, GameRecorder, \
+    GameSnapshot, Clock, NullGameRecorder
+from superego.infrastructure.journal.journal import Journal
+from superego.infrastructure.journal.recorder import JournalGameRecorder
 from superego.application.usecases import\
     GuessUseCase,\
     AnswerUseCase,\
@@ -24,16 +33,27 @@ from superego.application.usecases import\
     ReadyUseCase
 
 
+GameFactory = Callable[[Clock, Optional[GameObserver]], Game]
+
+
 def assemble_websockets_server(
-        server_config: WebsocketsServerConfig,
-        lobby: Lobby
+        listener: WebSocketsListener,
+        guid: UUID,
+        create_game: GameFactory,
+        recorder: GameRecorder,
+        on_stopped: Callable[[UUID], None] = None
 ) -> GameServer:
-    broadcast = WebSocketsBroadcast()
-    game_observer = WebSocketsGameObserver(broadcast)
+    broadcast = WebSocketsBroadcast(listener.send_queue_size,
+                                    listener.slow_consumer_policy)
+    spectators = SpectatorBroadcast(listener.max_spectators,
+                                    listener.spectators_batch_size,
+                                    listener.spectator_buffer_limit)
+    frames = GameStateFrameCache()
+    game_observer = WebSocketsGameObserver(broadcast, frames, spectators)
 
     time_provider = SimpleLocalTimeProvider()
     game_clock = TimeProviderClock(time_provider)
-    game = Game(lobby, game_clock, game_observer)
+    game = create_game(game_clock, None)
 
     guess = GuessUseCase(game)
     answer = AnswerUseCase(game)
@@ -44,73 +64,62 @@ def assemble_websockets_server(
     answer_event_handler = AnswerEventHandler(answer)
     guess_event_handler = GuessEventHandler(guess)
     change_card_event_handler = ChangeCardEventHandler(change_card)
-    subscribe_game_event_handler = SubscribeGameBroadcastEventHandler(broadcast)
-    read_game_state_event_handler = ReadGameStateEventHandler(get_game_state)
+    subscribe_game_event_handler = SubscribeGameBroadcastEventHandler(broadcast, get_game_state, frames)
+    spectate_game_event_handler = SpectateGameBroadcastEventHandler(spectators, get_game_state, frames)
+    read_game_state_event_handler = ReadGameStateEventHandler(get_game_state, frames)
     ready_event_handler = ReadyEventHandler(ready)
     event_router = WebSocketsEventRouter()\
         .register_handler(EventAction.ANSWER, answer_event_handler)\
         .register_handler(EventAction.GUESS, guess_event_handler)\
         .register_handler(EventAction.CHANGE_CARD, change_card_event_handler)\
         .register_handler(EventAction.SUBSCRIBE, subscribe_game_event_handler)\
+        .register_handler(EventAction.SPECTATE, spectate_game_event_handler)\
         .register_handler(EventAction.READ, read_game_state_event_handler)\
         .register_handler(EventAction.READY, ready_event_handler)
+    actor = GameActor(game, event_router, game_observer,
+                      listener.inbox_size, listener.broadcast_window,
+                      listener.game_over_grace)
 
     connection_handler = WebSocketsConnectionHandler(
-            server_config.encoding,
+            listener.encoding,
             time_provider,
-            event_router,
+            actor,
             broadcast
         )
 
-    server = WebSocketsServer(server_config, connection_handler)
+    server = WebSocketsServer(guid, listener, connection_handler, recorder,
+                              actor, on_stopped)
 
     return server
 
 class GameServerCreator:
-    def __init__(self, config: WebsocketsServerConfig):
-        self._config = config
+    def __init__(self, listener: WebSocketsListener, journal: Journal = None,
+                 on_stopped: Callable[[UUID], None] = None):
+        self._listener = listener
+        self._journal = journal
+        self._on_stopped = on_stopped
 
     def create(self, lobby: Lobby) -> GameServer:
-        broadcast = WebSocketsBroadcast()
-        game_observer = WebSocketsGameObserver(broadcast)
-
-        time_provider = SimpleLocalTimeProvider()
-        game_clock = TimeProviderClock(time_provider)
-        game = Game(lobby, game_clock, game_observer)
-
-        guess = GuessUseCase(game)
-        answer = AnswerUseCase(game)
-        change_card = ChangeCardUseCase(game)
-        get_game_state = GetGameStateUseCase(game)
-        ready = ReadyUseCase(game)
-
-        answer_event_handler = AnswerEventHandler(answer)
-        guess_event_handler = GuessEventHandler(guess)
-        change_card_event_handler = ChangeCardEventHandler(change_card)
-        subscribe_game_event_handler = SubscribeGameBroadcastEventHandler(broadcast)
-        read_game_state_event_handler = ReadGameStateEventHandler(get_game_state)
-        ready_event_handler = ReadyEventHandler(ready)
-        event_router = WebSocketsEventRouter() \
-            .register_handler(EventAction.ANSWER, answer_event_handler) \
-            .register_handler(EventAction.GUESS, guess_event_handler) \
-            .register_handler(EventAction.CHANGE_CARD, change_card_event_handler) \
-            .register_handler(EventAction.SUBSCRIBE, subscribe_game_event_handler) \
-            .register_handler(EventAction.READ, read_game_state_event_handler) \
-            .register_handler(EventAction.READY, ready_event_handler)
-
-        connection_handler = WebSocketsConnectionHandler(
-            self._config.encoding,
-            time_provider,
-            event_router,
-            broadcast
+        recorder = self._create_recorder(lobby.guid)
+        return assemble_websockets_server(
+            self._listener,
+            lobby.guid,
+            lambda clock, observer: Game(lobby, clock, observer, recorder),
+            recorder,
+            self._on_stopped
         )
 
-        server = WebSocketsServer(self._config, connection_handler)
-
-        return server
-
-
-
-
-
+    def restore(self, guid: UUID, snapshot: GameSnapshot) -> GameServer:
+        recorder = self._create_recorder(guid)
+        return assemble_websockets_server(
+            self._listener,
+            guid,
+            lambda clock, observer: Game.restore(snapshot, observer, recorder),
+            recorder,
+            self._on_stopped
+        )
 
+    def _create_recorder(self, guid: UUID) -> GameRecorder:
+        if self._journal is None:
+            return NullGameRecorder()
+        return JournalGameRecorder(self._journal, guid)
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from superego.game.game import GameState, PlayerState
+
+
+GAME_STATE_FIELDS = ('time', 'phase', 'points_in_bank', 'round_number',
+                     'current_card', 'card_changed')
+PLAYER_STATE_FIELDS = ('points', 'points_change', 'awaited_to_answer',
+                       'awaited_to_guess', 'ready')
+
+
+@dataclass(frozen=True, init=True)
+class GameStateDelta:
+    version: int
+    base_version: int
+    changes: Dict[str, Any]
+    player_changes: Dict[int, Dict[str, Any]]
+    removed_seats: List[int]
+    seat_order: Optional[List[int]]
+
+
+def compute_game_state_delta(previous: GameState,
+                             current: GameState) -> GameStateDelta:
+    changes = _compare_fields(previous, current, GAME_STATE_FIELDS)
+    previous_players = {player_state.seat: player_state
+                        for player_state in previous.player_states}
+    player_changes = dict()
+    for player_state in current.player_states:
+        previous_player_state = previous_players.pop(player_state.seat)
+        player_change = _compare_player_states(previous_player_state,
+                                               player_state)
+        if player_change:
+            player_changes[player_state.seat] = player_change
+    removed_seats = list(previous_players.keys())
+    seat_order = _compare_seat_order(previous, current, removed_seats)
+    return GameStateDelta(
+        version=current.version,
+        base_version=previous.version,
+        changes=changes,
+        player_changes=player_changes,
+        removed_seats=removed_seats,
+        seat_order=seat_order
+    )
+
+
+def _compare_player_states(previous: PlayerState,
+                           current: PlayerState) -> Dict[str, Any]:
+    return _compare_fields(previous, current, PLAYER_STATE_FIELDS)
+
+
+def _compare_fields(previous: Any, current: Any,
+                    fields: Tuple[str, ...]) -> Dict[str, Any]:
+    changes = dict()
+    for field in fields:
+        value = getattr(current, field)
+        if getattr(previous, field) != value:
+            changes[field] = value
+    return changes
+
+
+def _compare_seat_order(previous: GameState, current: GameState,
+                        removed_seats: List[int]) -> Optional[List[int]]:
+    previous_order = [player_state.seat
+                      for player_state in previous.player_states
+                      if player_state.seat not in removed_seats]
+    current_order = [player_state.seat
+                     for player_state in current.player_states]
+    if previous_order == current_order:
+        return None
+    return current_order
@@ -0,0 +1,109 @@
+from datetime import datetime
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii as encode_string
+from typing import Any, Callable, Dict, List
+from uuid import UUID
+
+from superego.game.game import Card, GamePhaseName, GameState, PlayerState
+from superego.infrastructure.websockets.delta import GameStateDelta
+from superego.infrastructure.websockets.feedback import Status
+
+CACHED_UUIDS_COUNT = 65536
+CACHED_CARDS_COUNT = 4096
+
+CONFIRMATION_FRAME = '{"status": "%s", "data": null}' % Status.ACKNOWLEDGED.value
+GAME_STATE_FRAME_PREFIX = '{"status": "%s", "data": ' % Status.GAME_STATE.value
+GAME_STATE_DELTA_FRAME_PREFIX =\
+    '{"status": "%s", "data": ' % Status.GAME_STATE_DELTA.value
+
+_BOOLEANS = {True: 'true', False: 'false'}
+_PHASES = {phase: encode_string(phase.value) for phase in GamePhaseName}
+
+
+def encode_game_state_frame(game_state: GameState) -> str:
+    return GAME_STATE_FRAME_PREFIX + encode_game_state(game_state) + '}'
+
+
+def encode_game_state_delta_frame(delta: GameStateDelta) -> str:
+    return GAME_STATE_DELTA_FRAME_PREFIX + encode_game_state_delta(delta) + '}'
+
+
+def encode_game_state(game_state: GameState) -> str:
+    player_states = ', '.join([encode_player_state(player_state)
+                               for player_state in game_state.player_states])
+    return f'{{"version": {game_state.version},' \
+           f' "time": {encode_datetime(game_state.time)},' \
+           f' "phase": {_PHASES[game_state.phase]},' \
+           f' "player_states": [{player_states}],' \
+           f' "points_in_bank": {game_state.points_in_bank},' \
+           f' "round_number": {game_state.round_number},' \
+           f' "current_card": {encode_card(game_state.current_card)},' \
+           f' "card_changed": {_BOOLEANS[game_state.card_changed]}}}'
+
+
+def encode_player_state(player_state: PlayerState) -> str:
+    return f'{{"guid": {encode_uuid(player_state.guid)},' \
+           f' "seat": {player_state.seat},' \
+           f' "name": {encode_string(player_state.name)},' \
+           f' "points": {player_state.points},' \
+           f' "points_change": {player_state.points_change},' \
+           f' "awaited_to_answer": {_BOOLEANS[player_state.awaited_to_answer]},' \
+           f' "awaited_to_guess": {_BOOLEANS[player_state.awaited_to_guess]},' \
+           f' "ready": {_BOOLEANS[player_state.ready]}}}'
+
+
+def encode_game_state_delta(delta: GameStateDelta) -> str:
+    changes = _encode_fields(delta.changes)
+    player_changes = ', '.join([f'"{seat}": {_encode_fields(fields)}'
+                                for seat, fields
+                                in delta.player_changes.items()])
+    return f'{{"version": {delta.version},' \
+           f' "base_version": {delta.base_version},' \
+           f' "changes": {changes},' \
+           f' "player_changes": {{{player_changes}}},' \
+           f' "removed_seats": {_encode_seats(delta.removed_seats)},' \
+           f' "seat_order": {_encode_seats(delta.seat_order)}}}'
+
+
+def encode_datetime(datetime_: datetime) -> str:
+    return '"%02d/%02d/%02d %02d:%02d:%02d"' % (
+        datetime_.month, datetime_.day, datetime_.year % 100,
+        datetime_.hour, datetime_.minute, datetime_.second)
+
+
+@lru_cache(maxsize=CACHED_UUIDS_COUNT)
+def encode_uuid(uuid: UUID) -> str:
+    return f'"{uuid}"'
+
+
+@lru_cache(maxsize=CACHED_CARDS_COUNT)
+def encode_card(card: Card) -> str:
+    return f'{{"question": {encode_string(card.question)},' \
+           f' "answer_A": {encode_string(card.answer_A)},' \
+           f' "answer_B": {encode_string(card.answer_B)},' \
+           f' "answer_C": {encode_string(card.answer_C)}}}'
+
+
+def _encode_value(value: Any) -> str:
+    return _VALUE_ENCODERS[type(value)](value)
+
+
+def _encode_fields(fields: Dict[str, Any]) -> str:
+    encoded = ', '.join([f'"{name}": {_encode_value(value)}'
+                         for name, value in fields.items()])
+    return f'{{{encoded}}}'
+
+
+def _encode_seats(seats: List[int]) -> str:
+    if seats is None:
+        return 'null'
+    return '[' + ', '.join(map(str, seats)) + ']'
+
+
+_VALUE_ENCODERS: Dict[type, Callable[[Any], str]] = {
+    bool: _BOOLEANS.__getitem__,
+    int: str,
+    datetime: encode_datetime,
+    GamePhaseName: _PHASES.__getitem__,
+    Card: encode_card,
+}
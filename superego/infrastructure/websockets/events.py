@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 
@@ -12,12 +12,13 @@ class EventAction(Enum):
     SUBSCRIBE = 'SUBSCRIBE'
     READ = 'READ'
     READY = 'READY'
+    SPECTATE = 'SPECTATE'
 
 
 @dataclass(frozen=True, init=True)
 class Event:
     time_received: datetime
     action: EventAction
-    issuer: UUID
+    issuer: Optional[UUID]
     params: List
 
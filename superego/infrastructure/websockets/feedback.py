@@ -7,6 +7,7 @@ class Status(Enum):
     ACKNOWLEDGED = 'ACK'
     ERROR = 'ERR'
     GAME_STATE = 'STAT'
+    GAME_STATE_DELTA = 'DELTA'
 
 
 @dataclass(init=True, frozen=True)
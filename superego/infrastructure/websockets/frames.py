@@ -0,0 +1,16 @@
+from typing import Dict, Tuple
+
+from superego.game.game import GameState
+from superego.infrastructure.websockets.protocol import Codec, Frame
+
+
+class GameStateFrameCache:
+    def __init__(self):
+        self._frames: Dict[Codec, Tuple[int, Frame]] = dict()
+
+    def get(self, game_state: GameState, codec: Codec) -> Frame:
+        version, frame = self._frames.get(codec, (-1, None))
+        if version != game_state.version:
+            frame = codec.encode_game_state(game_state)
+            self._frames[codec] = (game_state.version, frame)
+        return frame
@@ -1,22 +1,34 @@
 import asyncio
-import signal
+import logging
 from dataclasses import dataclass
 from uuid import UUID
 from abc import ABCMeta, abstractmethod
-from typing import Dict
+from typing import Callable, Dict, Set, Optional, Tuple
 
-from websockets import WebSocketServerProtocol, serve
+from websockets import WebSocketServerProtocol, WebSocketServer, serve
 
 from superego.application.interfaces import GameServer
-from superego.infrastructure.websockets.broadcast import Broadcast
+from superego.infrastructure.websockets.broadcast import Broadcast, \
+    SlowConsumerPolicy, DEFAULT_SEND_QUEUE_SIZE, \
+    DEFAULT_SLOW_CONSUMER_POLICY, DEFAULT_MAX_SPECTATORS, \
+    DEFAULT_SPECTATORS_BATCH_SIZE, DEFAULT_SPECTATOR_BUFFER_LIMIT
 from superego.infrastructure.websockets.events import\
     Event, \
     EventAction
 from superego.infrastructure.websockets.handlers import EventHandler
-from superego.game.game import GameObserver, GameState
+from superego.game.game import Game, GameObserver, GameState, GameRecorder, \
+    NullGameRecorder
 from superego.infrastructure.time import TimeProvider
-from superego.infrastructure.websockets.serialization import \
-    serialize_game_state, deserialize_json, deserialize_event
+from superego.infrastructure.websockets.delta import compute_game_state_delta
+from superego.infrastructure.websockets.frames import GameStateFrameCache
+from superego.infrastructure.websockets.protocol import Codec, Frame, \
+    SUBPROTOCOLS, get_codec
+
+DEFAULT_INBOX_SIZE = 64
+DEFAULT_BROADCAST_WINDOW = 0.0
+DEFAULT_GAME_OVER_GRACE = 30.0
+
+logger = logging.getLogger(__name__)
 
 
 class WebsocketsServerError(RuntimeError):
@@ -28,14 +40,6 @@ class DataEncodingInvalid(WebsocketsServerError):
         super().__init__(f'Incoming data is not encoded properly ({encoding})')
 
 
-class MissingEventAction(WebsocketsServerError):
-    pass
-
-
-class MissingEventIssuer(WebsocketsServerError):
-    pass
-
-
 class UnknownEventAction(WebsocketsServerError):
     def __init__(self, action_name: str):
         message = f'Event action unknown: {action_name}'
@@ -52,11 +56,24 @@ class SocketReadUnsuccessful(WebsocketsServerError):
     pass
 
 
+class GameActorStopped(WebsocketsServerError):
+    def __init__(self):
+        super().__init__('Game is no longer accepting events')
+
+
 @dataclass(init=True, frozen=True)
 class WebsocketsServerConfig:
     host: str
     port: int
     encoding: str
+    inbox_size: int = DEFAULT_INBOX_SIZE
+    broadcast_window: float = DEFAULT_BROADCAST_WINDOW
+    send_queue_size: int = DEFAULT_SEND_QUEUE_SIZE
+    slow_consumer_policy: SlowConsumerPolicy = DEFAULT_SLOW_CONSUMER_POLICY
+    max_spectators: int = DEFAULT_MAX_SPECTATORS
+    spectators_batch_size: int = DEFAULT_SPECTATORS_BATCH_SIZE
+    spectator_buffer_limit: int = DEFAULT_SPECTATOR_BUFFER_LIMIT
+    game_over_grace: float = DEFAULT_GAME_OVER_GRACE
 
 
 class ConnectionHandler(metaclass=ABCMeta):
@@ -67,7 +84,8 @@ class ConnectionHandler(metaclass=ABCMeta):
 
 class EventRouter(metaclass=ABCMeta):
     @abstractmethod
-    async def route(self, event: Event, websocket: WebSocketServerProtocol) -> None:
+    async def route(self, event: Event,
+                    websocket: WebSocketServerProtocol) -> Optional[Frame]:
         raise NotImplemented
 
     @abstractmethod
@@ -77,12 +95,25 @@ class EventRouter(metaclass=ABCMeta):
 
 
 class WebSocketsGameObserver(GameObserver):
-    def __init__(self, broadcast: Broadcast):
-        self._broadcast: Broadcast = broadcast
+    def __init__(self, broadcast: Broadcast, frames: GameStateFrameCache,
+                 spectators: Broadcast = None):
+        self._broadcasts: Tuple[Broadcast, ...] = (broadcast,) \
+            if spectators is None else (broadcast, spectators)
+        self._frames: GameStateFrameCache = frames
+        self._last_state: Optional[GameState] = None
 
     def notify_game_state_changed(self, game_state: GameState) -> None:
-        message = serialize_game_state(game_state)
-        self._broadcast.broadcast(message)
+        def snapshot(codec: Codec) -> Frame:
+            return self._frames.get(game_state, codec)
+
+        if self._last_state is None:
+            encode = snapshot
+        else:
+            delta = compute_game_state_delta(self._last_state, game_state)
+            encode = lambda codec: codec.encode_game_state_delta(delta)
+        for broadcast in self._broadcasts:
+            broadcast.broadcast(encode, snapshot)
+        self._last_state = game_state
 
 
 class WebSocketsEventRouter(EventRouter):
@@ -90,12 +121,12 @@ class WebSocketsEventRouter(EventRouter):
         self._handlers: Dict[str, EventHandler] = dict()
 
     async def route(self, event: Event,
-                    websocket: WebSocketServerProtocol) -> None:
+                    websocket: WebSocketServerProtocol) -> Optional[Frame]:
         action_name = event.action.value
         if action_name not in self._handlers:
             raise UnknownEventAction(action_name)
         handler = self._handlers[action_name]
-        await handler.handle(event, websocket)
+        return await handler.handle(event, websocket)
 
     def register_handler(self, action: EventAction,
                          handler: EventHandler) -> EventRouter:
@@ -103,6 +134,121 @@ class WebSocketsEventRouter(EventRouter):
         return self
 
 
+class GameActor(EventRouter):
+    def __init__(self, game: Game, router: EventRouter,
+                 observer: GameObserver,
+                 inbox_size: int = DEFAULT_INBOX_SIZE,
+                 broadcast_window: float = DEFAULT_BROADCAST_WINDOW,
+                 game_over_grace: float = DEFAULT_GAME_OVER_GRACE):
+        self._game: Game = game
+        self._router: EventRouter = router
+        self._observer: GameObserver = observer
+        self._inbox: asyncio.Queue = asyncio.Queue(inbox_size)
+        self._broadcast_window: float = broadcast_window
+        self._broadcast_version: int = -1
+        self._last_broadcast: float = float('-inf')
+        self._scheduled_broadcast: Optional[asyncio.TimerHandle] = None
+        self._game_over_grace: float = game_over_grace
+        self._on_game_over: Optional[Callable[[], None]] = None
+        self._scheduled_game_over: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopped: bool = False
+
+    def start(self, on_game_over: Callable[[], None] = None) -> None:
+        self._on_game_over = on_game_over
+        self._notify()
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+        if self._scheduled_broadcast is not None:
+            self._scheduled_broadcast.cancel()
+        if self._scheduled_game_over is not None:
+            self._scheduled_game_over.cancel()
+        self._reject_pending()
+
+    async def route(self, event: Event,
+                    websocket: WebSocketServerProtocol) -> Optional[Frame]:
+        if self._stopped:
+            raise GameActorStopped
+        done = asyncio.get_running_loop().create_future()
+        await self._inbox.put((event, websocket, done))
+        if self._stopped:
+            self._reject_pending()
+        return await done
+
+    def register_handler(self, action: EventAction,
+                         handler: EventHandler) -> EventRouter:
+        self._router.register_handler(action, handler)
+        return self
+
+    async def _run(self) -> None:
+        while True:
+            await self._process(await self._inbox.get())
+            while not self._inbox.empty():
+                await self._process(self._inbox.get_nowait())
+            self._request_broadcast()
+            self._watch_game_over()
+
+    async def _process(self, envelope: Tuple[Event, WebSocketServerProtocol,
+                                             asyncio.Future]) -> None:
+        event, websocket, done = envelope
+        try:
+            reply = await self._router.route(event, websocket)
+        except asyncio.CancelledError:
+            _reject(done, GameActorStopped())
+            raise
+        except Exception as error:
+            _reject(done, error)
+        else:
+            if not done.done():
+                done.set_result(reply)
+
+    def _request_broadcast(self) -> None:
+        if self._scheduled_broadcast is not None:
+            return
+        loop = asyncio.get_running_loop()
+        delay = self._last_broadcast + self._broadcast_window - loop.time()
+        if delay <= 0:
+            self._broadcast()
+        else:
+            self._scheduled_broadcast = loop.call_later(delay,
+                                                        self._broadcast)
+
+    def _broadcast(self) -> None:
+        self._scheduled_broadcast = None
+        self._last_broadcast = asyncio.get_running_loop().time()
+        if self._game.version != self._broadcast_version:
+            self._notify()
+
+    def _watch_game_over(self) -> None:
+        if self._on_game_over is None or not self._game.over \
+                or self._scheduled_game_over is not None:
+            return
+        self._scheduled_game_over = asyncio.get_running_loop().call_later(
+            self._game_over_grace, self._on_game_over)
+
+    def _notify(self) -> None:
+        self._broadcast_version = self._game.version
+        try:
+            self._observer.notify_game_state_changed(self._game.state)
+        except Exception:
+            logger.exception('Broadcasting version %s failed',
+                             self._broadcast_version)
+
+    def _reject_pending(self) -> None:
+        while not self._inbox.empty():
+            _, _, done = self._inbox.get_nowait()
+            _reject(done, GameActorStopped())
+
+
+def _reject(done: asyncio.Future, error: BaseException) -> None:
+    if not done.done():
+        done.set_exception(error)
+
+
 class WebSocketsConnectionHandler(ConnectionHandler):
     def __init__(
             self,
@@ -117,18 +263,20 @@ class WebSocketsConnectionHandler(ConnectionHandler):
         self._broadcast: Broadcast = broadcast
 
     async def __call__(self, websocket: WebSocketServerProtocol) -> None:
+        codec = get_codec(websocket)
         async for message in websocket:
-            event = await self._receive_event(message)
+            event = await self._receive_event(message, codec)
             await self._process_event(event, websocket)
 
-    async def _receive_event(self, message: str):
-        event_dict = deserialize_json(message)
-        event = self._read_event(event_dict)
+    async def _receive_event(self, message: Frame, codec: Codec) -> Event:
+        event = codec.decode_event(message, self._time_provider)
         return event
 
     async def _process_event(self, event: Event,
                              websocket: WebSocketServerProtocol) -> None:
-        await self._router.route(event, websocket)
+        reply = await self._router.route(event, websocket)
+        if reply is not None:
+            await websocket.send(reply)
 
     def _decode_incoming_data(self, data: bytes) -> str:
         try:
@@ -137,40 +285,146 @@ class WebSocketsConnectionHandler(ConnectionHandler):
         except UnicodeDecodeError:
             raise DataEncodingInvalid
 
-    def _read_event(self, event_dict: Dict) -> Event:
-        if 'action' not in event_dict:
-            raise MissingEventAction
-        if 'issuer' not in event_dict:
-            raise MissingEventIssuer
 
-        event = deserialize_event(event_dict, self._time_provider)
+class WebSocketsListener:
+    GAME_PATH_PREFIX = '/games/'
+    GAME_NOT_FOUND_CLOSE_CODE = 1008
 
-        return event
+    def __init__(self, config: WebsocketsServerConfig):
+        self._host: str = config.host
+        self._port: int = config.port
+        self._encoding: str = config.encoding
+        self._inbox_size: int = config.inbox_size
+        self._broadcast_window: float = config.broadcast_window
+        self._send_queue_size: int = config.send_queue_size
+        self._slow_consumer_policy: SlowConsumerPolicy = \
+            config.slow_consumer_policy
+        self._max_spectators: int = config.max_spectators
+        self._spectators_batch_size: int = config.spectators_batch_size
+        self._spectator_buffer_limit: int = config.spectator_buffer_limit
+        self._game_over_grace: float = config.game_over_grace
+        self._handlers: Dict[UUID, ConnectionHandler] = dict()
+        self._connections: Dict[UUID, Set[WebSocketServerProtocol]] = dict()
+        self._server: Optional[WebSocketServer] = None
+
+    async def start(self) -> None:
+        self._server = await serve(self._dispatch, self._host, self._port,
+                                   subprotocols=SUBPROTOCOLS)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def register(self, guid: UUID, handler: ConnectionHandler) -> None:
+        self._handlers[guid] = handler
+        self._connections[guid] = set()
+
+    def unregister(self, guid: UUID) -> None:
+        del self._handlers[guid]
+        for websocket in self._connections.pop(guid):
+            asyncio.ensure_future(websocket.close())
+
+    def address(self, guid: UUID) -> str:
+        return f'{self._host}:{self._port}{self.GAME_PATH_PREFIX}{guid}'
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    @property
+    def inbox_size(self) -> int:
+        return self._inbox_size
+
+    @property
+    def broadcast_window(self) -> float:
+        return self._broadcast_window
+
+    @property
+    def send_queue_size(self) -> int:
+        return self._send_queue_size
+
+    @property
+    def slow_consumer_policy(self) -> SlowConsumerPolicy:
+        return self._slow_consumer_policy
+
+    @property
+    def max_spectators(self) -> int:
+        return self._max_spectators
+
+    @property
+    def spectators_batch_size(self) -> int:
+        return self._spectators_batch_size
+
+    @property
+    def spectator_buffer_limit(self) -> int:
+        return self._spectator_buffer_limit
+
+    @property
+    def game_over_grace(self) -> float:
+        return self._game_over_grace
+
+    async def _dispatch(self, websocket: WebSocketServerProtocol) -> None:
+        guid = self._read_game_guid(websocket.path)
+        if guid not in self._handlers:
+            await websocket.close(code=self.GAME_NOT_FOUND_CLOSE_CODE,
+                                  reason='Game not found')
+            return
+        handler = self._handlers[guid]
+        connections = self._connections[guid]
+        connections.add(websocket)
+        try:
+            await handler(websocket)
+        finally:
+            connections.discard(websocket)
+
+    def _read_game_guid(self, path: str) -> Optional[UUID]:
+        if not path.startswith(self.GAME_PATH_PREFIX):
+            return None
+        try:
+            return UUID(path[len(self.GAME_PATH_PREFIX):].rstrip('/'))
+        except ValueError:
+            return None
 
 
 class WebSocketsServer(GameServer):
     def __init__(
             self,
-            config: WebsocketsServerConfig,
-            connection_handler: ConnectionHandler
+            guid: UUID,
+            listener: WebSocketsListener,
+            connection_handler: ConnectionHandler,
+            recorder: GameRecorder = None,
+            actor: GameActor = None,
+            on_stopped: Callable[[UUID], None] = None
     ):
-        self._host: str = config.host
-        self._port: int = config.port
+        self._guid: UUID = guid
+        self._listener: WebSocketsListener = listener
         self._handler: ConnectionHandler = connection_handler
-
-        self._loop = asyncio.get_event_loop()
-        self._stop: asyncio.Future= self._loop.create_future()
+        self._recorder: GameRecorder = recorder if recorder \
+            else NullGameRecorder()
+        self._actor: Optional[GameActor] = actor
+        self._on_stopped: Optional[Callable[[UUID], None]] = on_stopped
+        self._stopped: bool = False
 
     def run(self) -> None:
-        self._loop.create_task(self._serve())
+        if self._actor is not None:
+            self._actor.start(self.stop)
+        self._listener.register(self._guid, self._handler)
 
     def stop(self) -> None:
-        self._stop.cancel()
+        if self._stopped:
+            return
+        self._stopped = True
+        self._listener.unregister(self._guid)
+        if self._actor is not None:
+            self._actor.stop()
+        self._recorder.record_game_closed()
+        if self._on_stopped is not None:
+            self._on_stopped(self._guid)
 
     @property
     def address(self):
-        return f'{self._host}:{self._port}'
+        return self._listener.address(self._guid)
 
-    async def _serve(self) -> None:
-        async with serve(self._handler, self._host, self._port):
-            await self._stop
+    @property
+    def guid(self) -> UUID:
+        return self._guid
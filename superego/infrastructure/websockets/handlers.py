@@ -1,5 +1,5 @@
 from abc import ABCMeta, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from websockets import WebSocketServerProtocol
 
@@ -7,8 +7,8 @@ from superego.application.usecases import AnswerUseCase, GuessUseCase, \
     ChangeCardUseCase, GetGameStateUseCase, ReadyUseCase
 from superego.infrastructure.websockets.broadcast import Broadcast
 from superego.infrastructure.websockets.events import Event
-from superego.infrastructure.websockets.serialization import \
-    serialize_confirmation, serialize_game_state
+from superego.infrastructure.websockets.frames import GameStateFrameCache
+from superego.infrastructure.websockets.protocol import Frame, get_codec
 
 
 class EventHandlingError(RuntimeError):
@@ -24,7 +24,7 @@ class EventParametersMissing(EventHandlingError):
 class EventHandler(metaclass=ABCMeta):
     @abstractmethod
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         raise NotImplemented
 
 
@@ -33,11 +33,11 @@ class AnswerEventHandler(EventHandler):
         self._answer = use_case
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         self._ensure_params_present(event)
         answer_text = event.params[0]
         self._answer(answer_text, event.issuer)
-        await _send_confirmation(websocket)
+        return _confirmation(websocket)
 
     @staticmethod
     def _ensure_params_present(event: Event) -> None:
@@ -50,11 +50,11 @@ class GuessEventHandler(EventHandler):
         self._guess = use_case
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         self._ensure_params_present(event)
         answer_text, bet = event.params
         self._guess(answer_text, bet, event.issuer)
-        await _send_confirmation(websocket)
+        return _confirmation(websocket)
 
     @staticmethod
     def _ensure_params_present(event: Event) -> None:
@@ -69,10 +69,9 @@ class ChangeCardEventHandler(EventHandler):
         self._change_card: ChangeCardUseCase = use_case
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         self._change_card(event.issuer)
-        message = serialize_confirmation()
-        await websocket.send(message)
+        return _confirmation(websocket)
 
 
 class ReadyEventHandler(EventHandler):
@@ -80,34 +79,53 @@ class ReadyEventHandler(EventHandler):
         self._mark_ready: ReadyUseCase = use_case
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         self._mark_ready(event.issuer)
-        message = serialize_confirmation()
-        await websocket.send(message)
+        return _confirmation(websocket)
 
 
 class SubscribeGameBroadcastEventHandler(EventHandler):
-    def __init__(self, game_broadcast: Broadcast):
+    def __init__(self, game_broadcast: Broadcast,
+                 use_case: GetGameStateUseCase, frames: GameStateFrameCache):
         self._broadcast = game_broadcast
+        self._get_game_state = use_case
+        self._frames = frames
+
+    async def handle(self, event: Event,
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
+        game_state = self._get_game_state()
+        snapshot = self._frames.get(game_state, get_codec(websocket))
+        await self._broadcast.add_listener(websocket, snapshot,
+                                           _confirmation(websocket))
+        return None
+
+
+class SpectateGameBroadcastEventHandler(EventHandler):
+    def __init__(self, spectators: Broadcast,
+                 use_case: GetGameStateUseCase, frames: GameStateFrameCache):
+        self._spectators = spectators
+        self._get_game_state = use_case
+        self._frames = frames
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
-        await self._broadcast.add_listener(websocket)
-        message = serialize_confirmation()
-        await websocket.send(message)
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
+        game_state = self._get_game_state()
+        snapshot = self._frames.get(game_state, get_codec(websocket))
+        await self._spectators.add_listener(websocket, snapshot)
+        return None
 
 
 class ReadGameStateEventHandler(EventHandler):
-    def __init__(self, use_case: GetGameStateUseCase):
+    def __init__(self, use_case: GetGameStateUseCase,
+                 frames: GameStateFrameCache):
         self._get_game_state = use_case
+        self._frames = frames
 
     async def handle(self, event: Event,
-                     websocket: WebSocketServerProtocol) -> None:
+                     websocket: WebSocketServerProtocol) -> Optional[Frame]:
         game_state = self._get_game_state()
-        read = serialize_game_state(game_state)
-        await websocket.send(read)
+        return self._frames.get(game_state, get_codec(websocket))
 
 
-async def _send_confirmation(websocket: WebSocketServerProtocol) -> None:
-    message = serialize_confirmation()
-    await websocket.send(message)
+def _confirmation(websocket: WebSocketServerProtocol) -> Frame:
+    return get_codec(websocket).encode_confirmation()
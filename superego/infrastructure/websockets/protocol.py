@@ -0,0 +1,82 @@
+from abc import ABCMeta, abstractmethod
+from typing import Dict, Union
+
+from websockets import WebSocketServerProtocol
+
+from superego.game.game import GameState
+from superego.infrastructure.time import TimeProvider
+from superego.infrastructure.websockets import binary
+from superego.infrastructure.websockets.delta import GameStateDelta
+from superego.infrastructure.websockets.events import Event
+from superego.infrastructure.websockets.serialization import \
+    serialize_game_state, serialize_game_state_delta, serialize_confirmation,\
+    deserialize_json, deserialize_event
+
+Frame = Union[str, bytes]
+
+JSON_SUBPROTOCOL = 'superego.json'
+BINARY_SUBPROTOCOL = 'superego.binary'
+
+
+class Codec(metaclass=ABCMeta):
+    @abstractmethod
+    def encode_game_state(self, game_state: GameState) -> Frame:
+        raise NotImplemented
+
+    @abstractmethod
+    def encode_game_state_delta(self, delta: GameStateDelta) -> Frame:
+        raise NotImplemented
+
+    @abstractmethod
+    def encode_confirmation(self) -> Frame:
+        raise NotImplemented
+
+    @abstractmethod
+    def decode_event(self, message: Frame,
+                     time_provider: TimeProvider) -> Event:
+        raise NotImplemented
+
+
+class JSONCodec(Codec):
+    def encode_game_state(self, game_state: GameState) -> Frame:
+        return serialize_game_state(game_state)
+
+    def encode_game_state_delta(self, delta: GameStateDelta) -> Frame:
+        return serialize_game_state_delta(delta)
+
+    def encode_confirmation(self) -> Frame:
+        return serialize_confirmation()
+
+    def decode_event(self, message: Frame,
+                     time_provider: TimeProvider) -> Event:
+        event_dict = deserialize_json(message)
+        return deserialize_event(event_dict, time_provider)
+
+
+class BinaryCodec(Codec):
+    def encode_game_state(self, game_state: GameState) -> Frame:
+        return binary.encode_game_state(game_state)
+
+    def encode_game_state_delta(self, delta: GameStateDelta) -> Frame:
+        return binary.encode_game_state_delta(delta)
+
+    def encode_confirmation(self) -> Frame:
+        return binary.CONFIRMATION_FRAME
+
+    def decode_event(self, message: Frame,
+                     time_provider: TimeProvider) -> Event:
+        return binary.decode_event(message, time_provider)
+
+
+JSON_CODEC = JSONCodec()
+BINARY_CODEC = BinaryCodec()
+
+CODECS: Dict[str, Codec] = {
+    JSON_SUBPROTOCOL: JSON_CODEC,
+    BINARY_SUBPROTOCOL: BINARY_CODEC,
+}
+SUBPROTOCOLS = list(CODECS.keys())
+
+
+def get_codec(websocket: WebSocketServerProtocol) -> Codec:
+    return CODECS.get(websocket.subprotocol, JSON_CODEC)
@@ -1,15 +1,11 @@
 import json
-from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 from uuid import UUID
 
-from dataclasses_serialization.serializer_base import\
-    noop_serialization,\
-    dict_serialization,\
-    Serializer
-
-from superego.game.game import GamePhaseName, GameState
-from superego.infrastructure.websockets.feedback import Feedback, Status
+from superego.game.game import GameState
+from superego.infrastructure.websockets.delta import GameStateDelta
+from superego.infrastructure.websockets.encoder import CONFIRMATION_FRAME, \
+    encode_game_state_frame, encode_game_state_delta_frame
 from superego.infrastructure.websockets.events import EventAction, Event
 from superego.infrastructure.time import TimeProvider
 
@@ -18,61 +14,30 @@ class DeserializationError(RuntimeError):
     pass
 
 
-class UnknownEventAction(DeserializationError):
-    def __init__(self, action_name: str):
-        message = f'Event action unknown: {action_name}'
-        super().__init__(message)
-
-
-def _serialize_datetime(datetime_: datetime) -> str:
-    text = datetime_.strftime('%m/%d/%y %H:%M:%S')
-    return text
-
-
-def _serialize_game_phase_name(game_phase_name: GamePhaseName) -> str:
-    value = game_phase_name.value
-    return value
-
+class MissingEventAction(DeserializationError):
+    pass
 
-def _serialize_uuid(uuid: UUID) -> str:
-    text = str(uuid)
-    return text
 
+class MissingEventIssuer(DeserializationError):
+    pass
 
-def _serialize_feedback_status(status: Status) -> str:
-    value = status.value
-    return value
 
+class UnknownEventAction(DeserializationError):
+    def __init__(self, action_name: str):
+        message = f'Event action unknown: {action_name}'
+        super().__init__(message)
 
-JSONSerializer = Serializer(
-    serialization_functions={
-        dict: lambda dct: dict_serialization(
-            dct, key_serialization_func=JSONSerializer.serialize,
-            value_serialization_func=JSONSerializer.serialize),
-        list: lambda lst: list(map(JSONSerializer.serialize, lst)),
-        (str, int, float, bool, type(None)): noop_serialization,
-        datetime: _serialize_datetime,
-        GamePhaseName: _serialize_game_phase_name,
-        UUID: _serialize_uuid,
-        Status: _serialize_feedback_status
 
-    },
-    deserialization_functions={}
-)
+def serialize_game_state(game_state: GameState) -> str:
+    return encode_game_state_frame(game_state)
 
 
-def serialize_game_state(game_state: GameState) -> str:
-    feedback = Feedback(status=Status.GAME_STATE, data=game_state)
-    json_ = JSONSerializer.serialize(feedback)
-    string = json.dumps(json_)
-    return string
+def serialize_game_state_delta(delta: GameStateDelta) -> str:
+    return encode_game_state_delta_frame(delta)
 
 
 def serialize_confirmation() -> str:
-    feedback = Feedback(status=Status.ACKNOWLEDGED, data=None)
-    json_ = JSONSerializer.serialize(feedback)
-    string = json.dumps(json_)
-    return string
+    return CONFIRMATION_FRAME
 
 
 def deserialize_json(message: str) -> Dict:
@@ -81,10 +46,15 @@ def deserialize_json(message: str) -> Dict:
 
 
 def deserialize_event(event_dict: Dict, time_provider: TimeProvider) -> Event:
+    if 'action' not in event_dict:
+        raise MissingEventAction
+    action = _deserialize_event_action(event_dict['action'])
+    if 'issuer' not in event_dict and action != EventAction.SPECTATE:
+        raise MissingEventIssuer
+
     params = event_dict['params'] if 'params' in event_dict else list()
     time_received = time_provider.now()
-    issuer = _deserialize_issuer(event_dict['issuer'])
-    action = _deserialize_event_action(event_dict['action'])
+    issuer = _deserialize_issuer(event_dict.get('issuer'))
 
     event = Event(
         time_received=time_received,
@@ -96,7 +66,9 @@ def deserialize_event(event_dict: Dict, time_provider: TimeProvider) -> Event:
     return event
 
 
-def _deserialize_issuer(issuer_text: str) -> UUID:
+def _deserialize_issuer(issuer_text: Optional[str]) -> Optional[UUID]:
+    if issuer_text is None:
+        return None
     return UUID(issuer_text)
 
 
@@ -113,5 +85,7 @@ def _deserialize_event_action(action_text: str) -> EventAction:
         return EventAction.READ
     elif action_text == EventAction.READY.value:
         return EventAction.READY
+    elif action_text == EventAction.SPECTATE.value:
+        return EventAction.SPECTATE
     else:
         raise UnknownEventAction(action_text)
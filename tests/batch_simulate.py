@@ -0,0 +1,221 @@
+import sys
+import time
+from abc import ABCMeta, abstractmethod
+from dataclasses import dataclass
+
+import numpy as np
+
+from superego.game.game import INITIAL_PLAYER_POINTS_COUNT, BetPool
+
+ANSWERS_COUNT = 3
+
+
+class InvalidBatchBets(RuntimeError):
+    def __init__(self, games_count: int):
+        message = f'Policy placed invalid or unaffordable bets' \
+                  f' in {games_count} games'
+        super().__init__(message)
+
+
+@dataclass(init=True, frozen=True)
+class BatchSettings:
+    players_count: int
+    max_rounds_factor: int
+    initial_points: int = INITIAL_PLAYER_POINTS_COUNT
+    min_bet: int = BetPool.MIN_BET
+    max_bet: int = BetPool.MAX_BET
+
+    @property
+    def max_rounds(self) -> int:
+        return self.max_rounds_factor * self.players_count
+
+
+class BatchTable:
+    def __init__(self, games_count: int, settings: BatchSettings):
+        players_count = settings.players_count
+        self.settings: BatchSettings = settings
+        self.points: np.ndarray = np.full((games_count, players_count),
+                                          settings.initial_points,
+                                          dtype=np.int64)
+        self.in_game: np.ndarray = np.ones((games_count, players_count),
+                                           dtype=bool)
+        self.answering_seat: np.ndarray = np.zeros(games_count, dtype=np.int64)
+        self.points_in_bank: np.ndarray = np.full(
+            games_count, settings.initial_points * players_count,
+            dtype=np.int64)
+        self.round_number: np.ndarray = np.ones(games_count, dtype=np.int64)
+        self.ongoing: np.ndarray = np.ones(games_count, dtype=bool)
+
+    @property
+    def games_count(self) -> int:
+        return self.points.shape[0]
+
+    @property
+    def players_count(self) -> int:
+        return self.points.shape[1]
+
+    @property
+    def answering(self) -> np.ndarray:
+        return np.arange(self.players_count) == self.answering_seat[:, None]
+
+    @property
+    def guessing(self) -> np.ndarray:
+        return self.in_game & ~self.answering
+
+
+class AnswerPolicy(metaclass=ABCMeta):
+    @abstractmethod
+    def answers(self, table: BatchTable) -> np.ndarray:
+        raise NotImplemented
+
+
+class BetPolicy(metaclass=ABCMeta):
+    @abstractmethod
+    def bets(self, table: BatchTable) -> np.ndarray:
+        raise NotImplemented
+
+
+class UniformAnswerPolicy(AnswerPolicy):
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def answers(self, table: BatchTable) -> np.ndarray:
+        return self._rng.integers(0, ANSWERS_COUNT, size=table.points.shape)
+
+
+class PredictingAnswerPolicy(AnswerPolicy):
+    def __init__(self, rng: np.random.Generator, accuracy: float):
+        self._rng = rng
+        self._accuracy = accuracy
+
+    def answers(self, table: BatchTable) -> np.ndarray:
+        answers = self._rng.integers(0, ANSWERS_COUNT, size=table.points.shape)
+        games = np.arange(table.games_count)
+        answering_answers = answers[games, table.answering_seat]
+        predicted = self._rng.random(table.points.shape) < self._accuracy
+        return np.where(predicted, answering_answers[:, None], answers)
+
+
+class UniformBetPolicy(BetPolicy):
+    def __init__(self, rng: np.random.Generator):
+        self._rng = rng
+
+    def bets(self, table: BatchTable) -> np.ndarray:
+        settings = table.settings
+        bets = self._rng.integers(settings.min_bet, settings.max_bet + 1,
+                                  size=table.points.shape)
+        return np.minimum(bets, table.points)
+
+
+class MaxBetPolicy(BetPolicy):
+    def bets(self, table: BatchTable) -> np.ndarray:
+        return np.minimum(table.settings.max_bet, table.points)
+
+
+@dataclass(init=True, frozen=True)
+class BatchResult:
+    points: np.ndarray
+    in_game: np.ndarray
+    points_in_bank: np.ndarray
+    rounds_played: np.ndarray
+
+    @property
+    def kicked_players(self) -> np.ndarray:
+        return (~self.in_game).sum(axis=1)
+
+    @property
+    def bank_exhausted(self) -> np.ndarray:
+        return self.points_in_bank <= 0
+
+
+class BatchSimulator:
+    def __init__(self, settings: BatchSettings, answer_policy: AnswerPolicy,
+                 bet_policy: BetPolicy):
+        self._settings = settings
+        self._answer_policy = answer_policy
+        self._bet_policy = bet_policy
+
+    def run(self, games_count: int) -> BatchResult:
+        table = BatchTable(games_count, self._settings)
+        while table.ongoing.any():
+            self._play_round(table)
+        return BatchResult(
+            points=table.points,
+            in_game=table.in_game,
+            points_in_bank=table.points_in_bank,
+            rounds_played=table.round_number
+        )
+
+    def _play_round(self, table: BatchTable) -> None:
+        answers = self._answer_policy.answers(table)
+        bets = self._bet_policy.bets(table)
+        guessing = table.guessing & table.ongoing[:, None]
+        self._ensure_bets_valid(bets, guessing, table)
+        self._settle(table, answers, bets, guessing)
+        self._advance(table)
+
+    def _ensure_bets_valid(self, bets: np.ndarray, guessing: np.ndarray,
+                           table: BatchTable) -> None:
+        invalid = guessing & ((bets < self._settings.min_bet)
+                              | (bets > self._settings.max_bet)
+                              | (bets > table.points))
+        invalid_games = invalid.any(axis=1).sum()
+        if invalid_games:
+            raise InvalidBatchBets(int(invalid_games))
+
+    @staticmethod
+    def _settle(table: BatchTable, answers: np.ndarray, bets: np.ndarray,
+                guessing: np.ndarray) -> None:
+        games = np.arange(table.games_count)
+        correct_answers = answers[games, table.answering_seat]
+        correct = guessing & (answers == correct_answers[:, None])
+        changes = np.where(correct, bets, -bets) * guessing
+        correct_guesses = correct.sum(axis=1)
+        changes[games, table.answering_seat] += \
+            correct_guesses * table.ongoing
+        table.points += changes
+        table.points_in_bank -= changes.sum(axis=1)
+        table.in_game &= table.points > 0
+
+    def _advance(self, table: BatchTable) -> None:
+        game_over = (table.round_number == self._settings.max_rounds) \
+            | (table.in_game.sum(axis=1) < 2) \
+            | (table.points_in_bank <= 0)
+        table.ongoing &= ~game_over
+        table.round_number += table.ongoing
+        next_seats = self._next_answering_seats(table)
+        table.answering_seat = np.where(table.ongoing, next_seats,
+                                        table.answering_seat)
+
+    @staticmethod
+    def _next_answering_seats(table: BatchTable) -> np.ndarray:
+        players_count = table.players_count
+        games = np.arange(table.games_count)[:, None]
+        seats = (table.answering_seat[:, None]
+                 + np.arange(1, players_count + 1)) % players_count
+        first_in_game = table.in_game[games, seats].argmax(axis=1)
+        return seats[games[:, 0], first_in_game]
+
+
+def summarize(result: BatchResult) -> str:
+    return f'rounds: {result.rounds_played.mean():.2f}' \
+           f' | bank exhausted: {result.bank_exhausted.mean():.2%}' \
+           f' | kicked per game: {result.kicked_players.mean():.2f}'
+
+
+if __name__ == '__main__':
+    players_count, rounds_per_player, games_count = \
+        int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3])
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    rng = np.random.default_rng(seed)
+    simulator = BatchSimulator(
+        BatchSettings(players_count, rounds_per_player),
+        UniformAnswerPolicy(rng),
+        UniformBetPolicy(rng)
+    )
+    start = time.perf_counter()
+    batch_result = simulator.run(games_count)
+    elapsed = time.perf_counter() - start
+    print(summarize(batch_result))
+    print(f'{games_count} games in {elapsed:.2f} s'
+          f' ({games_count / elapsed:,.0f} games/s)')
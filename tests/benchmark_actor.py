@@ -0,0 +1,132 @@
+import asyncio
+import random
+import sys
+import time
+from typing import Callable, Iterator, List
+
+from superego.application.usecases import AnswerUseCase, GuessUseCase, \
+    ReadyUseCase
+from superego.game.game import Game
+from superego.infrastructure.websockets.broadcast import Broadcast
+from superego.infrastructure.websockets.events import Event, EventAction
+from superego.infrastructure.websockets.frames import GameStateFrameCache
+from superego.infrastructure.websockets.gameserver import GameActor, \
+    EventRouter, WebSocketsEventRouter, WebSocketsGameObserver
+from superego.infrastructure.websockets.handlers import AnswerEventHandler, \
+    GuessEventHandler, ReadyEventHandler
+from superego.infrastructure.websockets.protocol import Codec, Frame, \
+    JSON_CODEC
+from tests.utils import create_test_lobby, ArtificialClock, \
+    ArtificialTimeProvider
+
+PLAYERS_COUNT = 6
+ROUNDS_PER_PLAYER = 10
+GAMES_COUNT = 100
+SUBSCRIBERS_COUNT = PLAYERS_COUNT
+
+
+class CountingBroadcast(Broadcast):
+    def __init__(self):
+        self.frames_count = 0
+        self.bytes_count = 0
+
+    async def add_listener(self, websocket, snapshot: Frame,
+                           confirmation: Frame = None) -> None:
+        pass
+
+    def remove_listener(self, websocket) -> None:
+        pass
+
+    def broadcast(self, encode: Callable[[Codec], Frame],
+                  snapshot: Callable[[Codec], Frame]) -> None:
+        frame = encode(JSON_CODEC)
+        self.frames_count += SUBSCRIBERS_COUNT
+        self.bytes_count += len(frame) * SUBSCRIBERS_COUNT
+
+
+class WebSocketStub:
+    subprotocol = None
+
+    async def send(self, message: Frame) -> None:
+        pass
+
+
+def create_router(game: Game) -> EventRouter:
+    return WebSocketsEventRouter()\
+        .register_handler(EventAction.ANSWER,
+                          AnswerEventHandler(AnswerUseCase(game)))\
+        .register_handler(EventAction.GUESS,
+                          GuessEventHandler(GuessUseCase(game)))\
+        .register_handler(EventAction.READY,
+                          ReadyEventHandler(ReadyUseCase(game)))
+
+
+def round_bursts(game: Game, rng: random.Random) -> Iterator[List[Event]]:
+    time_provider = ArtificialTimeProvider()
+    yield [Event(time_provider.now(), EventAction.ANSWER,
+                 game.current_player.guid, [rng.choice('ABC')])]
+    yield [Event(time_provider.now(), EventAction.GUESS, player.guid,
+                 [rng.choice('ABC'), 1]) for player in game.guessing_players]
+    yield [Event(time_provider.now(), EventAction.READY, player.guid, [])
+           for player in game.players]
+
+
+async def play_inline(games_count: int, broadcast: CountingBroadcast) -> int:
+    rng = random.Random(games_count)
+    websocket = WebSocketStub()
+    actions_count = 0
+    for _ in range(games_count):
+        lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+        observer = WebSocketsGameObserver(broadcast, GameStateFrameCache())
+        game = Game(lobby, ArtificialClock(), observer)
+        router = create_router(game)
+        while not game.over:
+            for burst in round_bursts(game, rng):
+                for event in burst:
+                    await router.route(event, websocket)
+        actions_count += game.version
+    return actions_count
+
+
+async def play_actor(games_count: int, broadcast: CountingBroadcast,
+                     window: float) -> int:
+    rng = random.Random(games_count)
+    websocket = WebSocketStub()
+    actions_count = 0
+    for _ in range(games_count):
+        lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+        observer = WebSocketsGameObserver(broadcast, GameStateFrameCache())
+        game = Game(lobby, ArtificialClock(), None)
+        actor = GameActor(game, create_router(game), observer,
+                          broadcast_window=window)
+        actor.start()
+        while not game.over:
+            for burst in round_bursts(game, rng):
+                await asyncio.gather(*[actor.route(event, websocket)
+                                       for event in burst])
+        await asyncio.sleep(window)
+        actor.stop()
+        actions_count += game.version
+    return actions_count
+
+
+def measure(label: str, play: Callable, *args) -> None:
+    broadcast = CountingBroadcast()
+    start = time.perf_counter()
+    actions_count = asyncio.run(play(*args, broadcast))
+    elapsed = time.perf_counter() - start
+    print(f'  {label:<22} {elapsed / actions_count * 1e6:8.2f} us/action'
+          f' {broadcast.frames_count / actions_count:6.2f} frames/action'
+          f' {broadcast.bytes_count / actions_count:8.0f} bytes/action')
+
+
+def benchmark(games_count: int) -> None:
+    print(f'{games_count} games of {PLAYERS_COUNT} players,'
+          f' {SUBSCRIBERS_COUNT} subscribers each')
+    measure('inline', play_inline, games_count)
+    measure('actor, per tick', lambda count, broadcast:
+            play_actor(count, broadcast, 0.0), games_count)
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else GAMES_COUNT)
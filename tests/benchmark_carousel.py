@@ -0,0 +1,56 @@
+import sys
+from typing import Any, Callable, List
+
+from superego.game.datatypes import Carousel
+from tests.utils import create_cards, time_per_call
+
+CARDS_COUNT = 100_000
+ROTATIONS_COUNT = 10_000
+REMOVALS_COUNT = 1_000
+
+
+class ListCarousel:
+    def __init__(self, initial_items: List[Any] = None):
+        self._items: List[Any] = list(initial_items)
+
+    def pop_push(self) -> Any:
+        item = self._items.pop(0)
+        self._items.append(item)
+        return item
+
+    def find_remove(self, criteria: Callable) -> None:
+        self._items = [item for item in self._items if not criteria(item)]
+
+    @property
+    def front(self) -> Any:
+        return self._items[0]
+
+
+def benchmark(cards_count: int) -> None:
+    cards = create_cards(cards_count)
+
+    list_carousel = ListCarousel(cards)
+    ring_carousel = Carousel(cards)
+    print(f'Deck of {cards_count} cards')
+    print(f'  rotate (list): {time_per_call(list_carousel.pop_push, ROTATIONS_COUNT):10.3f} us')
+    print(f'  rotate (ring): {time_per_call(ring_carousel.pop_push, ROTATIONS_COUNT):10.3f} us')
+    print(f'  front (list):  {time_per_call(lambda: list_carousel.front, ROTATIONS_COUNT):10.3f} us')
+    print(f'  front (ring):  {time_per_call(lambda: ring_carousel.front, ROTATIONS_COUNT):10.3f} us')
+
+    step = cards_count // REMOVALS_COUNT
+    seats = iter(range(0, cards_count, step))
+    removed_cards = iter(cards[::step])
+
+    def remove_from_list_carousel() -> None:
+        card = next(removed_cards)
+        list_carousel.find_remove(lambda item: item is card)
+
+    def remove_from_ring_carousel() -> None:
+        ring_carousel.remove(next(seats))
+
+    print(f'  remove (list): {time_per_call(remove_from_list_carousel, REMOVALS_COUNT):10.3f} us')
+    print(f'  remove (ring): {time_per_call(remove_from_ring_carousel, REMOVALS_COUNT):10.3f} us')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else CARDS_COUNT)
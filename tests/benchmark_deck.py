@@ -0,0 +1,33 @@
+import random
+import sys
+
+from superego.game.datatypes import Carousel
+from superego.game.game import Deck
+from tests.utils import create_cards, time_per_call
+
+CARDS_COUNT = 100_000
+SWAPS_COUNT = 1_000
+SEED = 2023
+
+
+def benchmark(cards_count: int) -> None:
+    cards = create_cards(cards_count)
+    rng = random.Random(SEED)
+    carousel = Carousel(cards)
+
+    def swap_with_reshuffle() -> None:
+        nonlocal carousel
+        carousel.pop_push()
+        rng.shuffle(cards)
+        carousel = Carousel(cards)
+
+    deck = Deck('Benchmark deck', cards, random.Random(SEED))
+
+    print(f'Deck of {cards_count} cards')
+    print(f'  swap (reshuffle): {time_per_call(swap_with_reshuffle, SWAPS_COUNT):12.3f} us')
+    print(f'  swap (lazy draw): {time_per_call(deck.advance_card, SWAPS_COUNT):12.3f} us')
+    print(f'  new game deck:    {time_per_call(lambda: Deck("Deck", cards, random.Random(SEED)), SWAPS_COUNT):12.3f} us')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else CARDS_COUNT)
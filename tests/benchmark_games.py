@@ -0,0 +1,87 @@
+import random
+import sys
+import time
+from uuid import UUID
+
+from superego.application.interfaces import GameServer
+from superego.game.game import Game, GamePhaseName, Guess
+from superego.infrastructure.http.server import GameServerPool
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    random_answer, random_guess
+
+PLAYERS_COUNT = 6
+ROUNDS_PER_PLAYER = 1000
+ACTIONS_COUNT = 100_000
+
+
+class InProcessGameServer(GameServer):
+    def __init__(self, guid: UUID, game: Game):
+        self._guid = guid
+        self.game = game
+
+    def run(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    @property
+    def address(self):
+        return str(self._guid)
+
+    @property
+    def guid(self) -> UUID:
+        return self._guid
+
+
+def populate_pool(games_count: int) -> GameServerPool:
+    pool = GameServerPool()
+    for _ in range(games_count):
+        lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+        game = Game(lobby, ArtificialClock(), ObserverStub())
+        pool.store(InProcessGameServer(lobby.guid, game))
+    return pool
+
+
+def restart_game(game_server: InProcessGameServer) -> None:
+    lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+    game_server.game = Game(lobby, ArtificialClock(), ObserverStub())
+
+
+def play_one_action(game: Game) -> None:
+    state = game.state
+    players = zip(game.players, state.player_states)
+    if state.phase == GamePhaseName.ANSWER_PHASE:
+        game.answer(game.current_player, random_answer())
+    elif state.phase == GamePhaseName.GUESS_PHASE:
+        player = next(player for player, player_state in players
+                      if player_state.awaited_to_guess)
+        guess = random_guess()
+        game.guess(player, Guess(answer=guess.answer,
+                                 bet=min(guess.bet, player.points)))
+    elif state.phase == GamePhaseName.RESULT_PHASE:
+        player = next(player for player, player_state in players
+                      if not player_state.ready)
+        game.mark_ready(player)
+
+
+def measure(games_count: int) -> float:
+    pool = populate_pool(games_count)
+    guids = [game_server.guid for game_server in pool.all]
+    random.seed(games_count)
+    start = time.perf_counter()
+    for _ in range(ACTIONS_COUNT):
+        game_server = pool.get(random.choice(guids))
+        if game_server.game.over:
+            restart_game(game_server)
+        play_one_action(game_server.game)
+    elapsed = time.perf_counter() - start
+    return elapsed / ACTIONS_COUNT * 1e6
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, 100, 1000, 5000]
+    for count in counts:
+        microseconds = measure(count)
+        print(f'{count:>6} games x {PLAYERS_COUNT} players:'
+              f' {microseconds:8.2f} us/action')
@@ -0,0 +1,137 @@
+import os
+import sys
+import tempfile
+import time
+import timeit
+import uuid
+from typing import AbstractSet, Callable, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import Engine
+
+from superego.game.datatypes import Carousel
+from superego.game.game import LobbyMember, Player, PlayersPool
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.storage import DataBasePersonStorage
+
+PEOPLE_COUNT = 200000
+INSERT_BATCH = 100000
+PLAYERS_COUNT = 6
+ACTIONS_COUNT = 1000000
+
+LEGACY_SCHEMA = (
+    'CREATE TABLE person (id INTEGER NOT NULL, guid VARCHAR(36) NOT NULL,'
+    ' name VARCHAR(64) NOT NULL, PRIMARY KEY (id))',
+    'CREATE UNIQUE INDEX ix_person_guid ON person (guid)',
+    'CREATE INDEX ix_person_name ON person (name)',
+    'PRAGMA user_version = 2'
+)
+
+
+def create_legacy(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.exec_driver_sql(statement)
+
+
+def populate(engine: Engine, guids: List[UUID], as_text: bool) -> None:
+    with engine.begin() as connection:
+        for start in range(0, len(guids), INSERT_BATCH):
+            rows = [(str(guid) if as_text else guid.bytes, f'person{number}')
+                    for number, guid in enumerate(
+                        guids[start:start + INSERT_BATCH], start)]
+            connection.exec_driver_sql(
+                'INSERT INTO person (guid, name) VALUES (?, ?)', rows)
+
+
+def load_legacy(engine: Engine) -> Dict[str, UUID]:
+    with engine.connect() as connection:
+        result = connection.exec_driver_sql('SELECT name, guid FROM person')
+        return {name: UUID(guid) for name, guid in result}
+
+
+def load(engine: Engine) -> Dict[str, UUID]:
+    with engine.connect() as connection:
+        return DataBasePersonStorage(connection).retrieve_all()
+
+
+def measure_storage(label: str, directory: str, guids: List[UUID],
+                    prepare: Callable[[Engine], None], as_text: bool,
+                    load_all: Callable[[Engine], Dict[str, UUID]]) -> None:
+    filename = os.path.join(directory, f'{label}.db')
+    engine = get_db(get_connection_string(filename))
+    prepare(engine)
+    populate(engine, guids, as_text)
+    start = time.perf_counter()
+    people = load_all(engine)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    size = os.path.getsize(filename)
+    print(f'  {label:<8} {size / 2 ** 20:7.1f} MiB'
+          f' {size / len(guids):6.1f} B/person'
+          f'  retrieve_all {elapsed * 1e3:7.1f} ms ({len(people)} rows)')
+
+
+class LegacyPlayersPool:
+    def __init__(self, players: List[Player]):
+        self.players: Dict[UUID, Player] = {player.guid: player
+                                            for player in players}
+        self.carousel: Carousel = Carousel(players)
+        self.guessing: Set[UUID] = set(self.players)
+        self.guessing.discard(self.carousel.front.guid)
+
+    def advance_player(self) -> None:
+        previous_player = self.carousel.pop_push()
+        self.guessing.add(previous_player.guid)
+        self.guessing.discard(self.carousel.front.guid)
+
+    def get_player(self, guid: UUID) -> Optional[Player]:
+        return self.players.get(guid)
+
+    @property
+    def guessing_players_guids(self) -> AbstractSet[UUID]:
+        return self.guessing
+
+
+def benchmark_storage(count: int) -> None:
+    guids = [uuid.uuid4() for _ in range(count)]
+    print(f'{count} people')
+    with tempfile.TemporaryDirectory() as directory:
+        measure_storage('text', directory, guids, create_legacy, True,
+                        load_legacy)
+        measure_storage('blob', directory, guids, migrate, False, load)
+
+
+def benchmark_actions() -> None:
+    players = [Player(LobbyMember(f'player{seat}'), seat)
+               for seat in range(PLAYERS_COUNT)]
+    legacy = LegacyPlayersPool(players)
+    pool = PlayersPool(players)
+    issuer = players[-1].guid
+
+    def legacy_guess() -> None:
+        if issuer in legacy.guessing_players_guids:
+            legacy.get_player(issuer)
+
+    def seat_guess() -> None:
+        player = pool.get_player(issuer)
+        if player is not None:
+            pool.is_guessing(player)
+
+    print(f'{ACTIONS_COUNT} actions, {PLAYERS_COUNT} players')
+    for label, legacy_action, seat_action in (
+            ('guess lookup', legacy_guess, seat_guess),
+            ('advance', legacy.advance_player, pool.advance_player)):
+        legacy_cost = timeit.timeit(legacy_action, number=ACTIONS_COUNT)
+        seat_cost = timeit.timeit(seat_action, number=ACTIONS_COUNT)
+        print(f'  {label:<14}'
+              f' UUID keys {legacy_cost / ACTIONS_COUNT * 1e9:6.0f} ns'
+              f'  seats {seat_cost / ACTIONS_COUNT * 1e9:6.0f} ns')
+
+
+if __name__ == '__main__':
+    benchmark_storage(int(sys.argv[1]) if len(sys.argv) > 1
+                      else PEOPLE_COUNT)
+    benchmark_actions()
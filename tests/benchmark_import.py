@@ -0,0 +1,74 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from superego.application.usecases import AddCardUseCase, AddCardsUseCase
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.importer import CardImport, \
+    ImportFormat
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.storage import DataBaseCardStorage
+
+CARDS_COUNT = 5000
+CHUNK_SIZE = 1000
+
+
+def create_ndjson(count: int) -> bytes:
+    return ''.join(json.dumps({'question': f'Question number {number}?',
+                               'answer_a': 'a', 'answer_b': 'b',
+                               'answer_c': 'c'}) + '\n'
+                   for number in range(count)).encode()
+
+
+def import_one_by_one(storage: DataBaseCardStorage, data: bytes) -> int:
+    add_card = AddCardUseCase(storage)
+    for line in io.BytesIO(data):
+        record = json.loads(line)
+        add_card(question=record['question'], answer_A=record['answer_a'],
+                 answer_B=record['answer_b'], answer_C=record['answer_c'])
+    return CARDS_COUNT
+
+
+def import_in_chunks(storage: DataBaseCardStorage, data: bytes) -> int:
+    add_cards = AddCardsUseCase(storage)
+    card_import = CardImport(ImportFormat.NDJSON, CHUNK_SIZE)
+    for line in io.BytesIO(data):
+        chunk = card_import.feed(line)
+        if chunk:
+            add_cards(chunk.cards)
+            card_import.chunk_stored(chunk)
+    chunk = card_import.finish()
+    if chunk:
+        add_cards(chunk.cards)
+        card_import.chunk_stored(chunk)
+    return card_import.report.imported
+
+
+def measure(label: str, import_, data: bytes) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_db(get_connection_string(
+            os.path.join(directory, 'benchmark.db')))
+        migrate(engine)
+        with engine.connect() as connection:
+            start = time.perf_counter()
+            imported = import_(DataBaseCardStorage(connection), data)
+            elapsed = time.perf_counter() - start
+        engine.dispose()
+    print(f'  {label:<20} {elapsed:7.2f} s {imported / elapsed:9.0f} cards/s')
+
+
+def benchmark() -> None:
+    data = create_ndjson(CARDS_COUNT)
+    print(f'{CARDS_COUNT} cards, {len(data) / 1024:.0f} kB of NDJSON')
+    measure('one by one', import_one_by_one, data)
+    measure(f'chunks of {CHUNK_SIZE}', import_in_chunks, data)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        CARDS_COUNT = int(sys.argv[1])
+    benchmark()
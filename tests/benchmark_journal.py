@@ -0,0 +1,78 @@
+import random
+import sys
+import tempfile
+import time
+
+from superego.game.game import Game, GameRecorder, Guess
+from superego.infrastructure.journal.journal import Journal, JournalConfig
+from superego.infrastructure.journal.recorder import JournalGameRecorder
+from superego.infrastructure.journal.recovery import recover_games
+from tests.test_deck import test_cards
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    random_answer, random_guess
+
+PLAYERS_COUNT = 6
+ROUNDS_PER_PLAYER = 20
+GAMES_COUNT = 200
+
+
+def play_games(games_count: int, journal: Journal = None) -> int:
+    rng = random.Random(games_count)
+    actions_count = 0
+    for _ in range(games_count):
+        lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+        recorder: GameRecorder = JournalGameRecorder(journal, lobby.guid) \
+            if journal else None
+        game = Game(lobby, ArtificialClock(), ObserverStub(), recorder)
+        while not game.over:
+            game.answer(game.current_player, random_answer(rng))
+            guessing_players = game.guessing_players
+            for player in guessing_players:
+                guess = random_guess(rng)
+                game.guess(player, Guess(answer=guess.answer,
+                                         bet=min(guess.bet, player.points)))
+            players = game.players
+            for player in players:
+                game.mark_ready(player)
+            actions_count += 1 + len(guessing_players) + len(players)
+    return actions_count
+
+
+def time_per_action(games_count: int, journal: Journal = None) -> float:
+    start = time.perf_counter()
+    actions_count = play_games(games_count, journal)
+    elapsed = time.perf_counter() - start
+    return elapsed / actions_count * 1e6
+
+
+def benchmark(games_count: int) -> None:
+    plain = time_per_action(games_count)
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory))
+        journal.start()
+        journaled = time_per_action(games_count, journal)
+        journal.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        crashed = Journal(JournalConfig(directory, snapshot_interval=1000))
+        crashed.start()
+        lobby = create_test_lobby(PLAYERS_COUNT, 1000)
+        game = Game(lobby, ArtificialClock(), ObserverStub(),
+                    JournalGameRecorder(crashed, lobby.guid))
+        for _ in range(999):
+            game.change_card(game.current_player)
+        crashed.sync()
+        start = time.perf_counter()
+        recover_games(directory, test_cards)
+        recovery = time.perf_counter() - start
+        crashed.close()
+
+    print(f'{games_count} games of {PLAYERS_COUNT} players')
+    print(f'  action without journal: {plain:8.2f} us')
+    print(f'  action with journal:    {journaled:8.2f} us'
+          f' (+{journaled - plain:.2f} us)')
+    print(f'  recovery of 999 journaled actions: {recovery * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else GAMES_COUNT)
@@ -0,0 +1,57 @@
+import gc
+import random
+import sys
+import tracemalloc
+from typing import List
+
+from superego.game.game import Game, Guess
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    random_answer, random_guess
+
+PLAYERS_COUNTS = (6, 9)
+ROUNDS_PER_PLAYER = 10
+GAMES_COUNT = 10_000
+
+
+def start_game(players_count: int, rng: random.Random) -> Game:
+    lobby = create_test_lobby(players_count, ROUNDS_PER_PLAYER)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    game.answer(game.current_player, random_answer(rng))
+    for player in game.guessing_players:
+        guess = random_guess(rng)
+        game.guess(player, Guess(answer=guess.answer,
+                                 bet=min(guess.bet, player.points)))
+    for player in game.players:
+        game.mark_ready(player)
+    game.answer(game.current_player, random_answer(rng))
+    for player in game.guessing_players[1:]:
+        game.guess(player, random_guess(rng))
+    return game
+
+
+def bytes_per_game(players_count: int, games_count: int) -> float:
+    rng = random.Random(players_count)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    games: List[Game] = [start_game(players_count, rng)
+                         for _ in range(games_count)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat
+                    in after.compare_to(before, 'filename'))
+    del games
+    return allocated / games_count
+
+
+def benchmark(games_count: int) -> None:
+    print(f'{games_count} live games in the guess phase of round 2')
+    for players_count in PLAYERS_COUNTS:
+        size = bytes_per_game(players_count, games_count)
+        print(f'  {players_count} players: {size:10.0f} bytes per game'
+              f' ({size * 10_000 / 2 ** 20:.1f} MiB per 10k games)')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else GAMES_COUNT)
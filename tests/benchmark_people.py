@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from typing import Callable, List
+
+from sqlalchemy import Engine, insert
+
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.storage import DataBasePersonStorage
+from superego.infrastructure.database.tables import person
+
+PEOPLE_COUNT = 1000000
+LOOKUPS_COUNT = 50
+PLAYERS_COUNT = 6
+INSERT_BATCH = 100000
+
+
+def populate(engine: Engine, count: int) -> List[uuid.UUID]:
+    guids = [uuid.uuid4() for _ in range(count)]
+    with engine.begin() as connection:
+        for start in range(0, count, INSERT_BATCH):
+            batch = guids[start:start + INSERT_BATCH]
+            connection.execute(insert(person), [
+                {'guid': guid, 'name': f'person{number}'}
+                for number, guid in enumerate(batch, start)])
+    return guids
+
+
+def drop_indexes(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.exec_driver_sql('DROP INDEX IF EXISTS ix_person_guid')
+        connection.exec_driver_sql('DROP INDEX IF EXISTS ix_person_name')
+        connection.exec_driver_sql('PRAGMA user_version = 1')
+
+
+def timed(operation: Callable[[int], None]) -> float:
+    start = time.perf_counter()
+    for number in range(LOOKUPS_COUNT):
+        operation(number)
+    return (time.perf_counter() - start) / LOOKUPS_COUNT * 1e3
+
+
+def measure(label: str, engine: Engine, guids: List[uuid.UUID],
+            rng: random.Random) -> None:
+    names = [f'person{rng.randrange(len(guids))}'
+             for _ in range(LOOKUPS_COUNT)]
+    players = [rng.sample(guids, PLAYERS_COUNT)
+               for _ in range(LOOKUPS_COUNT)]
+    missing = [uuid.uuid4() for _ in range(LOOKUPS_COUNT)]
+    with engine.connect() as connection:
+        storage = DataBasePersonStorage(connection)
+        by_name = timed(lambda number: storage.retrieve_guid(names[number]))
+        many = timed(lambda number: storage.retrieve_many(players[number]))
+        remove = timed(lambda number: storage.remove(missing[number]))
+    print(f'  {label:<10} retrieve_guid {by_name:8.3f} ms'
+          f'  retrieve_many({PLAYERS_COUNT}) {many:8.3f} ms'
+          f'  remove {remove:8.3f} ms')
+
+
+def benchmark(count: int) -> None:
+    rng = random.Random(count)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = get_db(get_connection_string(
+            os.path.join(directory, 'benchmark.db')))
+        migrate(engine)
+        drop_indexes(engine)
+        start = time.perf_counter()
+        guids = populate(engine, count)
+        print(f'{count} people inserted in'
+              f' {time.perf_counter() - start:.1f} s')
+        measure('before', engine, guids, rng)
+        start = time.perf_counter()
+        applied = migrate(engine)
+        print(f'  migration {applied[-1].version} applied in'
+              f' {time.perf_counter() - start:.1f} s')
+        measure('after', engine, guids, rng)
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else PEOPLE_COUNT)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import aiohttp
+from aiohttp import web
+from sqlalchemy import insert
+
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.tables import person
+from superego.infrastructure.http.server import create_app
+from tests.utils import format_latencies
+
+HTTP_PORT = 18081
+PEOPLE_COUNT = 10000
+CLIENTS_COUNT = 32
+WRITES_RATIO = 0.2
+DURATION = 5.0
+
+DEFAULT_RUNTIME = {'journal_mode': 'delete', 'synchronous': 'full',
+                   'cache_size': -2000, 'mmap_size': 0,
+                   'statement_cache_size': 128, 'readers': 1}
+TUNED_RUNTIME = {'journal_mode': 'wal', 'synchronous': 'normal',
+                 'cache_size': -16384, 'mmap_size': 256 * 1024 * 1024,
+                 'statement_cache_size': 256, 'readers': 4}
+
+Latencies = Dict[str, List[float]]
+
+
+def create_database(filename: str) -> None:
+    engine = get_db(get_connection_string(filename))
+    migrate(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(person), [
+            {'name': f'person{number}'} for number in range(PEOPLE_COUNT)])
+    engine.dispose()
+
+
+async def request(session: aiohttp.ClientSession, method: str, path: str,
+                  latencies: List[float], **kwargs) -> None:
+    start = time.perf_counter()
+    async with session.request(
+            method, f'http://127.0.0.1:{HTTP_PORT}{path}', **kwargs) \
+            as response:
+        await response.read()
+        if response.status >= 500:
+            raise RuntimeError(f'{method} {path}: {response.status}')
+    latencies.append(time.perf_counter() - start)
+
+
+async def client(session: aiohttp.ClientSession, number: int, stop: float,
+                 latencies: Latencies) -> None:
+    rng = random.Random(number)
+    added = 0
+    while time.time() < stop:
+        if rng.random() < WRITES_RATIO:
+            name = f'client{number}-{added}'
+            added += 1
+            await request(session, 'POST', '/people', latencies['write'],
+                          data=json.dumps({'name': name}))
+            await request(session, 'DELETE', f'/people?name={name}',
+                          latencies['write'])
+        else:
+            name = f'person{rng.randrange(PEOPLE_COUNT)}'
+            await request(session, 'GET', f'/people?name={name}',
+                          latencies['read'])
+
+
+async def load(stop: float) -> Latencies:
+    latencies = {'read': list(), 'write': list()}
+    connector = aiohttp.TCPConnector(limit=CLIENTS_COUNT)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*[client(session, number, stop, latencies)
+                               for number in range(CLIENTS_COUNT)])
+    return latencies
+
+
+def run_clients(stop: float, results: multiprocessing.Queue) -> None:
+    results.put(asyncio.run(load(stop)))
+
+
+async def serve(filename: str, runtime: Dict) -> Latencies:
+    app = create_app({
+        'sqlite': {'filename': filename, **runtime},
+        'http': {'host': '127.0.0.1', 'port': HTTP_PORT},
+        'websockets': {'host': '127.0.0.1', 'port': HTTP_PORT + 1,
+                       'encoding': 'utf-8'},
+        'game': {'rounds': 10},
+    })
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', HTTP_PORT).start()
+    results = multiprocessing.Queue()
+    clients = multiprocessing.Process(
+        target=run_clients, args=(time.time() + DURATION, results))
+    try:
+        clients.start()
+        loop = asyncio.get_running_loop()
+        latencies = await loop.run_in_executor(None, results.get)
+        await loop.run_in_executor(None, clients.join)
+    finally:
+        await runner.cleanup()
+    return latencies
+
+
+def summarize(kind: str, latencies: List[float]) -> str:
+    return f'{kind} {len(latencies) / DURATION:6.0f}/s' \
+           f' {format_latencies(latencies)}'
+
+
+def measure(label: str, runtime: Dict) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'benchmark.db')
+        create_database(filename)
+        latencies = asyncio.run(serve(filename, runtime))
+    print(f'  {label:<8} {summarize("reads", latencies["read"])}'
+          f'  {summarize("writes", latencies["write"])}')
+
+
+def benchmark() -> None:
+    print(f'{CLIENTS_COUNT} clients, {WRITES_RATIO:.0%} writes,'
+          f' {PEOPLE_COUNT} people, {DURATION:.0f} s each')
+    measure('default', DEFAULT_RUNTIME)
+    measure('tuned', TUNED_RUNTIME)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        DURATION = float(sys.argv[1])
+    benchmark()
@@ -0,0 +1,43 @@
+import sys
+
+from superego.game.game import Game, Answer
+from superego.infrastructure.websockets.delta import compute_game_state_delta
+from superego.infrastructure.websockets.protocol import JSON_CODEC, \
+    BINARY_CODEC
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    time_per_call
+
+CALLS_COUNT = 20_000
+
+
+def frame_size(frame) -> int:
+    if isinstance(frame, str):
+        return len(frame.encode('utf-8'))
+    return len(frame)
+
+
+def benchmark(players_count: int) -> None:
+    game = Game(create_test_lobby(players_count, 1), ArtificialClock(),
+                ObserverStub())
+    previous_state = game.state
+    game.answer(game.current_player, Answer.ANSWER_A)
+    state = game.state
+    delta = compute_game_state_delta(previous_state, state)
+
+    print(f'{players_count} players')
+    for name, codec in (('json', JSON_CODEC), ('binary', BINARY_CODEC)):
+        state_frame = codec.encode_game_state(state)
+        delta_frame = codec.encode_game_state_delta(delta)
+        state_time = time_per_call(lambda: codec.encode_game_state(state),
+                                   CALLS_COUNT)
+        delta_time = time_per_call(lambda: codec.encode_game_state_delta(delta),
+                                   CALLS_COUNT)
+        print(f'  {name:<6} state: {frame_size(state_frame):5d} B'
+              f' {state_time:7.2f} us'
+              f' | delta: {frame_size(delta_frame):5d} B {delta_time:7.2f} us')
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or [6, 9]
+    for count in counts:
+        benchmark(count)
@@ -0,0 +1,70 @@
+import random
+import sys
+import tempfile
+import time
+
+from superego.game.game import Game, Guess
+from superego.infrastructure.journal.journal import Journal, JournalConfig
+from superego.infrastructure.journal.recorder import JournalGameRecorder
+from superego.infrastructure.journal.replay import ReplayEngine
+from tests.test_deck import test_cards
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    random_answer, random_guess
+
+PLAYERS_COUNT = 6
+ROUNDS_PER_PLAYER = 1
+GAMES_COUNT = 2000
+
+
+def journal_games(journal: Journal, games_count: int) -> int:
+    rng = random.Random(games_count)
+    actions_count = 0
+    for _ in range(games_count):
+        lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+        game = Game(lobby, ArtificialClock(), ObserverStub(),
+                    JournalGameRecorder(journal, lobby.guid))
+        while not game.over:
+            game.answer(game.current_player, random_answer(rng))
+            for player in game.guessing_players:
+                guess = random_guess(rng)
+                game.guess(player, Guess(answer=guess.answer,
+                                         bet=min(guess.bet, player.points)))
+            for player in game.players:
+                game.mark_ready(player)
+        actions_count += game.version
+    return actions_count
+
+
+def benchmark(games_count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory))
+        journal.start()
+        actions_count = journal_games(journal, games_count)
+        journal.close()
+
+        start = time.perf_counter()
+        engine = ReplayEngine.from_directory(directory, test_cards)
+        indexed = time.perf_counter() - start
+        games = engine.games
+        start = time.perf_counter()
+        for game_guid in games:
+            engine.replay(game_guid)
+        replayed = time.perf_counter() - start
+        start = time.perf_counter()
+        for game_guid in games:
+            engine.replay(game_guid, engine.last_action_index(game_guid) // 2)
+        halfway = time.perf_counter() - start
+        engine.close()
+
+    total = indexed + replayed
+    print(f'{games_count} games of {PLAYERS_COUNT} players,'
+          f' {actions_count / games_count:.1f} actions per game')
+    print(f'  index journal:       {indexed * 1e3:8.2f} ms')
+    print(f'  replay to the end:   {replayed * 1e3:8.2f} ms'
+          f' ({replayed / actions_count * 1e6:.2f} us per action)')
+    print(f'  replay to halfway:   {halfway * 1e3:8.2f} ms')
+    print(f'  games per minute:    {games_count / total * 60:8.0f}')
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else GAMES_COUNT)
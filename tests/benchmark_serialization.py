@@ -0,0 +1,48 @@
+import sys
+
+from superego.game.game import Game, Answer
+from superego.infrastructure.websockets.delta import compute_game_state_delta
+from superego.infrastructure.websockets.feedback import Feedback, Status
+from superego.infrastructure.websockets.serialization import \
+    serialize_game_state, serialize_game_state_delta, serialize_confirmation
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    time_per_call, serialize_feedback
+
+CALLS_COUNT = 20_000
+
+
+def benchmark(players_count: int) -> None:
+    game = Game(create_test_lobby(players_count, 1), ArtificialClock(),
+                ObserverStub())
+    previous_state = game.state
+    game.answer(game.current_player, Answer.ANSWER_A)
+    state = game.state
+    delta = compute_game_state_delta(previous_state, state)
+
+    state_feedback = Feedback(Status.GAME_STATE, state)
+    delta_feedback = Feedback(Status.GAME_STATE_DELTA, delta)
+    confirmation_feedback = Feedback(Status.ACKNOWLEDGED, None)
+    assert serialize_game_state(state) == serialize_feedback(state_feedback)
+    assert serialize_game_state_delta(delta) == serialize_feedback(delta_feedback)
+
+    cases = (
+        ('state', lambda: serialize_feedback(state_feedback),
+         lambda: serialize_game_state(state)),
+        ('delta', lambda: serialize_feedback(delta_feedback),
+         lambda: serialize_game_state_delta(delta)),
+        ('ack', lambda: serialize_feedback(confirmation_feedback),
+         serialize_confirmation),
+    )
+    print(f'{players_count} players')
+    for name, generic, fast in cases:
+        generic_time = time_per_call(generic, CALLS_COUNT)
+        fast_time = time_per_call(fast, CALLS_COUNT)
+        print(f'  {name:<6} generic: {generic_time:8.2f} us'
+              f'  fast: {fast_time:8.2f} us'
+              f'  ({generic_time / fast_time:5.1f}x)')
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or [6, 9]
+    for count in counts:
+        benchmark(count)
@@ -0,0 +1,167 @@
+import asyncio
+import random
+import sys
+import time
+from typing import Callable, List
+
+from websockets.legacy.protocol import State
+
+from superego.game.game import Game
+from superego.infrastructure.websockets.events import Event
+from superego.infrastructure.websockets.broadcast import Broadcast, \
+    SpectatorBroadcast, WebSocketsBroadcast
+from superego.infrastructure.websockets.frames import GameStateFrameCache
+from superego.infrastructure.websockets.gameserver import GameActor, \
+    WebSocketsGameObserver
+from superego.infrastructure.websockets.protocol import Codec, Frame, \
+    JSON_CODEC
+from tests.benchmark_actor import create_router, round_bursts
+from tests.utils import create_test_lobby, ArtificialClock, \
+    format_latencies
+
+PLAYERS_COUNT = 6
+ROUNDS_PER_PLAYER = 2
+SPECTATORS_COUNT = 10000
+BATCH_SIZE = 256
+DRAIN_TIME = 0.5
+ACTION_INTERVAL = 0.002
+
+
+class Traffic:
+    def __init__(self):
+        self.frames_count = 0
+        self.bytes_count = 0
+
+    def count(self, data: Frame) -> None:
+        self.frames_count += 1
+        self.bytes_count += len(data)
+
+
+class TransportStub:
+    def get_write_buffer_size(self) -> int:
+        return 0
+
+
+class ViewerStub:
+    subprotocol = None
+    state = State.OPEN
+    closed = False
+    transport = TransportStub()
+    _fragmented_message_waiter = None
+
+    def __init__(self, traffic: Traffic):
+        self._traffic: Traffic = traffic
+
+    def write_frame_sync(self, fin: bool, opcode: int, data: bytes) -> None:
+        self._traffic.count(data)
+
+    async def send(self, message: Frame) -> None:
+        self._traffic.count(message)
+
+    async def wait_closed(self) -> None:
+        await asyncio.get_running_loop().create_future()
+
+
+class EncodeCounter:
+    def __init__(self):
+        self.encodes_count = 0
+
+    def wrap(self, encode: Callable[[Codec], Frame]
+             ) -> Callable[[Codec], Frame]:
+        def counted(codec: Codec) -> Frame:
+            self.encodes_count += 1
+            return encode(codec)
+        return counted
+
+
+class CountingObserver(WebSocketsGameObserver):
+    def __init__(self, players: Broadcast, spectators: Broadcast,
+                 encodes: EncodeCounter):
+        super().__init__(_CountedBroadcast(players, encodes),
+                         GameStateFrameCache(),
+                         _CountedBroadcast(spectators, encodes))
+
+
+class _CountedBroadcast(Broadcast):
+    def __init__(self, broadcast: Broadcast, encodes: EncodeCounter):
+        self._broadcast: Broadcast = broadcast
+        self._encodes: EncodeCounter = encodes
+
+    async def add_listener(self, websocket, snapshot: Frame,
+                           confirmation: Frame = None) -> None:
+        await self._broadcast.add_listener(websocket, snapshot,
+                                           confirmation)
+
+    def remove_listener(self, websocket) -> None:
+        self._broadcast.remove_listener(websocket)
+
+    def broadcast(self, encode: Callable[[Codec], Frame],
+                  snapshot: Callable[[Codec], Frame]) -> None:
+        self._broadcast.broadcast(self._encodes.wrap(encode),
+                                  self._encodes.wrap(snapshot))
+
+
+async def play(spectators: Broadcast, traffic: Traffic,
+               encodes: EncodeCounter) -> List[float]:
+    rng = random.Random(SPECTATORS_COUNT)
+    players = WebSocketsBroadcast()
+    lobby = create_test_lobby(PLAYERS_COUNT, ROUNDS_PER_PLAYER)
+    game = Game(lobby, ArtificialClock(), None)
+    for _ in range(PLAYERS_COUNT):
+        await players.add_listener(ViewerStub(traffic),
+                                   JSON_CODEC.encode_game_state(game.state))
+    for _ in range(SPECTATORS_COUNT):
+        await spectators.add_listener(
+            ViewerStub(traffic), JSON_CODEC.encode_game_state(game.state))
+    observer = CountingObserver(players, spectators, encodes)
+    actor = GameActor(game, create_router(game), observer)
+    actor.start()
+    websocket = ViewerStub(traffic)
+    latencies = list()
+
+    async def act(event: Event, scheduled: float) -> None:
+        await actor.route(event, websocket)
+        latencies.append(time.perf_counter() - scheduled)
+
+    scheduled = time.perf_counter()
+    while not game.over:
+        for burst in round_bursts(game, rng):
+            actions = list()
+            for event in burst:
+                scheduled += ACTION_INTERVAL
+                await asyncio.sleep(max(0.0,
+                                        scheduled - time.perf_counter()))
+                actions.append(asyncio.ensure_future(act(event, scheduled)))
+            await asyncio.gather(*actions)
+            scheduled = max(scheduled, time.perf_counter())
+    await asyncio.sleep(DRAIN_TIME)
+    actor.stop()
+    return latencies
+
+
+def measure(label: str, spectators: Callable[[], Broadcast]) -> None:
+    traffic = Traffic()
+    encodes = EncodeCounter()
+    start = time.perf_counter()
+    latencies = asyncio.run(play(spectators(), traffic, encodes))
+    elapsed = time.perf_counter() - start
+    print(f'  {label:<28} {elapsed:6.2f} s,'
+          f' action {format_latencies(latencies)},'
+          f' {encodes.encodes_count:5d} encodes,'
+          f' {traffic.frames_count:8d} frames')
+
+
+def benchmark() -> None:
+    print(f'{SPECTATORS_COUNT} spectators watching {PLAYERS_COUNT} players,'
+          f' one action every {ACTION_INTERVAL * 1e3:.0f} ms')
+    measure('as player subscribers', WebSocketsBroadcast)
+    measure('spectators, single batch',
+            lambda: SpectatorBroadcast(batch_size=SPECTATORS_COUNT))
+    measure(f'spectators, {BATCH_SIZE} per batch',
+            lambda: SpectatorBroadcast(batch_size=BATCH_SIZE))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        SPECTATORS_COUNT = int(sys.argv[1])
+    benchmark()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import aiohttp
+import websockets
+from aiohttp import web
+from sqlalchemy import Connection, insert
+
+from superego.infrastructure.database.dsn import get_connection_string
+from superego.infrastructure.database.engine import get_db
+from superego.infrastructure.database.executor import StorageExecutor, T
+from superego.infrastructure.database.migrations import migrate
+from superego.infrastructure.database.tables import card, person
+from superego.infrastructure.http.server import create_app, game_server_pool
+from tests.utils import format_latencies
+
+HTTP_PORT = 18080
+WEBSOCKETS_PORT = 18000
+PLAYERS_COUNT = 6
+CARDS_COUNT = 20
+WRITERS_COUNT = 16
+DURATION = 5.0
+
+
+class InlineStorageExecutor(StorageExecutor):
+    async def read(self, work: Callable[[Connection], T]) -> T:
+        return self.read_sync(work)
+
+    async def write(self, work: Callable[[Connection], T]) -> T:
+        return self.write_sync(work)
+
+
+def create_database(filename: str) -> None:
+    engine = get_db(get_connection_string(filename))
+    migrate(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(person), [
+            {'name': f'player{number}'} for number in range(PLAYERS_COUNT)])
+        connection.execute(insert(card), [
+            {'question': f'question {number}', 'answer_a': 'a',
+             'answer_b': 'b', 'answer_c': 'c'}
+            for number in range(CARDS_COUNT)])
+    engine.dispose()
+
+
+def create_config(filename: str) -> Dict:
+    return {
+        'sqlite': {'filename': filename},
+        'http': {'host': '127.0.0.1', 'port': HTTP_PORT},
+        'websockets': {'host': '127.0.0.1', 'port': WEBSOCKETS_PORT,
+                       'encoding': 'utf-8'},
+        'game': {'rounds': 10},
+    }
+
+
+async def hammer_cards(session: aiohttp.ClientSession, stop: float) -> int:
+    url = f'http://127.0.0.1:{HTTP_PORT}/cards'
+    body = json.dumps({'question': 'q' * 200, 'answer_a': 'a',
+                       'answer_b': 'b', 'answer_c': 'c'})
+    count = 0
+    while time.time() < stop:
+        async with session.post(url, data=body) as response:
+            await response.read()
+        count += 1
+    return count
+
+
+async def hammer(writers_count: int, stop: float) -> int:
+    async with aiohttp.ClientSession() as session:
+        counts = await asyncio.gather(*[hammer_cards(session, stop)
+                                        for _ in range(writers_count)])
+    return sum(counts)
+
+
+def run_writers(writers_count: int, stop: float, written) -> None:
+    written.value = asyncio.run(hammer(writers_count, stop))
+
+
+async def read_game_state(address: str, stop: float) -> List[float]:
+    latencies = list()
+    async with websockets.connect(f'ws://{address}') as websocket:
+        request = json.dumps({'action': 'READ', 'issuer': None})
+        while time.time() < stop:
+            start = time.perf_counter()
+            await websocket.send(request)
+            await websocket.recv()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.001)
+    return latencies
+
+
+async def play(filename: str, inline: bool, readers: int,
+               writers_count: int) -> Tuple[List[float], int]:
+    config = create_config(filename)
+    config['sqlite']['readers'] = readers
+    app = create_app(config)
+    engine = get_db(get_connection_string(filename))
+
+    async def replace_storage(app_: web.Application) -> None:
+        app_['storage'] = InlineStorageExecutor(engine, engine)
+
+    if inline:
+        app.on_startup.append(replace_storage)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', HTTP_PORT)
+    await site.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            base = f'http://127.0.0.1:{HTTP_PORT}'
+            async with session.get(f'{base}/people') as response:
+                people = list((await response.json()).values())
+            async with session.post(f'{base}/game', data=json.dumps(
+                    {'player_guids': people})) as response:
+                address = (await response.json())['address']
+            stop = time.time() + DURATION
+            written = multiprocessing.Value('l', 0)
+            writers = multiprocessing.Process(
+                target=run_writers, args=(writers_count, stop, written))
+            writers.start()
+            latencies = await read_game_state(address, stop)
+            await asyncio.get_running_loop().run_in_executor(
+                None, writers.join)
+    finally:
+        for game_server in game_server_pool.all:
+            game_server.stop()
+        game_server_pool.flush()
+        await runner.cleanup()
+        engine.dispose()
+    return latencies, written.value
+
+
+def measure(label: str, inline: bool, readers: int,
+            writers_count: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'benchmark.db')
+        create_database(filename)
+        latencies, written = asyncio.run(
+            play(filename, inline, readers, writers_count))
+    print(f'  {label:<26} websocket {format_latencies(latencies)},'
+          f' {written / DURATION:7.0f} cards/s')
+
+
+def benchmark() -> None:
+    print(f'{WRITERS_COUNT} concurrent POST /cards writers,'
+          f' {DURATION:.0f} s each')
+    measure('idle', False, 1, 0)
+    measure('inline storage', True, 1, WRITERS_COUNT)
+    for readers in (1, 4):
+        measure(f'executor, {readers} readers', False, readers,
+                WRITERS_COUNT)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        DURATION = float(sys.argv[1])
+    benchmark()
@@ -1,4 +1,7 @@
-from superego.infrastructure.websockets.gameserver import WebsocketsServerConfig
+import asyncio
+
+from superego.infrastructure.websockets.gameserver import WebsocketsServerConfig, \
+    WebSocketsListener
 from superego.infrastructure.websockets.creator\
     import assemble_websockets_server
 from superego.game.game import Lobby, LobbyMember, GameSettings
@@ -40,6 +43,12 @@ if __name__ == '__main__':
 
     config = WebsocketsServerConfig(host=HOST, port=PORT, encoding=ENCODING)
 
-    server = assemble_websockets_server(config, lobby)
+    async def serve_forever():
+        listener = WebSocketsListener(config)
+        await listener.start()
+        server = assemble_websockets_server(listener, lobby)
+        server.run()
+        logging.info(f'Game available at {server.address}')
+        await asyncio.Future()
 
-    server.run()
+    asyncio.run(serve_forever())
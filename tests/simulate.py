@@ -1,8 +1,9 @@
+import random
 import sys
 from datetime import datetime
 
 from tests.utils import create_test_lobby, random_answer, random_guess
-from superego.game.game import Game, GameObserver, Clock, GameState
+from superego.game.game import Game, GameObserver, Clock, GameState, Guess
 
 
 class PrintingObserver(GameObserver):
@@ -39,13 +40,20 @@ class SimpleClock(Clock):
         return datetime.now()
 
 
-if __name__ == '__main__':
-    players_count, rounds_per_player = int(sys.argv[1]), int(sys.argv[2])
-    lobby = create_test_lobby(players_count, rounds_per_player)
-    game = Game(lobby, SimpleClock(), PrintingObserver())
+def play(game: Game, rng: random.Random = random) -> None:
     while not game.over:
-        game.answer(game.current_player, random_answer())
+        game.answer(game.current_player, random_answer(rng))
         for guessing_player in game.guessing_players:
-            game.guess(guessing_player, random_guess())
+            guess = random_guess(rng)
+            game.guess(guessing_player,
+                       Guess(answer=guess.answer,
+                             bet=min(guess.bet, guessing_player.points)))
         for player in game.players:
             game.mark_ready(player)
+
+
+if __name__ == '__main__':
+    players_count, rounds_per_player = int(sys.argv[1]), int(sys.argv[2])
+    lobby = create_test_lobby(players_count, rounds_per_player)
+    game = Game(lobby, SimpleClock(), PrintingObserver())
+    play(game)
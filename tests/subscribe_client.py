@@ -1,5 +1,6 @@
 import asyncio
 import json
+import sys
 
 from websockets import connect
 
@@ -18,8 +19,10 @@ async def listen(uri):
         message = json.dumps(dict_)
         data = message.encode(ENCODING)
         await websocket.send(data)
-        response = await websocket.recv()
-        print(response)
+        confirmation = await websocket.recv()
+        print(confirmation)
+        snapshot = await websocket.recv()
+        print(snapshot)
         dict_ = {
             'action': 'READ',
             'issuer': '55ae1d15-3aa1-4277-90e1-fd711aad6d0d'
@@ -32,4 +35,5 @@ async def listen(uri):
 
 
 if __name__ == '__main__':
-    asyncio.run(listen(f'ws://{SERVER_HOST}:{SERVER_PORT}'))
+    game_guid = sys.argv[1]
+    asyncio.run(listen(f'ws://{SERVER_HOST}:{SERVER_PORT}/games/{game_guid}'))
@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from superego.game.game import Game
+from tests.simulate import play
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub
+
+PLAYER_COUNTS = list(range(2, 10))
+ROUND_FACTORS = [1, 2, 3, 5]
+GAMES_PER_CONFIGURATION = 10_000
+CHUNK_SIZE = 500
+
+GameResult = Tuple[int, int, int]
+
+
+@dataclass(init=True, frozen=True)
+class Chunk:
+    players_count: int
+    max_rounds_factor: int
+    index: int
+    games_count: int
+    seed: int
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return self.players_count, self.max_rounds_factor, self.index
+
+
+@dataclass(init=True)
+class ChunkSummary:
+    players_count: int
+    max_rounds_factor: int
+    index: int
+    games: int = 0
+    rounds: int = 0
+    exhausted_banks: int = 0
+    kicked_players: int = 0
+    games_with_kicks: int = 0
+
+    @property
+    def key(self) -> Tuple[int, int, int]:
+        return self.players_count, self.max_rounds_factor, self.index
+
+    def add(self, result: GameResult) -> None:
+        rounds, points_in_bank, kicked_players = result
+        self.games += 1
+        self.rounds += rounds
+        self.exhausted_banks += points_in_bank <= 0
+        self.kicked_players += kicked_players
+        self.games_with_kicks += kicked_players > 0
+
+
+def play_seeded_game(players_count: int, max_rounds_factor: int,
+                     seed: str) -> GameResult:
+    lobby = create_test_lobby(players_count, max_rounds_factor)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    play(game, random.Random(seed))
+    state = game.state
+    kicked_players = players_count - len(state.player_states)
+    return state.round_number, state.points_in_bank, kicked_players
+
+
+def play_chunk(chunk: Chunk) -> List[GameResult]:
+    first_game = chunk.index * chunk.games_count
+    return [play_seeded_game(chunk.players_count, chunk.max_rounds_factor,
+                             f'{chunk.seed}:{chunk.players_count}:'
+                             f'{chunk.max_rounds_factor}:{game}')
+            for game in range(first_game, first_game + chunk.games_count)]
+
+
+def plan_chunks(player_counts: List[int], round_factors: List[int],
+                games_count: int, chunk_size: int, seed: int
+                ) -> Iterator[Chunk]:
+    chunks_count = -(-games_count // chunk_size)
+    for players_count in player_counts:
+        for max_rounds_factor in round_factors:
+            for index in range(chunks_count):
+                yield Chunk(players_count, max_rounds_factor, index,
+                            chunk_size, seed)
+
+
+def load_checkpoint(path: Optional[str]) -> Dict[Tuple, ChunkSummary]:
+    summaries = dict()
+    if not path or not os.path.exists(path):
+        return summaries
+    with open(path) as checkpoint:
+        for line in checkpoint:
+            try:
+                summary = ChunkSummary(**json.loads(line))
+            except (ValueError, TypeError):
+                continue
+            summaries[summary.key] = summary
+    return summaries
+
+
+def run_sweep(chunks: List[Chunk], workers: Optional[int],
+              checkpoint_path: Optional[str],
+              summaries: Dict[Tuple, ChunkSummary]) -> List[ChunkSummary]:
+    pending = [chunk for chunk in chunks if chunk.key not in summaries]
+    checkpoint = open(checkpoint_path, 'a') if checkpoint_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(play_chunk, chunk): chunk
+                       for chunk in pending}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                summary = ChunkSummary(chunk.players_count,
+                                       chunk.max_rounds_factor, chunk.index)
+                for result in future.result():
+                    summary.add(result)
+                summaries[summary.key] = summary
+                if checkpoint:
+                    checkpoint.write(json.dumps(asdict(summary)) + '\n')
+                    checkpoint.flush()
+    finally:
+        if checkpoint:
+            checkpoint.close()
+    return [summaries[chunk.key] for chunk in chunks]
+
+
+def report(summaries: List[ChunkSummary]) -> None:
+    totals: Dict[Tuple[int, int], ChunkSummary] = dict()
+    for summary in summaries:
+        key = summary.players_count, summary.max_rounds_factor
+        total = totals.setdefault(key, ChunkSummary(*key, index=-1))
+        total.games += summary.games
+        total.rounds += summary.rounds
+        total.exhausted_banks += summary.exhausted_banks
+        total.kicked_players += summary.kicked_players
+        total.games_with_kicks += summary.games_with_kicks
+    print('players factor     games  avg rounds  bank exhausted'
+          '  games with kicks  kicked players')
+    for (players_count, max_rounds_factor), total in sorted(totals.items()):
+        print(f'{players_count:7d} {max_rounds_factor:6d}'
+              f' {total.games:9d}'
+              f' {total.rounds / total.games:11.2f}'
+              f' {total.exhausted_banks / total.games:15.2%}'
+              f' {total.games_with_kicks / total.games:17.2%}'
+              f' {total.kicked_players / (total.games * players_count):15.2%}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulated games sweep')
+    parser.add_argument('--players', type=int, nargs='+',
+                        default=PLAYER_COUNTS)
+    parser.add_argument('--factors', type=int, nargs='+',
+                        default=ROUND_FACTORS)
+    parser.add_argument('--games', type=int, default=GAMES_PER_CONFIGURATION,
+                        help='Games per players count and rounds factor')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', type=str, default=None,
+                        help='Completed chunks file, resumed when present')
+    args = parser.parse_args()
+
+    planned_chunks = list(plan_chunks(args.players, args.factors, args.games,
+                                      args.chunk_size, args.seed))
+    completed_summaries = load_checkpoint(args.checkpoint)
+    resumed_games = sum(completed_summaries[chunk.key].games
+                        for chunk in planned_chunks
+                        if chunk.key in completed_summaries)
+    start = time.perf_counter()
+    sweep_summaries = run_sweep(planned_chunks, args.workers, args.checkpoint,
+                                completed_summaries)
+    elapsed = time.perf_counter() - start
+    report(sweep_summaries)
+    games_played = sum(summary.games for summary in sweep_summaries) \
+        - resumed_games
+    print(f'{games_played} games in {elapsed:.2f} s'
+          f' ({resumed_games} resumed from checkpoint)')
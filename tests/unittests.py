@@ -1,9 +1,68 @@
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+from sqlalchemy.exc import OperationalError
+from websockets.legacy.protocol import State
+
 from superego.game.game import\
+    ActionName,\
     Answer,\
+    Card,\
     Guess,\
-    Game
+    Game,\
+    Deck,\
+    GamePhaseName,\
+    LobbyMember
+from superego.game.datatypes import Carousel
+from superego.infrastructure.database.cache import CardPool
+from superego.infrastructure.database.engine import get_db, get_pooled_db, \
+    InvalidSQLiteSetting, SQLiteConfig
+from superego.infrastructure.database.executor import StorageExecutor
+from superego.infrastructure.database.importer import CardImport, ImportFormat, \
+    MAX_CSV_RECORD_LENGTH, detect_format
+from superego.infrastructure.database.migrations import migrate, \
+    get_schema_version, LATEST_VERSION
+from superego.infrastructure.database.storage import DataBasePersonStorage
+from superego.infrastructure.http.server import GameServerPool, \
+    GameServerNotFound, import_cards, ongoing_game, stop_game
+from superego.infrastructure.websockets.delta import compute_game_state_delta
+from superego.infrastructure.websockets.feedback import Feedback, Status
+from superego.infrastructure.websockets.serialization import \
+    serialize_game_state, serialize_game_state_delta
+from superego.infrastructure.websockets.events import Event, EventAction
+from superego.infrastructure.websockets import binary
+from superego.infrastructure.websockets.broadcast import WebSocketsBroadcast, \
+    SlowConsumerPolicy, SpectatorBroadcast, SpectatorsLimitReached
+from superego.infrastructure.websockets.gameserver import GameActor, \
+    WebSocketsConnectionHandler, WebSocketsEventRouter, WebSocketsListener, \
+    WebSocketsServer, WebsocketsServerConfig
+from superego.infrastructure.websockets.handlers import AnswerEventHandler, \
+    GuessEventHandler, ReadyEventHandler
+from superego.application.interfaces import GameServer
+from superego.application.usecases import AnswerUseCase, GuessUseCase, \
+    ReadyUseCase
+from superego.infrastructure.journal.journal import Journal, JournalConfig, \
+    encode_action_record, list_segments
+from superego.infrastructure.journal.recorder import JournalGameRecorder
+from superego.infrastructure.journal.recovery import recover_games
+from superego.infrastructure.journal.replay import ReplayEngine
+from superego.infrastructure.journal.snapshots import SnapshotDeckMismatch, \
+    dump_snapshot, load_snapshot
 
-from tests.utils import create_test_lobby, ArtificialClock, ObserverStub
+from tests.utils import create_test_lobby, ArtificialClock, ObserverStub, \
+    ArtificialTimeProvider, random_answer, random_guess, serialize_feedback
+from tests.test_deck import test_cards
+from tests.batch_simulate import BatchSimulator, BatchSettings, BatchTable, \
+    AnswerPolicy, BetPolicy, UniformAnswerPolicy, UniformBetPolicy, \
+    PredictingAnswerPolicy
 
 
 def test_won_bet_executed_correctly():
@@ -32,3 +91,1051 @@ def test_lost_bet_executed_correctly():
     assert guessing_player_2_valid_points == guessing_player_2.points
 
 
+def test_carousel_rotates_over_remaining_items():
+    carousel = Carousel(['a', 'b', 'c', 'd'])
+    carousel.remove(1)
+    assert carousel.pop_push() == 'a'
+    assert carousel.items == ['c', 'd', 'a']
+    assert len(carousel) == 3
+
+
+def test_carousel_removing_front_moves_front_to_next_item():
+    carousel = Carousel(['a', 'b', 'c'])
+    carousel.pop_push()
+    assert carousel.pop() == 'b'
+    assert carousel.front == 'c'
+    assert carousel.items == ['c', 'a']
+
+
+def test_carousel_find_remove_removes_matching_items():
+    carousel = Carousel([1, 2, 3, 4, 5])
+    carousel.find_remove(lambda x: x % 2 == 0)
+    assert carousel.items == [1, 3, 5]
+
+
+def test_carousel_keeps_seats_stable_after_removal():
+    carousel = Carousel(['a', 'b'])
+    seat = carousel.add('c')
+    carousel.remove(0)
+    assert seat == 2
+    assert carousel[seat] == 'c'
+
+
+def test_carousel_iterates_behind_front_while_removing():
+    carousel = Carousel(['a', 'b', 'c', 'd'])
+    visited = list()
+    for item in carousel.iter_behind_front():
+        visited.append(item)
+        if item == 'b':
+            carousel.remove(1)
+    assert visited == ['b', 'c', 'd']
+    assert carousel.items == ['a', 'c', 'd']
+
+
+def test_bankrupt_player_is_kicked_and_others_stay():
+    lobby = create_test_lobby(4, 1)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    answering_player = game.current_player
+    game.answer(answering_player, Answer.ANSWER_A)
+    bankrupt, winner, loser = game.guessing_players
+    bankrupt.take_points(bankrupt.points - 1)
+    game.guess(bankrupt, Guess(answer=Answer.ANSWER_B, bet=1))
+    game.guess(winner, Guess(answer=Answer.ANSWER_A, bet=1))
+    game.guess(loser, Guess(answer=Answer.ANSWER_C, bet=1))
+    assert game.players == [answering_player, winner, loser]
+
+
+def test_player_index_follows_kicks_and_advances():
+    lobby = create_test_lobby(4, 1)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    answering_player = game.current_player
+    game.answer(answering_player, Answer.ANSWER_A)
+    bankrupt, winner, loser = game.guessing_players
+    assert game.collect_guessing_players_guids()\
+        == {bankrupt.guid, winner.guid, loser.guid}
+    bankrupt.take_points(bankrupt.points - 1)
+    game.guess(bankrupt, Guess(answer=Answer.ANSWER_B, bet=1))
+    game.guess(winner, Guess(answer=Answer.ANSWER_A, bet=1))
+    game.guess(loser, Guess(answer=Answer.ANSWER_C, bet=1))
+    assert game.find_player(bankrupt.guid) is None
+    assert game.find_player(winner.guid) is winner
+    for player in game.players:
+        game.mark_ready(player)
+    assert game.current_player == winner
+    assert game.collect_guessing_players_guids()\
+        == {player.guid for player in game.guessing_players}\
+        == {answering_player.guid, loser.guid}
+
+
+def _draw_cycle(deck: Deck, cards_count: int) -> list:
+    drawn = [deck.current_card]
+    for _ in range(cards_count - 1):
+        deck.advance_card()
+        drawn.append(deck.current_card)
+    return drawn
+
+
+def test_deck_draws_every_card_once_per_cycle():
+    cards = list(test_cards)
+    deck = Deck('Deck', cards, random.Random(7))
+    drawn = _draw_cycle(deck, len(cards))
+    assert sorted(map(id, drawn)) == sorted(map(id, cards))
+    assert cards == test_cards
+
+
+def test_deck_draw_order_is_reproducible_with_seed():
+    cards = list(test_cards)
+    first = _draw_cycle(Deck('Deck', cards, random.Random(7)), len(cards))
+    second = _draw_cycle(Deck('Deck', cards, random.Random(7)), len(cards))
+    assert first == second
+
+
+def test_card_pool_loads_once_until_invalidated():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return test_cards
+
+    pool = CardPool()
+    first, second = pool.get(load), pool.get(load)
+    pool.invalidate()
+    third = pool.get(load)
+    assert first is second
+    assert third == first
+    assert len(loads) == 2
+
+
+def test_card_pool_drops_load_invalidated_while_running():
+    pool = CardPool()
+    loading, committed = threading.Event(), threading.Event()
+
+    def stale_load():
+        loading.set()
+        committed.wait(1)
+        return test_cards[:1]
+
+    reader = threading.Thread(target=pool.get, args=(stale_load, ))
+    reader.start()
+    loading.wait(1)
+    pool.invalidate()
+    committed.set()
+    reader.join()
+    assert pool.get(lambda: test_cards) == tuple(test_cards)
+
+
+def test_decks_share_pooled_cards_but_not_draw_order():
+    cards = CardPool().get(lambda: test_cards)
+    deck_1 = Deck('Deck', cards, random.Random(1))
+    deck_2 = Deck('Deck', cards, random.Random(2))
+    assert deck_1.cards is deck_2.cards
+    assert _draw_cycle(deck_1, len(cards)) != _draw_cycle(deck_2, len(cards))
+
+
+def test_delta_after_mark_ready_contains_only_ready_flag():
+    lobby = create_test_lobby(3, 1)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    game.answer(game.current_player, Answer.ANSWER_A)
+    for player in game.guessing_players:
+        game.guess(player, Guess(answer=Answer.ANSWER_A, bet=1))
+    previous_state = game.state
+    player = game.guessing_players[0]
+    game.mark_ready(player)
+    delta = compute_game_state_delta(previous_state, game.state)
+    assert delta.base_version + 1 == delta.version
+    assert delta.player_changes == {player.seat: {'ready': True}}
+    assert delta.removed_seats == []
+    assert delta.seat_order is None
+
+
+def test_game_state_is_rebuilt_only_after_an_action():
+    lobby = create_test_lobby(3, 1)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    state = game.state
+    assert game.state is state
+    game.change_card(game.current_player)
+    assert game.state is not state
+    assert game.state.version == state.version + 1
+
+
+def test_fast_encoder_matches_generic_serializer():
+    lobby = create_test_lobby(3, 1)
+    lobby.add_member(LobbyMember('Żaneta "Zośka"'))
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    previous_state = game.state
+    game.answer(game.current_player, Answer.ANSWER_A)
+    state = game.state
+    delta = compute_game_state_delta(previous_state, state)
+    assert serialize_game_state(state)\
+        == serialize_feedback(Feedback(Status.GAME_STATE, state))
+    assert serialize_game_state_delta(delta)\
+        == serialize_feedback(Feedback(Status.GAME_STATE_DELTA, delta))
+
+
+def _play_round_with_kick() -> list:
+    lobby = create_test_lobby(4, 1)
+    lobby.add_member(LobbyMember('Żaneta'))
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    states = [game.state]
+    game.change_card(game.current_player)
+    states.append(game.state)
+    game.answer(game.current_player, Answer.ANSWER_A)
+    states.append(game.state)
+    bankrupt, *others = game.guessing_players
+    bankrupt.take_points(bankrupt.points - 1)
+    game.guess(bankrupt, Guess(answer=Answer.ANSWER_B, bet=1))
+    states.append(game.state)
+    for player in others:
+        game.guess(player, Guess(answer=Answer.ANSWER_A, bet=2))
+    states.append(game.state)
+    for player in game.players:
+        game.mark_ready(player)
+    states.append(game.state)
+    return states
+
+
+def test_binary_game_state_round_trip():
+    for state in _play_round_with_kick():
+        encoded = binary.encode_game_state(state)
+        assert binary.decode_game_state(encoded) == state
+        for frame in (encoded[:-1], encoded[:20]):
+            try:
+                binary.decode_game_state(frame)
+                assert False
+            except binary.TruncatedFrame:
+                pass
+
+
+def test_binary_game_state_delta_round_trip():
+    states = _play_round_with_kick()
+    deltas = [compute_game_state_delta(previous, current)
+              for previous, current in zip(states, states[1:])]
+    assert any(delta.removed_seats for delta in deltas)
+    assert any(delta.seat_order for delta in deltas)
+    for delta in deltas:
+        encoded = binary.encode_game_state_delta(delta)
+        assert binary.decode_game_state_delta(encoded) == delta
+        assert binary.decode_status(encoded) == Status.GAME_STATE_DELTA
+
+
+def test_binary_event_round_trip():
+    time_provider = ArtificialTimeProvider()
+    issuer = LobbyMember('Bob').guid
+    events = [
+        Event(time_provider.now(), EventAction.ANSWER, issuer, ['B']),
+        Event(time_provider.now(), EventAction.GUESS, issuer, ['C', 2]),
+        Event(time_provider.now(), EventAction.CHANGE_CARD, issuer, []),
+        Event(time_provider.now(), EventAction.SUBSCRIBE, issuer, []),
+        Event(time_provider.now(), EventAction.READ, issuer, []),
+        Event(time_provider.now(), EventAction.READY, issuer, []),
+    ]
+    for event in events:
+        decoded = binary.decode_event(binary.encode_event(event), time_provider)
+        assert decoded == event
+    guess = binary.encode_event(events[1])
+    for frame in (b'', b'\x00' * 5, guess[:-1], guess.decode('latin-1')):
+        try:
+            binary.decode_event(frame, time_provider)
+            assert False
+        except binary.BinaryProtocolError:
+            pass
+
+
+def test_binary_confirmation_is_single_byte():
+    assert binary.decode_status(binary.CONFIRMATION_FRAME)\
+        == Status.ACKNOWLEDGED
+    assert len(binary.CONFIRMATION_FRAME) == 1
+
+
+class _RecordingAnswerPolicy(AnswerPolicy):
+    def __init__(self, policy: AnswerPolicy):
+        self._policy = policy
+        self.rounds = list()
+
+    def answers(self, table: BatchTable) -> np.ndarray:
+        answers = self._policy.answers(table)
+        self.rounds.append(answers)
+        return answers
+
+
+class _RecordingBetPolicy(BetPolicy):
+    def __init__(self, policy: BetPolicy):
+        self._policy = policy
+        self.rounds = list()
+
+    def bets(self, table: BatchTable) -> np.ndarray:
+        bets = self._policy.bets(table)
+        self.rounds.append(bets)
+        return bets
+
+
+def _replay_batch_game(players_count: int, max_rounds_factor: int,
+                       answers: list, bets: list, index: int) -> Game:
+    choices = (Answer.ANSWER_A, Answer.ANSWER_B, Answer.ANSWER_C)
+    lobby = create_test_lobby(players_count, max_rounds_factor)
+    game = Game(lobby, ArtificialClock(), ObserverStub())
+    for round_answers, round_bets in zip(answers, bets):
+        if game.over:
+            break
+        seat_answers, seat_bets = round_answers[index], round_bets[index]
+        answering_player = game.current_player
+        game.answer(answering_player,
+                    choices[seat_answers[answering_player.seat]])
+        for player in game.guessing_players:
+            game.guess(player, Guess(answer=choices[seat_answers[player.seat]],
+                                     bet=int(seat_bets[player.seat])))
+        for player in game.players:
+            game.mark_ready(player)
+    return game
+
+
+def test_batch_simulator_matches_game_outcomes():
+    games_count = 50
+    kicked_players = 0
+    for players_count, max_rounds_factor, accuracy in ((3, 4, 0.5),
+                                                      (6, 3, 0.0),
+                                                      (9, 2, 0.9)):
+        rng = np.random.default_rng(players_count)
+        answer_policy = _RecordingAnswerPolicy(
+            PredictingAnswerPolicy(rng, accuracy) if accuracy
+            else UniformAnswerPolicy(rng))
+        bet_policy = _RecordingBetPolicy(UniformBetPolicy(rng))
+        settings = BatchSettings(players_count, max_rounds_factor)
+        result = BatchSimulator(settings, answer_policy, bet_policy)\
+            .run(games_count)
+        kicked_players += result.kicked_players.sum()
+        for index in range(games_count):
+            game = _replay_batch_game(players_count, max_rounds_factor,
+                                      answer_policy.rounds, bet_policy.rounds,
+                                      index)
+            state = game.state
+            assert game.over
+            assert state.round_number == result.rounds_played[index]
+            assert state.points_in_bank == result.points_in_bank[index]
+            in_game_seats = sorted(player.seat for player in game.players)
+            assert in_game_seats\
+                == list(np.flatnonzero(result.in_game[index]))
+            for player_state in state.player_states:
+                assert player_state.points\
+                    == result.points[index, player_state.seat]
+    assert kicked_players
+
+
+def _play_journaled_actions(game: Game, actions_count: int) -> None:
+    rng = random.Random(actions_count)
+    for _ in range(actions_count):
+        if game.over:
+            return
+        state = game.state
+        player_states = {player_state.guid: player_state
+                         for player_state in state.player_states}
+        if state.phase == GamePhaseName.ANSWER_PHASE:
+            if not state.card_changed and rng.random() < 0.3:
+                game.change_card(game.current_player)
+            else:
+                game.answer(game.current_player, random_answer(rng))
+        elif state.phase == GamePhaseName.GUESS_PHASE:
+            player = next(player for player in game.players
+                          if player_states[player.guid].awaited_to_guess)
+            guess = random_guess(rng)
+            game.guess(player, Guess(answer=guess.answer,
+                                     bet=min(guess.bet, player.points)))
+        elif state.phase == GamePhaseName.RESULT_PHASE:
+            player = next(player for player in game.players
+                          if not player_states[player.guid].ready)
+            game.mark_ready(player)
+
+
+def test_journal_recovers_unfinished_game_from_snapshot_and_tail():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory, snapshot_interval=7))
+        journal.start()
+        lobby = create_test_lobby(5, 3)
+        finished_lobby = create_test_lobby(2, 1)
+        game = Game(lobby, ArtificialClock(), ObserverStub(),
+                    JournalGameRecorder(journal, lobby.guid))
+        finished_game = Game(finished_lobby, ArtificialClock(),
+                             ObserverStub(),
+                             JournalGameRecorder(journal, finished_lobby.guid))
+        _play_journaled_actions(game, 40)
+        _play_journaled_actions(finished_game, 100)
+        journal.sync()
+        with open(list_segments(directory)[-1], 'ab') as segment:
+            segment.write(b'\x00\x00\x01\x00torn')
+
+        recovered = recover_games(directory, test_cards)
+
+        assert finished_game.over
+        assert list(recovered) == [lobby.guid]
+        recovered_game = Game.restore(recovered[lobby.guid])
+        expected_state, recovered_state = game.state, recovered_game.state
+        assert recovered_state.version == expected_state.version
+        assert recovered_state.player_states == expected_state.player_states
+        assert recovered_state.current_card == expected_state.current_card
+        assert recovered_state.phase == expected_state.phase
+        journal.close()
+
+
+def test_journal_recovery_skips_games_that_fail_to_replay():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory))
+        journal.start()
+        lobbies = [create_test_lobby(3, 2), create_test_lobby(4, 2)]
+        games = [Game(lobby, ArtificialClock(), ObserverStub(),
+                      JournalGameRecorder(journal, lobby.guid))
+                 for lobby in lobbies]
+        for game in games:
+            _play_journaled_actions(game, 5)
+        broken, healthy = games
+        bystander = next(player for player in broken.players
+                         if player != broken.current_player)
+        journal.append(encode_action_record(
+            lobbies[0].guid, ActionName.ANSWER_ACTION, bystander.guid,
+            (Answer.ANSWER_A,)))
+        journal.close()
+
+        recovered = recover_games(directory, test_cards)
+
+        assert list(recovered) == [lobbies[1].guid]
+        assert recovered[lobbies[1].guid].game_table.version \
+            == healthy.version
+
+
+def test_replay_engine_rebuilds_game_at_any_action_index():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory, snapshot_interval=5))
+        journal.start()
+        lobby = create_test_lobby(4, 2)
+        game = Game(lobby, ArtificialClock(), ObserverStub(),
+                    JournalGameRecorder(journal, lobby.guid))
+        states = [game.state]
+        while not game.over:
+            _play_journaled_actions(game, 1)
+            states.append(game.state)
+        journal.sync()
+
+        with ReplayEngine.from_directory(directory, test_cards) as engine:
+            assert engine.games == [lobby.guid]
+            assert engine.unfinished_games == []
+            assert engine.last_action_index(lobby.guid) == len(states) - 1
+            for index, state in enumerate(states):
+                replayed_state = engine.replay(lobby.guid, index).state
+                assert replayed_state.version == state.version
+                assert replayed_state.player_states == state.player_states
+                assert replayed_state.phase == state.phase
+        journal.close()
+
+
+def _wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_journal_rotation_keeps_segments_until_every_game_snapshots():
+    with tempfile.TemporaryDirectory() as directory:
+        journal = Journal(JournalConfig(directory, commit_interval=0.001))
+        journal.start()
+        lobbies = [create_test_lobby(3, 2), create_test_lobby(4, 2)]
+        games = [Game(lobby, ArtificialClock(), ObserverStub(),
+                      JournalGameRecorder(journal, lobby.guid))
+                 for lobby in lobbies]
+        for game in games:
+            _play_journaled_actions(game, 5)
+        first_segment = list_segments(directory)[0]
+
+        journal.rotate()
+        _play_journaled_actions(games[0], 1)
+        time.sleep(0.05)
+        assert first_segment in list_segments(directory)
+
+        _play_journaled_actions(games[1], 1)
+        assert _wait_until(lambda: list_segments(directory)
+                           == list_segments(directory)[-1:])
+        recovered = recover_games(directory, test_cards)
+        assert {guid: snapshot.game_table.version
+                for guid, snapshot in recovered.items()} \
+            == {lobby.guid: game.version
+                for lobby, game in zip(lobbies, games)}
+        journal.close()
+
+
+def test_snapshot_binds_deck_only_to_matching_stored_cards():
+    game = Game(create_test_lobby(3, 2), ArtificialClock(), ObserverStub())
+    data = dump_snapshot(game.snapshot())
+    extra_card = Card(question='Extra?', answer_A='A', answer_B='B',
+                      answer_C='C')
+
+    snapshot = load_snapshot(data, test_cards + [extra_card])
+
+    assert list(snapshot.game_table.deck.cards) == test_cards
+    for cards in (test_cards[::-1], test_cards[:-1]):
+        try:
+            load_snapshot(data, cards)
+            assert False
+        except SnapshotDeckMismatch:
+            pass
+
+
+class _WebSocketStub:
+    subprotocol = None
+
+    def __init__(self):
+        self.sent = list()
+        self.close_code = None
+        self.unblocked = asyncio.Event()
+        self.unblocked.set()
+        self.closed = asyncio.Event()
+
+    async def send(self, message) -> None:
+        await self.unblocked.wait()
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = '') -> None:
+        self.close_code = code
+        self.closed.set()
+
+    async def wait_closed(self) -> None:
+        await self.closed.wait()
+
+
+class _RecordingObserver(ObserverStub):
+    def __init__(self):
+        self.states = list()
+
+    def notify_game_state_changed(self, game_state) -> None:
+        self.states.append(game_state)
+
+
+def test_game_actor_applies_burst_in_order_and_broadcasts_once():
+    lobby = create_test_lobby(4, 1)
+    game = Game(lobby, ArtificialClock(), None)
+    observer = _RecordingObserver()
+    router = WebSocketsEventRouter()\
+        .register_handler(EventAction.ANSWER,
+                          AnswerEventHandler(AnswerUseCase(game)))\
+        .register_handler(EventAction.GUESS,
+                          GuessEventHandler(GuessUseCase(game)))\
+        .register_handler(EventAction.READY,
+                          ReadyEventHandler(ReadyUseCase(game)))
+    time_provider = ArtificialTimeProvider()
+    events = [Event(time_provider.now(), EventAction.ANSWER,
+                    game.current_player.guid, ['A'])]
+    events += [Event(time_provider.now(), EventAction.GUESS, player.guid,
+                     ['B', 1]) for player in game.guessing_players]
+    events += [Event(time_provider.now(), EventAction.READY, player.guid, [])
+               for player in game.players]
+    websocket = _WebSocketStub()
+    websocket.unblocked.clear()
+
+    async def burst() -> list:
+        actor = GameActor(game, router, observer, inbox_size=len(events))
+        actor.start()
+        replies = await asyncio.gather(*[actor.route(event, websocket)
+                                         for event in events])
+        await asyncio.sleep(0)
+        actor.stop()
+        return replies
+
+    replies = asyncio.run(burst())
+
+    assert len(replies) == len(events) and websocket.sent == []
+    assert [state.version for state in observer.states] == [0, len(events)]
+    assert observer.states[-1].round_number == 2
+
+
+class _FailingObserver(_RecordingObserver):
+    def notify_game_state_changed(self, game_state) -> None:
+        super().notify_game_state_changed(game_state)
+        if len(self.states) == 2:
+            raise RuntimeError('encoder failed')
+
+
+def test_game_actor_survives_failing_broadcast():
+    lobby = create_test_lobby(4, 1)
+    game = Game(lobby, ArtificialClock(), None)
+    observer = _FailingObserver()
+    router = WebSocketsEventRouter()\
+        .register_handler(EventAction.GUESS,
+                          GuessEventHandler(GuessUseCase(game)))
+    time_provider = ArtificialTimeProvider()
+    websocket = _WebSocketStub()
+
+    async def scenario() -> None:
+        actor = GameActor(game, router, observer)
+        actor.start()
+        game.answer(game.current_player, Answer.ANSWER_A)
+        for player in game.guessing_players:
+            event = Event(time_provider.now(), EventAction.GUESS,
+                          player.guid, ['B', 1])
+            await asyncio.wait_for(actor.route(event, websocket), 1)
+            await asyncio.sleep(0)
+        actor.stop()
+
+    asyncio.run(scenario())
+    assert len(observer.states) == 4
+
+
+class _NullRouter(WebSocketsEventRouter):
+    async def route(self, event, websocket) -> None:
+        return None
+
+
+def test_finished_game_server_stops_itself_after_grace_period():
+    game = Game(create_test_lobby(2, 1), ArtificialClock(), ObserverStub())
+    while not game.over:
+        _play_journaled_actions(game, 1)
+    listener = WebSocketsListener(WebsocketsServerConfig(
+        '127.0.0.1', 0, 'utf-8', game_over_grace=0.01))
+    pool = GameServerPool()
+    time_provider = ArtificialTimeProvider()
+    websocket = _WebSocketStub()
+
+    async def scenario() -> None:
+        actor = GameActor(game, _NullRouter(), ObserverStub(),
+                          game_over_grace=listener.game_over_grace)
+        handler = WebSocketsConnectionHandler('utf-8', time_provider, actor,
+                                              None)
+        server = WebSocketsServer(uuid.uuid4(), listener, handler,
+                                  actor=actor, on_stopped=pool.discard)
+        pool.store(server)
+        server.run()
+        event = Event(time_provider.now(), EventAction.READ,
+                      game.current_player.guid, [])
+        await actor.route(event, websocket)
+        assert server.guid in pool
+        await asyncio.sleep(0.05)
+        assert server.guid not in pool
+        server.stop()
+
+    asyncio.run(scenario())
+    assert len(pool) == 0
+
+
+def test_listener_reads_game_guid_from_path():
+    listener = WebSocketsListener(WebsocketsServerConfig('test', 0, 'utf-8'))
+    guid = uuid.uuid4()
+
+    assert listener._read_game_guid(f'/games/{guid}') == guid
+    assert listener._read_game_guid(f'/games/{guid}/') == guid
+    for path in (f'/game/{guid}', f'/{guid}', '/games/', '/games/abc',
+                 f'/games/{guid}/extra', ''):
+        assert listener._read_game_guid(path) is None, path
+
+
+def test_listener_dispatches_by_path_and_closes_on_unregister():
+    listener = WebSocketsListener(WebsocketsServerConfig('test', 0, 'utf-8'))
+    guid = uuid.uuid4()
+    handled = list()
+
+    async def handler(websocket) -> None:
+        handled.append(websocket)
+        await websocket.wait_closed()
+
+    def connect(path: str) -> _WebSocketStub:
+        websocket = _WebSocketStub()
+        websocket.path = path
+        return websocket
+
+    async def scenario() -> None:
+        listener.register(guid, handler)
+        unknown, malformed = connect(f'/games/{uuid.uuid4()}'), \
+            connect('/games/not-a-guid')
+        for websocket in (unknown, malformed):
+            await listener._dispatch(websocket)
+            assert websocket.close_code == \
+                WebSocketsListener.GAME_NOT_FOUND_CLOSE_CODE
+        players = [connect(f'/games/{guid}'), connect(f'/games/{guid}/')]
+        dispatches = [asyncio.ensure_future(listener._dispatch(websocket))
+                      for websocket in players]
+        await asyncio.sleep(0)
+        assert handled == players
+        listener.unregister(guid)
+        await asyncio.wait_for(asyncio.gather(*dispatches), 1)
+        assert [websocket.close_code for websocket in players] == [1000, 1000]
+        late = connect(f'/games/{guid}')
+        await listener._dispatch(late)
+        assert late.close_code == WebSocketsListener.GAME_NOT_FOUND_CLOSE_CODE
+        assert handled == players
+
+    asyncio.run(scenario())
+
+
+class _GameServerStub(GameServer):
+    def __init__(self):
+        self._guid = uuid.uuid4()
+        self.stopped = False
+
+    def run(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    @property
+    def address(self):
+        return f'test:0/games/{self._guid}'
+
+    @property
+    def guid(self) -> uuid.UUID:
+        return self._guid
+
+
+def test_game_server_pool_stores_and_removes_servers():
+    pool = GameServerPool()
+    servers = [_GameServerStub() for _ in range(3)]
+    for server in servers:
+        pool.store(server)
+
+    assert len(pool) == 3 and pool.is_ongoing
+    assert pool.get(servers[0].guid) is servers[0]
+    pool.remove(servers[0].guid)
+    pool.discard(servers[1].guid)
+    pool.discard(servers[1].guid)
+    assert pool.all == [servers[2]]
+    for guid in (servers[0].guid, uuid.uuid4()):
+        try:
+            pool.get(guid)
+            assert False
+        except GameServerNotFound:
+            pass
+    try:
+        pool.remove(servers[1].guid)
+        assert False
+    except GameServerNotFound:
+        pass
+    pool.flush()
+    assert not pool.is_ongoing
+
+
+def test_game_endpoints_report_and_stop_games():
+    pool = GameServerPool()
+    servers = [_GameServerStub() for _ in range(2)]
+    for server in servers:
+        pool.store(server)
+    app = web.Application()
+    app.router.add_get('/game', ongoing_game)
+    app.router.add_delete('/game', stop_game)
+    app['game_server_pool'] = pool
+    stopped, unknown = servers[0], uuid.uuid4()
+
+    async def scenario() -> None:
+        async with TestClient(TestServer(app)) as client:
+            response = await client.get('/game')
+            assert await response.json() == {
+                str(server.guid): server.address for server in servers}
+            response = await client.get(f'/game?guid={stopped.guid}')
+            assert await response.json() == {'address': stopped.address}
+            for method, query, status in (
+                    ('GET', f'?guid={unknown}', 404),
+                    ('GET', '?guid=not-a-guid', 400),
+                    ('DELETE', '', 400),
+                    ('DELETE', '?guid=not-a-guid', 400),
+                    ('DELETE', f'?guid={unknown}', 404),
+                    ('DELETE', f'?guid={stopped.guid}', 200),
+                    ('DELETE', f'?guid={stopped.guid}', 404)):
+                response = await client.request(method, f'/game{query}')
+                assert response.status == status, (method, query)
+
+    asyncio.run(scenario())
+    assert stopped.stopped and not servers[1].stopped
+    assert pool.all == [servers[1]]
+
+
+def test_broadcast_registry_supersedes_stale_frames_and_cleans_up():
+    async def scenario() -> None:
+        broadcast = WebSocketsBroadcast(send_queue_size=2)
+        fast, slow = _WebSocketStub(), _WebSocketStub()
+        slow.unblocked.clear()
+        await broadcast.add_listener(fast, 'S0')
+        await broadcast.add_listener(slow, 'S0')
+        await broadcast.add_listener(fast, 'S0')
+        await asyncio.sleep(0)
+        for version in range(1, 5):
+            broadcast.broadcast(lambda codec: f'D{version}',
+                                lambda codec: f'S{version}')
+            await asyncio.sleep(0)
+        assert broadcast.listeners_count == 2
+        assert fast.sent == ['S0', 'D1', 'D2', 'D3', 'D4']
+        slow.unblocked.set()
+        await asyncio.sleep(0)
+        assert slow.sent == ['S0', 'S3', 'D4']
+        assert broadcast.dropped_frames == 3
+        await fast.close()
+        await asyncio.sleep(0.01)
+        assert broadcast.listeners_count == 1
+
+    asyncio.run(scenario())
+
+
+def test_broadcast_registry_disconnects_slow_consumers():
+    async def scenario() -> None:
+        broadcast = WebSocketsBroadcast(1, SlowConsumerPolicy.DISCONNECT)
+        slow = _WebSocketStub()
+        slow.unblocked.clear()
+        await broadcast.add_listener(slow, 'S0')
+        await asyncio.sleep(0)
+        for version in range(1, 3):
+            broadcast.broadcast(lambda codec: f'D{version}',
+                                lambda codec: f'S{version}')
+        await asyncio.sleep(0)
+        assert broadcast.listeners_count == 0
+        assert broadcast.disconnected_count == 1
+        assert slow.close_code == 1013
+
+    asyncio.run(scenario())
+
+
+class _SpectatorStub:
+    subprotocol = None
+    state = State.OPEN
+    closed = False
+    _fragmented_message_waiter = None
+
+    def __init__(self):
+        self.sent = list()
+        self.buffered = 0
+        self.transport = self
+        self.closing = asyncio.Event()
+
+    async def wait_closed(self) -> None:
+        await self.closing.wait()
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    def write_frame_sync(self, fin: bool, opcode: int, data: bytes) -> None:
+        self.sent.append(data)
+
+
+def test_spectators_share_encoded_frames_and_resync_when_slow():
+    async def scenario() -> None:
+        spectators = SpectatorBroadcast(max_spectators=3, batch_size=2,
+                                        buffer_limit=100)
+        viewers = [_SpectatorStub() for _ in range(3)]
+        for viewer in viewers:
+            await spectators.add_listener(viewer, 'S0')
+        try:
+            await spectators.add_listener(_SpectatorStub(), 'S0')
+            assert False
+        except SpectatorsLimitReached:
+            pass
+        encodes = list()
+
+        def encode(version: int):
+            return lambda codec: encodes.append(version) or f'D{version}'
+
+        viewers[2].buffered = 101
+        spectators.broadcast(encode(1), lambda codec: 'S1')
+        await asyncio.sleep(0.01)
+        viewers[2].buffered = 0
+        viewers[1].closed = True
+        spectators.broadcast(encode(2), lambda codec: 'S2')
+        await asyncio.sleep(0.01)
+        assert encodes == [1, 2]
+        assert viewers[0].sent == [b'S0', b'D1', b'D2']
+        assert viewers[1].sent == [b'S0', b'D1']
+        assert viewers[2].sent == [b'S0', b'S2']
+        assert spectators.listeners_count == 2
+        assert spectators.dropped_frames == 1
+
+    asyncio.run(scenario())
+
+
+def test_closed_spectators_free_their_slots_without_broadcasts():
+    async def scenario() -> None:
+        spectators = SpectatorBroadcast(max_spectators=2)
+        viewers = [_SpectatorStub() for _ in range(2)]
+        for viewer in viewers:
+            await spectators.add_listener(viewer, 'S0')
+        await spectators.add_listener(viewers[0], 'S0')
+        viewers[0].closing.set()
+        await asyncio.sleep(0.01)
+        assert spectators.listeners_count == 1
+        await spectators.add_listener(_SpectatorStub(), 'S0')
+        assert spectators.listeners_count == 2
+
+    asyncio.run(scenario())
+
+
+def test_storage_executor_runs_work_off_the_event_loop():
+    engine = get_db('sqlite://')
+    storage = StorageExecutor(engine, engine, readers_count=2, max_pending=2)
+
+    def work(connection):
+        return threading.current_thread().name, \
+            connection.exec_driver_sql('SELECT 1').scalar()
+
+    async def scenario():
+        return await asyncio.gather(*[storage.read(work) for _ in range(4)],
+                                    storage.write(work))
+
+    results = asyncio.run(scenario())
+    storage.shutdown()
+    assert all(thread.startswith('storage-reader') and value == 1
+               for thread, value in results[:4])
+    assert results[4] == ('storage-writer_0', 1)
+
+
+def test_pooled_readers_are_read_only_and_share_tuned_writer_database():
+    config = SQLiteConfig(synchronous='full', mmap_size=1024 * 1024)
+    with tempfile.TemporaryDirectory() as directory:
+        url = f'sqlite:///{directory}/test.db'
+        writer = get_pooled_db(url, config, pool_size=1)
+        readers = get_pooled_db(url, config, pool_size=2, read_only=True)
+        migrate(writer)
+        with writer.connect() as connection:
+            DataBasePersonStorage(connection).store('Ann')
+            pragmas = [connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+                       for name in ('journal_mode', 'synchronous',
+                                    'mmap_size')]
+        assert pragmas == ['wal', 2, 1024 * 1024]
+        with readers.connect() as connection:
+            storage = DataBasePersonStorage(connection)
+            guid = storage.retrieve_guid('Ann')
+            assert storage.retrieve_many([guid, uuid.uuid4()]) == {'Ann': guid}
+            try:
+                storage.store('Bob')
+                assert False
+            except OperationalError:
+                pass
+        readers.dispose()
+        writer.dispose()
+    try:
+        SQLiteConfig(journal_mode='fast')
+        assert False
+    except InvalidSQLiteSetting:
+        pass
+
+
+def test_card_import_chunks_valid_rows_and_reports_invalid_ones():
+    card_import = CardImport(ImportFormat.CSV, chunk_size=2)
+    lines = ['question,answer_a,answer_b,answer_c\n',
+             '"Two\n', 'lines?",a,b,c\n',
+             'Too few,a,b\n',
+             f'Too long,{"a" * 257},b,c\n',
+             b'\xff,a,b,c\n',
+             '"Quoted ""word""?",a,b,c\n',
+             'Last,a,b,c']
+    chunks = [card_import.feed(line) for line in lines]
+    chunks = [chunk for chunk in chunks + [card_import.finish()] if chunk]
+    assert [chunk.rows for chunk in chunks] == [[2, 7], [8]]
+    assert [card.question for card in chunks[0].cards]\
+        == ['Two\nlines?', 'Quoted "word"?']
+    assert chunks[1].cards[0].answer_C == 'c'
+    card_import.chunk_stored(chunks[0])
+    card_import.chunk_failed(chunks[1], RuntimeError('disk full'))
+    report = card_import.report
+    assert report.imported == 2
+    assert [error.row for error in report.errors] == [4, 5, 6, 8]
+
+
+def _import_csv(lines: list) -> tuple:
+    card_import = CardImport(ImportFormat.CSV, chunk_size=1000)
+    assert all(card_import.feed(line) is None for line in lines)
+    chunk = card_import.finish()
+    return chunk, [error.row for error in card_import.report.errors]
+
+
+def test_card_import_recovers_rows_after_unterminated_csv_quote():
+    header = ['question,answer_a,answer_b,answer_c\n', 'Bad "quote,a,b,c\n']
+    rows = [f'Question {number}?,a,b,c\n' for number in range(47)]
+    chunk, errors = _import_csv(header + rows)
+    assert (len(chunk.cards), chunk.rows[0], errors) == (47, 3, [2])
+    long_line = 'x' * MAX_CSV_RECORD_LENGTH + '\n'
+    chunk, errors = _import_csv(header + [long_line] + rows)
+    assert (len(chunk.cards), chunk.rows[0], errors) == (47, 4, [2, 3])
+    assert detect_format('cards.CSV') == detect_format('text/csv') \
+        == ImportFormat.CSV
+    assert detect_format('application/x-ndjson-not-csv') \
+        == ImportFormat.NDJSON
+
+
+def test_card_import_endpoint_reports_line_too_long_to_read():
+    cards = [json.dumps({'question': f'Question {number}?', 'answer_a': 'a',
+                         'answer_b': 'b', 'answer_c': 'c'})
+             for number in range(3)]
+    oversized = json.dumps({'question': 'x' * 2 ** 18})
+    body = '\n'.join(cards[:2] + [oversized] + cards[2:]) + '\n'
+
+    async def scenario() -> dict:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = get_db(f'sqlite:///{directory}/import.db')
+            migrate(engine)
+            storage = StorageExecutor(engine, engine, readers_count=1)
+            app = web.Application()
+            app.router.add_post('/cards/import', import_cards)
+            app['config'] = {'sqlite': {'import_chunk_size': 1}}
+            app['storage'] = storage
+            try:
+                async with TestClient(TestServer(app)) as client:
+                    response = await client.post(
+                        '/cards/import?format=ndjson', data=body)
+                    assert response.status == 200
+                    return await response.json()
+            finally:
+                storage.shutdown()
+                engine.dispose()
+
+    report = asyncio.run(scenario())
+
+    assert (report['imported'], report['failed']) == (2, 1)
+    assert report['errors'][0]['row'] == 3
+
+
+def test_migrations_bring_legacy_and_fresh_databases_to_same_schema():
+    guid = uuid.uuid4()
+    legacy = get_db('sqlite://')
+    with legacy.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE person (id INTEGER PRIMARY KEY,'
+            ' guid VARCHAR(36) NOT NULL, name VARCHAR(64) NOT NULL)')
+        connection.exec_driver_sql(
+            f"INSERT INTO person (guid, name) VALUES ('{guid}', 'Ann')")
+    fresh = get_db('sqlite://')
+    assert [migration.version for migration in migrate(legacy)] == [1, 2, 3]
+    assert [migration.version for migration in migrate(fresh)] == [1, 2, 3]
+    assert migrate(legacy) == []
+    for engine in (legacy, fresh):
+        with engine.connect() as connection:
+            assert get_schema_version(connection) == LATEST_VERSION
+            indexes = connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE tbl_name = 'person'"
+                " AND name LIKE 'ix_%' ORDER BY name").scalars().all()
+            assert indexes == ['ix_person_guid', 'ix_person_name']
+    with legacy.connect() as connection:
+        assert connection.exec_driver_sql(
+            'SELECT name FROM person').scalar() == 'Ann'
+        assert connection.exec_driver_sql(
+            'SELECT guid FROM person').scalar() == guid.bytes
+        assert DataBasePersonStorage(connection).retrieve_guid('Ann') == guid
+
+
+def test_failed_migration_leaves_schema_unchanged():
+    engine = get_db('sqlite://')
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE person (id INTEGER PRIMARY KEY,'
+            ' guid VARCHAR(36) NOT NULL, name VARCHAR(64) NOT NULL)')
+        connection.exec_driver_sql(
+            "INSERT INTO person (guid, name) VALUES ('not a guid', 'Ann')")
+    assert migrate(engine, target_version=2)
+    for _ in range(2):
+        try:
+            migrate(engine)
+            assert False
+        except OperationalError:
+            pass
+        with engine.connect() as connection:
+            assert get_schema_version(connection) == 2
+            assert connection.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+                " ORDER BY name").scalars().all() == ['card', 'deck', 'person']
+            assert connection.exec_driver_sql(
+                "SELECT type FROM pragma_table_info('person')"
+                " WHERE name = 'guid'").scalar() == 'VARCHAR(36)'
+            assert connection.exec_driver_sql(
+                'SELECT guid FROM person').scalar() == 'not a guid'
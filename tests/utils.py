@@ -1,6 +1,16 @@
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
+import json
 import random
-from typing import Iterator
+import time
+from typing import Callable, Dict, Iterator, List
+from uuid import UUID
+
+from dataclasses_serialization.serializer_base import\
+    noop_serialization,\
+    dict_serialization,\
+    Serializer
+import numpy as np
 
 from superego.game.game import\
     Clock,\
@@ -10,8 +20,13 @@ from superego.game.game import\
     LobbyMember,\
     GameSettings,\
     Answer,\
-    Guess
-from tests.test_deck import test_deck
+    Guess,\
+    Deck,\
+    Card,\
+    GamePhaseName
+from superego.infrastructure.time import TimeProvider
+from superego.infrastructure.websockets.feedback import Feedback, Status
+from tests.test_deck import test_cards
 
 
 class ArtificialClock(Clock):
@@ -23,6 +38,14 @@ class ArtificialClock(Clock):
         return self._time
 
 
+class ArtificialTimeProvider(TimeProvider):
+    def __init__(self):
+        self._time = datetime(2022, 1, 1, 12)
+
+    def now(self) -> datetime:
+        return self._time
+
+
 class ObserverStub(GameObserver):
     def notify_game_state_changed(self, game_state: GameState) -> None:
         pass
@@ -38,19 +61,89 @@ def generate_lobby_member() -> Iterator[LobbyMember]:
 def create_test_lobby(players_count: int, rounds_per_player: int) -> Lobby:
     player_generator = generate_lobby_member()
     host = next(player_generator)
-    settings = GameSettings(deck=test_deck, max_rounds_factor=rounds_per_player)
+    deck = Deck(name='Test Deck', cards=test_cards)
+    settings = GameSettings(deck=deck, max_rounds_factor=rounds_per_player)
     lobby = Lobby(host=host, settings=settings)
     for i in range(players_count - 1):
         lobby.add_member(next(player_generator))
     return lobby
 
 
-def random_answer() -> Answer:
+def random_answer(rng: random.Random = random) -> Answer:
     answers = (Answer.ANSWER_A, Answer.ANSWER_B, Answer.ANSWER_C)
-    return random.choice(answers)
+    return rng.choice(answers)
 
 
-def random_guess() -> Guess:
-    answer = random_answer()
-    bet = random.choice((1, 2))
+def random_guess(rng: random.Random = random) -> Guess:
+    answer = random_answer(rng)
+    bet = rng.choice((1, 2))
     return Guess(answer=answer, bet=bet)
+
+
+def create_cards(count: int) -> List[Card]:
+    return [Card(question=f'Question {i}', answer_A='A', answer_B='B',
+                 answer_C='C')
+            for i in range(count)]
+
+
+def time_per_call(function: Callable, calls_count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls_count):
+        function()
+    elapsed = time.perf_counter() - start
+    return elapsed / calls_count * 1e6
+
+
+def format_latencies(latencies: List[float]) -> str:
+    milliseconds = np.array(latencies) * 1e3
+    return f'p50 {np.percentile(milliseconds, 50):7.2f} ms' \
+           f' p99 {np.percentile(milliseconds, 99):7.2f} ms' \
+           f' max {milliseconds.max():7.2f} ms'
+
+
+def _serialize_datetime(datetime_: datetime) -> str:
+    text = datetime_.strftime('%m/%d/%y %H:%M:%S')
+    return text
+
+
+def _serialize_game_phase_name(game_phase_name: GamePhaseName) -> str:
+    value = game_phase_name.value
+    return value
+
+
+def _serialize_uuid(uuid: UUID) -> str:
+    text = str(uuid)
+    return text
+
+
+def _serialize_feedback_status(status: Status) -> str:
+    value = status.value
+    return value
+
+
+def _serialize_dataclass(obj) -> Dict:
+    dict_ = {field.name: getattr(obj, field.name) for field in fields(obj)}
+    return JSONSerializer.serialize(dict_)
+
+
+JSONSerializer = Serializer(
+    serialization_functions={
+        dict: lambda dct: dict_serialization(
+            dct, key_serialization_func=JSONSerializer.serialize,
+            value_serialization_func=JSONSerializer.serialize),
+        list: lambda lst: list(map(JSONSerializer.serialize, lst)),
+        (str, int, float, bool, type(None)): noop_serialization,
+        datetime: _serialize_datetime,
+        GamePhaseName: _serialize_game_phase_name,
+        UUID: _serialize_uuid,
+        Status: _serialize_feedback_status,
+        dataclass: _serialize_dataclass
+    },
+    deserialization_functions={}
+)
+
+
+def serialize_feedback(feedback: Feedback) -> str:
+    json_ = JSONSerializer.serialize(feedback)
+    string = json.dumps(json_)
+    return string